@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Alert Coalescer - 모멘텀 알림 묶음 전송 (다이제스트)
+- ✅ CRITICAL / HIGH 는 묶지 않고 즉시 단독 전송
+- ✅ MEDIUM / LOW 는 (시장, 우선순위, 알림 종류)별로 짧은 창 동안 모아 1건으로 전송
+- ✅ 창 안에 1건뿐이면 기존 단독 포맷 그대로 → 평상시 알림 모양 변화 없음
+- ✅ 신호는 버리지 않음: 줄 수가 많으면 여러 메시지로 나눠 전부 전송
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+
+from config import Config
+from momentum_tracker import AlertPriority
+
+logger = logging.getLogger(__name__)
+
+_IMMEDIATE = (AlertPriority.CRITICAL, AlertPriority.HIGH)
+
+_TYPE_LABELS = {
+    'realtime_surge': '실시간 급등',
+    'dynamic_surge':  '뉴스 종목 급등',
+    'program':        '프로그램 매매',
+    'theme':          '테마',
+}
+
+
+def _digest_rank(signal: dict) -> float:
+    """묶음 안 정렬 기준: 프로그램 = 순매수 금액 / 테마 = 테마 등락률 / 그 외 = 등락률"""
+    alert_type = signal.get('alert_type')
+    if alert_type == 'program':
+        return signal.get('buy_amount', 0)
+    if alert_type == 'theme':
+        return signal.get('theme_change', 0)
+    return signal.get('change_percent', 0)
+
+
+def _digest_line(signal: dict) -> str:
+    """묶음 한 줄 (알림 종류별 핵심 수치)"""
+    name   = signal.get('name', 'Unknown')
+    ticker = signal.get('ticker', 'UNKNOWN')
+    alert_type = signal.get('alert_type')
+    if alert_type == 'program':
+        return f"{name} ({ticker}) 💻 순매수 {signal.get('buy_amount', 0) / 100:.0f}억원"
+    if alert_type == 'theme':
+        line = f"🎨 {signal.get('theme_name', '?')} {signal.get('theme_change', 0):+.1f}%"
+        top3 = signal.get('top3') or []
+        if top3:
+            line += f" · 👑 {top3[0]['name']} ({top3[0]['code']}) {top3[0]['change']:+.1f}%"
+        return line
+    return (f"{name} ({ticker}) {signal.get('change_percent', 0):+.1f}%"
+            f" · 거래량 {signal.get('volume_ratio', 0):.1f}배")
+
+
+class AlertCoalescer:
+    def __init__(self, send, format_single, window_seconds: float = None, max_lines: int = None):
+        """
+        send(text, priority)   : 발신 (TelegramOutbox 적재, 대기 없음)
+        format_single(signal)  : 단독 알림 포맷 (TelegramBot._format_momentum_alert)
+        """
+        self.send = send
+        self.format_single = format_single
+        self.window = window_seconds or Config.ALERT_DIGEST_WINDOW_SECONDS
+        self.max_lines = max_lines or Config.ALERT_DIGEST_MAX_LINES
+
+        self._buckets = {}   # (시장, 우선순위, 종류) → [신호]
+        self._timers = {}    # 같은 키 → TimerHandle
+        self.stats = {'signals': 0, 'immediate': 0, 'digests': 0, 'messages': 0}
+
+    # ────────────────────────────────────────────
+    # 입력
+    # ────────────────────────────────────────────
+    def add(self, signal: dict):
+        """신호 1건 → 즉시 전송 또는 묶음 대기 (대기 없이 반환)"""
+        self.stats['signals'] += 1
+        priority = signal.get('priority')
+        if not isinstance(priority, AlertPriority):
+            priority = AlertPriority.MEDIUM
+        if priority in _IMMEDIATE:
+            self.stats['immediate'] += 1
+            self._send(self.format_single(signal), priority)
+            return
+
+        key = (signal.get('market', 'US'), priority, signal.get('alert_type', ''))
+        self._buckets.setdefault(key, []).append(signal)
+        if key not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+
+    def flush_all(self):
+        """대기 중인 묶음 모두 즉시 전송 (종료 시)"""
+        for key in list(self._buckets):
+            self._flush(key)
+
+    # ────────────────────────────────────────────
+    # 출력
+    # ────────────────────────────────────────────
+    def _send(self, text: str, priority: AlertPriority):
+        self.stats['messages'] += 1
+        self.send(text, priority)
+
+    def _flush(self, key):
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        signals = self._buckets.pop(key, [])
+        if not signals:
+            return
+        priority = key[1]
+        if len(signals) == 1:
+            self._send(self.format_single(signals[0]), priority)
+            return
+
+        self.stats['digests'] += 1
+        signals.sort(key=_digest_rank, reverse=True)
+        chunks = [signals[i:i + self.max_lines] for i in range(0, len(signals), self.max_lines)]
+        for page, chunk in enumerate(chunks, 1):
+            self._send(self._format_digest(key, chunk, len(signals), page, len(chunks)), priority)
+        logger.info(f"📦 알림 묶음: {key[0]} {priority.name} {key[2]} {len(signals)}건 → {len(chunks)}건 전송")
+
+    def _format_digest(self, key, signals: list, total: int, page: int, pages: int) -> str:
+        market, priority, alert_type = key
+        emoji = signals[0].get('priority_emoji') or '🔥'
+        flag  = "🇺🇸" if market == 'US' else "🇰🇷"
+        label = _TYPE_LABELS.get(alert_type, alert_type or '급등')
+        page_text = f" ({page}/{pages})" if pages > 1 else ""
+
+        msg  = f"{emoji} 급등 묶음 알림{page_text}\n"
+        msg += f"{flag} {label} {total}건 ({int(self.window)}초)\n\n"
+        for signal in signals:
+            msg += f"• {_digest_line(signal)}\n"
+        msg += f"\n⏰ {datetime.now().strftime('%H:%M:%S')}"
+        return msg
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Prompt Length Benchmark - 프롬프트 길이 vs 모델별 지연시간
+- analyze_news_signal 프롬프트의 규칙 블록을 단계적으로 줄인 변형을 만들고
+- 모델별로 N회씩 호출해 입력 글자/토큰, 출력 토큰, 지연(평균/중앙값)을 비교
+- 실제 API 호출 (GEMINI_API_KEY 필요, 쿼터 소모 주의)
+
+사용법:
+    python bench_prompt.py                       # news_models 전체, 3회씩
+    python bench_prompt.py --models gemma-3-27b-it --runs 5
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import prompts
+from ai_brain import AIBrainV3
+from prompts import PromptTemplate
+from quota_manager import QuotaManager
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_NEWS = {
+    'title': 'Acme Therapeutics Announces FDA Approval of ACM-101 for Refractory Psoriasis',
+    'source': 'GlobeNewswire',
+    'company_hint_line': '',
+    'filing_items_line': '',
+    'content_line': (
+        '\n본문: Acme Therapeutics, Inc. (NASDAQ: ACMT) today announced that the U.S. Food and Drug '
+        'Administration has approved ACM-101, a first-in-class oral therapy for adults with '
+        'moderate-to-severe refractory plaque psoriasis. The approval is based on two Phase 3 trials '
+        'that met all primary and key secondary endpoints.'
+    ),
+}
+
+
+def build_variants():
+    """
+    NEWS_SIGNAL prefix 변형
+    - full:        현행 전체
+    - no_guide:    '분석 가이드' 블록 제거 (금지 규칙 + 스키마)
+    - no_rules:    '절대 금지/뒷북/저품질' 블록 제거 (가이드 + 스키마)
+    - schema_only: 역할 1줄 + JSON 스키마만
+    """
+    full   = prompts.NEWS_SIGNAL.prefix
+    head   = full.split('══')[0]
+    split  = full.index('JSON 형식')   # 'JSON 형식 (키 순서 …):' 스키마 블록 시작
+    rules  = full[len(head):full.index('분석 가이드:')]
+    guide  = full[full.index('분석 가이드:'):split]
+    schema = full[split:]
+    suffix = prompts.NEWS_SIGNAL.suffix
+
+    return [
+        PromptTemplate('full',        full, suffix),
+        PromptTemplate('no_guide',    head + rules + schema, suffix),
+        PromptTemplate('no_rules',    head + guide + schema, suffix),
+        PromptTemplate('schema_only', head + schema, suffix),
+    ]
+
+
+async def run_benchmark(models, runs):
+    ai = AIBrainV3()
+    # 로컬 쿼터 대기/거절 없이 모델 지연만 측정 (실사용량은 같은 일일 파일에 집계)
+    ai.quota = QuotaManager(limits={})
+    try:
+        models = models or ai.news_models
+        variants = build_variants()
+        results = []
+
+        for model in models:
+            for template in variants:
+                prompt = template.render(**SAMPLE_NEWS)
+                latencies = []
+                for _ in range(runs):
+                    started = time.monotonic()
+                    try:
+                        await ai._generate(model, prompt, use_json_mode=True, timeout=60, template=template)
+                        latencies.append(time.monotonic() - started)
+                    except Exception as e:
+                        logger.warning(f"[{model}] {template.name} 실패: {e}")
+                if latencies:
+                    results.append((model, template.name, len(prompt), latencies))
+
+        # 토큰 수는 PromptStats 실측값 사용
+        tokens = {(t, m): avg for t, m, avg in ai.prompt_stats.rows()}
+
+        print(f"\n{'model':<26} {'variant':<12} {'chars':>6} {'in_tok':>7} {'out_tok':>7} {'mean_s':>7} {'p50_s':>7}")
+        print('-' * 78)
+        for model, name, chars, latencies in results:
+            avg = tokens.get((name, model), {})
+            print(
+                f"{model:<26} {name:<12} {chars:>6} "
+                f"{avg.get('prompt_tokens', 0):>7.0f} {avg.get('response_tokens', 0):>7.0f} "
+                f"{statistics.mean(latencies):>7.2f} {statistics.median(latencies):>7.2f}"
+            )
+    finally:
+        ai.quota.flush()
+        await ai.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='프롬프트 길이별 모델 지연시간 벤치마크')
+    parser.add_argument('--models', nargs='+', default=None, help='대상 모델 (기본: news_models)')
+    parser.add_argument('--runs', type=int, default=3, help='변형×모델당 호출 횟수')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    asyncio.run(run_benchmark(args.models, args.runs))
+
+
+if __name__ == '__main__':
+    main()
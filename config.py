@@ -823,6 +823,133 @@ class Config:
     ENABLE_PENNY_STOCKS = True  # 페니스탁 포함
     AGGRESSIVE_SCANNING = True  # 공격적 스캐닝
 
+    # 💾 런타임 데이터 저장 위치 (쿼터 카운터 등)
+    DATA_DIR = os.getenv('DATA_DIR', 'data')
+
+    # 🎫 AI 모델별 쿼터 (무료 티어 기준, 요금제 바뀌면 여기만 수정)
+    # rpm: 분당 요청 / tpm: 분당 토큰 / rpd: 일일 요청 (None = 제한 없음)
+    AI_MODEL_QUOTAS = {
+        'gemma-3-27b-it':         {'rpm': 30, 'tpm': 15_000,  'rpd': 14_400},
+        'gemma-3-12b-it':         {'rpm': 30, 'tpm': 15_000,  'rpd': 14_400},
+        'gemma-3-4b-it':          {'rpm': 30, 'tpm': 15_000,  'rpd': 14_400},
+        'gemini-2.5-flash-lite':  {'rpm': 15, 'tpm': 250_000, 'rpd': 1_000},
+        'gemini-2.5-flash':       {'rpm': 10, 'tpm': 250_000, 'rpd': 250},
+        'gemini-3-flash-preview': {'rpm': 10, 'tpm': 250_000, 'rpd': 250},
+    }
+    AI_QUOTA_MAX_WAIT = 5.0  # 한도 임박 시 이 시간(초)까지만 대기, 넘으면 다음 모델
+    AI_QUOTA_FLUSH_SECONDS = 5  # 일일 카운터 파일 저장 주기 (초)
+
+    # 📐 제공자 측 명시적 컨텍스트 캐시 (정적 프롬프트 prefix 재사용)
+    # Gemma 미지원 / 모델별 최소 토큰 조건 있음 → 기본 OFF, 실패 시 자동으로 전체 전송
+    AI_CONTEXT_CACHE = os.getenv('AI_CONTEXT_CACHE', '0') == '1'
+    AI_CONTEXT_CACHE_TTL = 3600  # 초
+
+    # 🌊 뉴스 분석 스트리밍 (score 미달 시 조기 중단, top_ticker 즉시 감시 등록)
+    AI_STREAMING = os.getenv('AI_STREAMING', '1') == '1'
+
+    # 📑 SEC 8-K Item 코드별 중요도 (0~10) + 프롬프트용 설명
+    # SEC_8K_MIN_SCORE 이상인 항목이 하나라도 있어야 AI 분석 (Item 미확인 시 키워드 필터로 fallback)
+    SEC_8K_ITEMS = {
+        '1.01': (8, '중요 계약 체결'),
+        '1.02': (4, '중요 계약 해지'),
+        '1.03': (2, '파산/법정관리'),
+        '1.04': (2, '광산 안전'),
+        '1.05': (3, '사이버보안 사고'),
+        '2.01': (9, '자산 인수/처분 완료'),
+        '2.02': (6, '실적 발표'),
+        '2.03': (5, '직접 금융채무 발생'),
+        '2.04': (2, '채무 가속 조항 발동'),
+        '2.05': (3, '구조조정/철수 비용'),
+        '2.06': (2, '자산 손상'),
+        '3.01': (2, '상장폐지/상장요건 미달'),
+        '3.02': (6, '미등록 지분 매각 (사모 자금조달)'),
+        '3.03': (3, '주주 권리 변경'),
+        '4.01': (2, '감사인 변경'),
+        '4.02': (2, '재무제표 신뢰 불가'),
+        '5.01': (9, '경영권 변경'),
+        '5.02': (3, '임원/이사 변동'),
+        '5.03': (1, '정관 변경'),
+        '5.04': (1, '직원 연금 거래 중단'),
+        '5.05': (1, '윤리강령 변경'),
+        '5.06': (4, '쉘컴퍼니 지위 변경'),
+        '5.07': (2, '주주총회 결과'),
+        '5.08': (1, '이사 후보 추천 마감'),
+        '6.01': (2, 'ABS 정보'),
+        '6.02': (2, 'ABS 수탁자 변경'),
+        '6.03': (2, 'ABS 신용보강 변경'),
+        '6.04': (2, 'ABS 지급 불이행'),
+        '6.05': (2, 'ABS 증권법 공시'),
+        '7.01': (6, 'Reg FD 공시 (보도자료)'),
+        '8.01': (7, '기타 중요 사건'),
+        '9.01': (0, '재무제표/첨부'),
+    }
+    SEC_8K_MIN_SCORE = 6
+
+    # 🗂️ SEC CIK/티커 인덱스 갱신 주기 (시간, ETag 조건부 요청)
+    SEC_INDEX_REFRESH_HOURS = 24
+
+    # 🇰🇷 한국 종목 마스터 (KRX 전종목) 갱신 주기 (시간)
+    KR_MASTER_REFRESH_HOURS = 24
+
+    # 🏛️ SEC EDGAR 공정 접근 한도 (초당 10회) + Form 4 상세 동시 조회 수
+    SEC_MAX_RPS = 10
+    SEC_FORM4_CONCURRENCY = 5
+
+    # 📥 SEC 공시 수집 방식: atom (getcurrent 실시간) / daily_index (일일 인덱스 일괄) / both
+    # daily_index 는 장 마감 후 게시 → both 권장 (Atom 100건 창을 넘긴 공시 백필)
+    SEC_INGEST_MODE = os.getenv('SEC_INGEST_MODE', 'both').lower()
+    SEC_INDEX_POLL_SECONDS = 900
+    SEC_ATOM_POLL_SECONDS = 60
+    SEC_ATOM_MAX_PAGES = 10   # getcurrent 100건 × 페이지 (이미 본 공시가 나오면 중단)
+    # SEC 공정 접근 규정: "회사/앱 이름 + 연락 이메일" 형식
+    SEC_USER_AGENT = os.getenv('SEC_USER_AGENT', 'StockAlertBot admin@stockbot.com')
+
+    # 🌡️ 시장 국면 (VIX / 지수) 스냅샷 캐시 + 변동성 기준
+    MARKET_REGIME_TTL_SECONDS = 300
+    VIX_ELEVATED = 20
+    VIX_HIGH = 30
+    HIGH_VOL_CHANGE_MULTIPLIER = 1.5   # VIX_HIGH 이상이면 급등 최소 상승률 × 1.5
+
+    # 📮 텔레그램 발신 한도 (Bot API 권고: 봇 전체 초당 30건 / 개인 채팅 초당 1건 / 그룹 분당 20건)
+    TELEGRAM_GLOBAL_RPS = 25
+    TELEGRAM_CHAT_RPS = 1
+    TELEGRAM_GROUP_PER_MINUTE = 20
+
+    # 📦 MEDIUM/LOW 모멘텀 알림 묶음 창 (초) + 묶음 메시지당 최대 종목 수
+    ALERT_DIGEST_WINDOW_SECONDS = 20
+    ALERT_DIGEST_MAX_LINES = 25
+
+    # 🚌 이벤트 버스: 스테이지별 워커 수 + 큐 상한 (가득 차면 발행자 대기)
+    BUS_WORKERS = {'news': 2, 'analysis': 1, 'watch': 1, 'surge': 1, 'alert': 1}
+    BUS_QUEUE_SIZE = 100
+
+    # 🎯 집중 감시 적응형 주기 (초): 등록 경과 시간 구간별 기본 간격, 횡보 시 ×1.5 씩 느리게,
+    #    거래량 증가/급등 근접 시 최단 간격 / 조회 한도 (초당) + 동시 조회 수
+    WATCH_INTERVAL_MIN = 5
+    WATCH_INTERVAL_MAX = 600
+    WATCH_AGE_TIERS = [(300, 10), (1800, 30), (7200, 60), (28800, 180)]
+    WATCH_POLL_RPS = 3
+    WATCH_POLL_CONCURRENCY = 4
+    # 감시 목록 크기 한도 (초과 시 만료 임박 종목부터 제거) + 기본/추천 종목 TTL (시간)
+    WATCH_MAX_ENTRIES = 5000
+    WATCH_TTL_HOURS = 24
+    WATCH_REC_TTL_HOURS = 12
+
+    # 🧹 알림 중복 방지: 같은 거래일이라도 수치(등락률/순매수)가 이 배수 이상이면 재알림 /
+    #    sqlite 버퍼 저장 주기 (초)
+    DEDUP_REALERT_MULTIPLIER = 2.0
+    DEDUP_FLUSH_SECONDS = 5
+
+    # 💾 엔진 상태 스냅샷 주기 (초) + 이보다 오래된 스냅샷은 재시작 시 복원하지 않음 (시간)
+    STATE_SNAPSHOT_SECONDS = 60
+    STATE_MAX_AGE_HOURS = 72
+
+    # 🗄️ 신호 이력 (알림/뉴스/AI 분석): 버퍼 저장 주기 (초) / 보관 기간 (일) /
+    #    출처별 적중률 = AI 지목 후 이 시간 안에 같은 종목 급등 알림
+    SIGNAL_FLUSH_SECONDS = 5
+    SIGNAL_RETENTION_DAYS = 365
+    SIGNAL_HIT_WINDOW_HOURS = 24
+
 try:
     Config.validate()
 except ValueError as e:
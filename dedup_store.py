@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Dedup Store - 알림 중복 방지 (시장별 거래일 단위 파티션)
+- ✅ 거래일은 시장 시간대 기준 (KR: 서울 / US: 뉴욕) → 자정 경계가 장 중간에 걸리지 않음
+- ✅ 키는 정수 인코딩 (6자리 코드 → 정수, 티커 → 문자 패킹, 그 외 → 64비트 해시)
+- ✅ 지난 거래일 파티션은 통째로 삭제 (O(1)) → 오늘 기록이 임의로 지워지는 일 없음
+- ✅ 판정은 메모리 즉시, sqlite 기록은 버퍼 → 백그라운드 루프가 묶어서 스레드로 저장 (알림 경로 지연 없음)
+- ✅ 장중 재시작 후에도 이미 보낸 알림 재발송 없음 (종료 시 남은 버퍼 저장)
+- ✅ 재알림 규칙: 같은 날이라도 수치가 배수 이상 커지면 다시 알림 (예: 등락률 2배)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pytz
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_MARKET_TZ = {
+    'KR': pytz.timezone('Asia/Seoul'),
+    'US': pytz.timezone('America/New_York'),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    kind   TEXT    NOT NULL,
+    market TEXT    NOT NULL,
+    day    INTEGER NOT NULL,
+    key    INTEGER NOT NULL,
+    level  REAL,
+    PRIMARY KEY (kind, market, day, key)
+);
+"""
+
+_TICKER_CHARS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ.-'
+_TICKER_INDEX = {ch: i + 1 for i, ch in enumerate(_TICKER_CHARS)}   # 0 은 패딩
+
+
+def encode_key(value: str) -> int:
+    """
+    문자열 키 → 정수 (하위 2비트 = 종류 태그, 서로 충돌 없음)
+    - 숫자 (KR 종목코드): int << 2
+    - 티커 (영숫자 . - 10자 이하): 40진 패킹 << 2 | 1 (sqlite INTEGER 범위 안)
+    - 그 외 (테마명 등): blake2b 60비트 << 2 | 2
+    """
+    value = str(value).strip().upper()
+    if value.isdigit() and len(value) <= 18:
+        return int(value) << 2
+    if 0 < len(value) <= 10 and all(ch in _TICKER_INDEX for ch in value):
+        packed = 0
+        for ch in value:
+            packed = packed * 40 + _TICKER_INDEX[ch]
+        return (packed << 2) | 1
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+    return ((int.from_bytes(digest, 'big') >> 4) << 2) | 2
+
+
+def trading_day(market: str, now: datetime = None) -> int:
+    """시장 시간대 기준 날짜 → YYYYMMDD 정수"""
+    tz = _MARKET_TZ.get(market, _MARKET_TZ['KR'])
+    now = now.astimezone(tz) if now else datetime.now(tz)
+    return now.year * 10000 + now.month * 100 + now.day
+
+
+class DedupStore:
+    def __init__(self, db_path: str = None, realert_multiplier: float = None, flush_seconds: float = None):
+        self.db_path = db_path or os.path.join(Config.DATA_DIR, 'alert_dedup.db')
+        self.realert_multiplier = realert_multiplier or Config.DEDUP_REALERT_MULTIPLIER
+        self.flush_seconds = flush_seconds or Config.DEDUP_FLUSH_SECONDS
+        # (kind, market) → (거래일, {정수 키: 마지막 알림 수치})
+        self._partitions = {}
+        self._buffer = []          # 저장 대기 (kind, market, day, key, level)
+        self._purge_due = False    # roll() 이후 지난 거래일 행 삭제 대기
+        self._conn = None
+        self._lock = threading.Lock()   # 저장(스레드) ↔ 종료 저장/닫기 직렬화
+        self.stats = {'written': 0, 'errors': 0}
+        self._load()
+
+    # ────────────────────────────────────────────
+    # sqlite
+    # ────────────────────────────────────────────
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _load(self):
+        """시장별 오늘 거래일 기록만 로드 (지난 날짜 행은 삭제)"""
+        try:
+            conn = self._connect()
+            loaded = 0
+            for market in _MARKET_TZ:
+                day = trading_day(market)
+                conn.execute('DELETE FROM alerts WHERE market = ? AND day < ?', (market, day))
+                rows = conn.execute(
+                    'SELECT kind, key, level FROM alerts WHERE market = ? AND day = ?', (market, day)
+                ).fetchall()
+                for kind, key, level in rows:
+                    self._partitions.setdefault((kind, market), (day, {}))[1][key] = level
+                loaded += len(rows)
+            conn.commit()
+            logger.info(f"🧹 알림 중복 기록 로드: 오늘 {loaded}건")
+        except Exception as e:
+            logger.warning(f"🧹 알림 중복 기록 로드 실패 ({self.db_path}): {e} → 메모리만 사용")
+            self._conn = None
+
+    # ────────────────────────────────────────────
+    # 저장 (백그라운드)
+    # ────────────────────────────────────────────
+    def _write(self, rows: list, purge: bool = False):
+        """(스레드 가능) 버퍼 행 기록 + 지난 거래일 행 삭제를 한 트랜잭션으로"""
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany('INSERT OR REPLACE INTO alerts VALUES (?, ?, ?, ?, ?)', rows)
+                    if purge:
+                        for market in _MARKET_TZ:
+                            conn.execute('DELETE FROM alerts WHERE market = ? AND day < ?',
+                                         (market, trading_day(market)))
+                self.stats['written'] += len(rows)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"🧹 알림 중복 기록 저장 실패 ({len(rows)}건): {e}")
+                self._conn = None
+
+    def _take(self):
+        rows, self._buffer = self._buffer, []
+        purge, self._purge_due = self._purge_due, False
+        return rows, purge
+
+    def flush(self):
+        """버퍼 즉시 저장 (종료 시)"""
+        rows, purge = self._take()
+        if rows or purge:
+            self._write(rows, purge)
+
+    async def run_loop(self, report=None):
+        """
+        flush_seconds 마다 버퍼를 묶어 저장
+        report: TaskSupervisor.reporter (저장 성공/실패 보고)
+        """
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            started, errors = time.monotonic(), self.stats['errors']
+            rows, purge = self._take()
+            if rows or purge:
+                await asyncio.to_thread(self._write, rows, purge)
+            if report:
+                if self.stats['errors'] == errors:
+                    report.ok(started)
+                else:
+                    report.error(RuntimeError(f'중복 기록 {len(rows)}건 저장 실패'))
+
+    # ────────────────────────────────────────────
+    # 파티션
+    # ────────────────────────────────────────────
+    def _partition(self, kind: str, market: str) -> tuple:
+        """오늘 거래일 파티션 (날짜가 바뀌었으면 통째로 교체)"""
+        day = trading_day(market)
+        part = self._partitions.get((kind, market))
+        if part is None or part[0] != day:
+            part = (day, {})
+            self._partitions[(kind, market)] = part
+        return part
+
+    def roll(self):
+        """지난 거래일 파티션 제거 (메모리 즉시, sqlite 는 다음 저장 때)"""
+        dropped = 0
+        for (kind, market), (day, seen) in list(self._partitions.items()):
+            if day != trading_day(market):
+                del self._partitions[(kind, market)]
+                dropped += len(seen)
+        self._purge_due = True     # 재시작 없이 날짜가 넘어간 행도 정리
+        if dropped:
+            logger.info(f"🧹 지난 거래일 알림 기록 {dropped}건 정리")
+
+    # ────────────────────────────────────────────
+    # 조회 / 기록
+    # ────────────────────────────────────────────
+    def is_new(self, kind: str, market: str, key: str, level: float = None) -> bool:
+        """
+        알림 대상인지 (기록은 하지 않음)
+        - 오늘 처음 / 또는 level 이 지난 알림 수치의 realert_multiplier 배 이상
+        """
+        _day, seen = self._partition(kind, market)
+        code = encode_key(key)
+        if code not in seen:
+            return True
+        last = seen[code]
+        return (level is not None and last is not None and last > 0
+                and level >= last * self.realert_multiplier)
+
+    def add(self, kind: str, market: str, key: str, level: float = None):
+        day, seen = self._partition(kind, market)
+        code = encode_key(key)
+        seen[code] = level
+        self._buffer.append((kind, market, day, code, level))
+
+    def check_and_add(self, kind: str, market: str, key: str, level: float = None) -> bool:
+        """is_new 이면 기록 후 True"""
+        if not self.is_new(kind, market, key, level):
+            return False
+        self.add(kind, market, key, level)
+        return True
+
+    def count(self) -> int:
+        return sum(len(seen) for _day, seen in self._partitions.values())
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Event Bus - 프로세스 내 비동기 pub/sub (뉴스 → AI → 감시 → 알림)
+- ✅ 이벤트 타입별 구독 (NewsItem / Analysis / WatchRequest / SurgeSignal / Alert)
+- ✅ 구독(스테이지)마다 전용 큐 + 워커 수 → 느린 AI 단계가 감시/알림 단계를 막지 않음
+- ✅ 큐 상한 = 역압: publish() 는 가득 차면 대기, publish_nowait() 는 버리고 집계
+- ✅ 스테이지는 TaskSupervisor 가 소유 (죽으면 재시작, /status 에 처리량·지연 표시)
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from momentum_tracker import AlertPriority
+
+logger = logging.getLogger(__name__)
+
+
+# ────────────────────────────────────────────────────────
+# 이벤트
+# ────────────────────────────────────────────────────────
+@dataclass
+class NewsItem:
+    """키워드 사전 필터를 통과한 뉴스 (AI 분석 대기)"""
+    news: dict
+    market: str
+    threshold: float
+
+
+@dataclass
+class Analysis:
+    """AI 분석 완료 (알림 + 추천 종목 감시 대상)"""
+    news: dict
+    analysis: dict
+    market: str
+
+
+@dataclass
+class WatchRequest:
+    """집중 감시 등록 요청 → 즉시 1회 시세 확인 (urgent: AI top_ticker → 수 초 간격부터)"""
+    ticker: str
+    market: str
+    reason: str = ''
+    urgent: bool = False
+    news: Optional[dict] = None          # 출처 뉴스 (감시 목록에 보관)
+    score: Optional[float] = None        # 키워드/AI 점수
+    ttl_hours: Optional[float] = None    # 없으면 Config.WATCH_TTL_HOURS
+
+
+@dataclass
+class SurgeSignal:
+    """MomentumTracker 급등 신호 dict"""
+    signal: dict
+
+
+@dataclass
+class Alert:
+    """발신할 완성 메시지"""
+    text: str
+    priority: AlertPriority = AlertPriority.MEDIUM
+    created_at: float = field(default_factory=time.monotonic)
+
+
+# ────────────────────────────────────────────────────────
+# 버스
+# ────────────────────────────────────────────────────────
+class _Stage:
+    def __init__(self, name: str, event_type: type, handler, workers: int, maxsize: int):
+        self.name = name
+        self.event_type = event_type
+        self.handler = handler
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.stats = {'published': 0, 'processed': 0, 'errors': 0, 'dropped': 0, 'avg_latency': None}
+
+
+class EventBus:
+    def __init__(self, default_maxsize: int = 100):
+        self.default_maxsize = default_maxsize
+        self._stages = []
+
+    def subscribe(self, event_type: type, handler, workers: int = 1,
+                  maxsize: Optional[int] = None, name: str = None):
+        """handler(event) — 코루틴이어도 됨 / workers 개가 같은 큐를 나눠 처리"""
+        stage = _Stage(name or f"{event_type.__name__}:{getattr(handler, '__name__', 'handler')}",
+                       event_type, handler, max(1, workers), maxsize or self.default_maxsize)
+        self._stages.append(stage)
+        return stage
+
+    # ────────────────────────────────────────────
+    # 발행
+    # ────────────────────────────────────────────
+    def _targets(self, event):
+        return [stage for stage in self._stages if isinstance(event, stage.event_type)]
+
+    async def publish(self, event):
+        """구독 스테이지 큐에 적재 (가득 차면 자리가 날 때까지 대기 = 역압)"""
+        for stage in self._targets(event):
+            await stage.queue.put((time.monotonic(), event))
+            stage.stats['published'] += 1
+
+    def publish_nowait(self, event) -> bool:
+        """동기 콜백용: 가득 찬 스테이지는 건너뛰고 집계 (모두 적재되면 True)"""
+        ok = True
+        for stage in self._targets(event):
+            try:
+                stage.queue.put_nowait((time.monotonic(), event))
+                stage.stats['published'] += 1
+            except asyncio.QueueFull:
+                stage.stats['dropped'] += 1
+                logger.warning(f"🚌 [{stage.name}] 큐 가득 참 → {type(event).__name__} 버림")
+                ok = False
+        return ok
+
+    # ────────────────────────────────────────────
+    # 처리
+    # ────────────────────────────────────────────
+    def start(self, spawn, reporter=None):
+        """
+        spawn(name, factory, label) — TaskSupervisor.spawn
+        reporter(name) — TaskSupervisor.reporter (이벤트 처리마다 성공/실패 보고)
+        """
+        for stage in self._stages:
+            name = f"bus:{stage.name}"
+            report = reporter(name) if reporter else None
+            spawn(name, lambda stage=stage, report=report: self._run_stage(stage, report),
+                  f"🚌 {stage.name} ×{stage.workers}")
+
+    async def _run_stage(self, stage: _Stage, report=None):
+        await asyncio.gather(*(self._worker(stage, report) for _ in range(stage.workers)))
+
+    async def _worker(self, stage: _Stage, report=None):
+        while True:
+            queued_at, event = await stage.queue.get()
+            started = time.monotonic()
+            try:
+                result = stage.handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+                stage.stats['processed'] += 1
+                if report:
+                    report.ok(started)
+            except Exception as e:
+                stage.stats['errors'] += 1
+                logger.warning(f"🚌 [{stage.name}] 처리 오류: {e}")
+                if report:
+                    report.error(e)
+            finally:
+                latency = time.monotonic() - queued_at
+                avg = stage.stats['avg_latency']
+                stage.stats['avg_latency'] = latency if avg is None else avg * 0.8 + latency * 0.2
+                stage.queue.task_done()
+
+    async def drain(self):
+        """모든 스테이지 큐가 빌 때까지 대기 (처리 중 다음 스테이지로 이어진 이벤트 포함, replay 용)"""
+        while True:
+            for stage in self._stages:
+                await stage.queue.join()
+            if all(stage.queue.empty() for stage in self._stages):
+                return
+
+    def format_status(self) -> str:
+        """/status 용 스테이지별 한 줄 (대기 / 처리 / 평균 지연)"""
+        lines = []
+        for stage in self._stages:
+            s = stage.stats
+            avg = f"{s['avg_latency']:.1f}초" if s['avg_latency'] is not None else "-"
+            line = f"  • {stage.name}: 대기 {stage.queue.qsize()} · 처리 {s['processed']} · 지연 {avg}"
+            if s['errors']:
+                line += f" · 오류 {s['errors']}"
+            if s['dropped']:
+                line += f" · 버림 {s['dropped']}"
+            lines.append(line)
+        return '\n'.join(lines) if lines else "  (구독 없음)"
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Gemini REST Client - aiohttp 기반 네이티브 비동기 호출
+- ✅ to_thread 래핑 제거: wait_for 타임아웃 시 요청이 실제로 취소됨 (스레드/소켓 점유 없음)
+- ✅ 세션 1개 재사용 (keep-alive 커넥션 풀) → 호출마다 TLS 핸드셰이크 생략
+- ✅ generateContent / streamGenerateContent(SSE) / cachedContents
+- ✅ 응답 객체는 SDK와 같은 .text / .usage_metadata 형태로 제공
+"""
+
+import json
+import logging
+from types import SimpleNamespace
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+_API_BASE = 'https://generativelanguage.googleapis.com/v1beta'
+
+# usageMetadata(camelCase) → SDK 속성명(snake_case)
+_USAGE_FIELDS = {
+    'promptTokenCount':        'prompt_token_count',
+    'candidatesTokenCount':    'candidates_token_count',
+    'cachedContentTokenCount': 'cached_content_token_count',
+    'totalTokenCount':         'total_token_count',
+}
+
+
+class GeminiApiError(Exception):
+    """HTTP 오류 응답 (code = HTTP 상태, 본문에 retryDelay 포함 가능)"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class GeminiResponse:
+    """generateContent 응답 1건 (스트리밍이면 청크 1개)"""
+
+    def __init__(self, data: dict):
+        self.raw = data
+        usage = data.get('usageMetadata')
+        self.usage_metadata = SimpleNamespace(**{
+            attr: usage.get(key) for key, attr in _USAGE_FIELDS.items()
+        }) if usage else None
+
+    @property
+    def text(self) -> str:
+        candidates = self.raw.get('candidates') or []
+        if not candidates:
+            return ''
+        parts = (candidates[0].get('content') or {}).get('parts') or []
+        return ''.join(p.get('text', '') for p in parts)
+
+
+class GeminiRestClient:
+    def __init__(self, api_key: str, pool_size: int = 10):
+        self.api_key   = api_key
+        self.pool_size = pool_size
+        self._session: aiohttp.ClientSession = None
+
+    # ────────────────────────────────────────────
+    # 세션 (이벤트 루프 안에서 지연 생성)
+    # ────────────────────────────────────────────
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60),
+                headers={
+                    'x-goog-api-key': self.api_key,
+                    'Content-Type':   'application/json',
+                },
+            )
+        return self._session
+
+    async def aclose(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @staticmethod
+    def _body(contents: str, generation_config: dict = None, cached_content: str = None) -> dict:
+        body = {'contents': [{'role': 'user', 'parts': [{'text': contents}]}]}
+        if generation_config:
+            body['generationConfig'] = generation_config
+        if cached_content:
+            body['cachedContent'] = cached_content
+        return body
+
+    @staticmethod
+    async def _raise_for_status(resp: aiohttp.ClientResponse):
+        if resp.status < 400:
+            return
+        text = await resp.text()
+        raise GeminiApiError(resp.status, text[:500])
+
+    # ────────────────────────────────────────────
+    # API
+    # ────────────────────────────────────────────
+    async def generate_content(self, model: str, contents: str,
+                               generation_config: dict = None,
+                               cached_content: str = None) -> GeminiResponse:
+        url = f"{_API_BASE}/models/{model}:generateContent"
+        body = self._body(contents, generation_config, cached_content)
+        async with self._get_session().post(url, json=body) as resp:
+            await self._raise_for_status(resp)
+            return GeminiResponse(await resp.json())
+
+    async def generate_content_stream(self, model: str, contents: str,
+                                      generation_config: dict = None,
+                                      cached_content: str = None):
+        """
+        SSE 스트림 → GeminiResponse 청크를 async 로 yield
+        - 소비자가 중간에 break 하면 응답을 닫아 서버 생성도 중단
+        """
+        url = f"{_API_BASE}/models/{model}:streamGenerateContent?alt=sse"
+        body = self._body(contents, generation_config, cached_content)
+        async with self._get_session().post(url, json=body) as resp:
+            await self._raise_for_status(resp)
+            async for raw_line in resp.content:
+                line = raw_line.decode('utf-8', errors='ignore').strip()
+                if not line.startswith('data:'):
+                    continue
+                payload = line[5:].strip()
+                if not payload:
+                    continue
+                try:
+                    yield GeminiResponse(json.loads(payload))
+                except json.JSONDecodeError:
+                    logger.debug(f"SSE 청크 파싱 실패: {payload[:80]}")
+
+    async def create_cached_content(self, model: str, contents: str,
+                                    ttl_seconds: int, display_name: str = None) -> str:
+        """정적 prefix 캐시 생성 → 'cachedContents/…' 이름 반환"""
+        body = {
+            'model':    f"models/{model}",
+            'contents': [{'role': 'user', 'parts': [{'text': contents}]}],
+            'ttl':      f"{ttl_seconds}s",
+        }
+        if display_name:
+            body['displayName'] = display_name
+        async with self._get_session().post(f"{_API_BASE}/cachedContents", json=body) as resp:
+            await self._raise_for_status(resp)
+            return (await resp.json())['name']
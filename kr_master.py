@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+"""
+KR Stock Master - 한국 상장 종목 마스터 (코드 · 종목명 · 영문명 · 시장 · 시총 구간)
+- ✅ KRX 정보데이터시스템 전종목 기본정보 + 시가총액 → sqlite 캐시 (재시작 시 즉시 로드)
+- ✅ KRX 실패 시 KIND 상장법인목록(코스피/코스닥)으로 fallback
+- ✅ 코드 → yfinance 심볼 (.KS / .KQ) 정확 매핑 → 잘못된 접미사 조회 제거
+- ✅ 종목명 조회: 정확 일치 → 접두어 → 바이그램 유사도
+- ✅ 1일 주기 백그라운드 갱신
+"""
+
+import asyncio
+import bisect
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import aiohttp
+import pytz
+from bs4 import BeautifulSoup
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_KRX_JSON_URL = 'http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
+_KRX_REFERER  = 'http://data.krx.co.kr/contents/MDC/MDI/mdiLoader/index.cmd'
+_KIND_LIST_URL = 'https://kind.krx.co.kr/corpgeneral/corpList.do'
+
+_KST = pytz.timezone('Asia/Seoul')
+
+# KRX 시장구분 → yfinance 접미사 (코넥스는 yfinance 미지원 → 제외)
+_MARKET_SUFFIX = {'KOSPI': 'KS', 'KOSDAQ': 'KQ'}
+
+# 시가총액 구간 (원)
+_CAP_BUCKETS = [
+    (10_000_000_000_000, 'mega'),    # 10조 이상
+    (1_000_000_000_000,  'large'),   # 1조 이상
+    (200_000_000_000,    'mid'),     # 2천억 이상
+    (50_000_000_000,     'small'),   # 500억 이상
+    (0,                  'micro'),
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stocks (
+    code       TEXT PRIMARY KEY,
+    name       TEXT NOT NULL,
+    name_en    TEXT NOT NULL,
+    market     TEXT NOT NULL,
+    market_cap INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_NAME_NOISE_RE = re.compile(r'\(주\)|주식회사|[\s\.\,\(\)\-&·]+')
+
+
+def normalize_kr_name(name: str) -> str:
+    """비교용 종목명 정규화 ("SK 하이닉스" → "sk하이닉스", "(주)NAVER" → "naver")"""
+    if not name:
+        return ''
+    return _NAME_NOISE_RE.sub('', name).lower()
+
+
+def cap_bucket(market_cap: int) -> str:
+    if not market_cap:
+        return ''
+    for floor, label in _CAP_BUCKETS:
+        if market_cap >= floor:
+            return label
+    return 'micro'
+
+
+def _bigrams(text: str) -> set:
+    if len(text) < 2:
+        return {text}
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class KrStockMaster:
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or os.path.join(Config.DATA_DIR, 'kr_master.db')
+        self.refresh_interval = Config.KR_MASTER_REFRESH_HOURS * 3600
+
+        self._stocks = {}      # 코드 → {'name', 'name_en', 'market', 'market_cap'}
+        self._by_name = {}     # 정규화 이름(한글/영문) → 코드 (시총 큰 종목 우선)
+        self._sorted_names = []  # [(정규화 이름, 코드)] 접두어 검색용
+        self._postings = defaultdict(list)  # 바이그램 → [(코드, 바이그램 집합)]
+
+        self._meta = {}
+        self._load()
+
+    # ────────────────────────────────────────────
+    # 조회
+    # ────────────────────────────────────────────
+    def __len__(self):
+        return len(self._stocks)
+
+    def __contains__(self, code) -> bool:
+        return code in self._stocks
+
+    def get(self, code: str):
+        """코드 → {'code', 'name', 'name_en', 'market', 'market_cap', 'cap_bucket'} (없으면 None)"""
+        info = self._stocks.get(code)
+        if not info:
+            return None
+        return dict(info, code=code, cap_bucket=cap_bucket(info['market_cap']))
+
+    def symbol(self, code: str):
+        """
+        6자리 코드 → yfinance 심볼 ("005930.KS" / "035720.KQ")
+        - 마스터에 없는 코드 → None (잘못된 접미사로 조회하지 않음)
+        - 마스터가 아직 비어 있으면 (최초 로드 전) 기존 추정 방식
+        """
+        info = self._stocks.get(code)
+        if info:
+            return f"{code}.{_MARKET_SUFFIX[info['market']]}"
+        if not self._stocks and code and code.isdigit() and len(code) == 6:
+            return f"{code}.KS" if code.startswith('0') else f"{code}.KQ"
+        return None
+
+    def is_listed(self, code: str) -> bool:
+        """코스피/코스닥 상장 코드 여부 (마스터 비어 있으면 판단 보류 → True)"""
+        return not self._stocks or code in self._stocks
+
+    def resolve(self, query: str, min_similarity: float = 0.7):
+        """
+        코드/종목명 → 6자리 코드 (못 찾으면 None)
+        1. 6자리 숫자 코드
+        2. 정규화 이름 정확 일치 (한글/영문)
+        3. 접두어 일치 (시총 최대 종목)
+        4. 바이그램 Dice 유사도 ≥ min_similarity
+        """
+        query = (query or '').strip()
+        if query.isdigit() and len(query) == 6:
+            return query if self.is_listed(query) else None
+
+        norm = normalize_kr_name(query)
+        if not norm:
+            return None
+        code = self._by_name.get(norm)
+        if code:
+            return code
+
+        prefixed = self.search_prefix(norm)
+        if prefixed:
+            return max(prefixed, key=lambda c: self._stocks[c]['market_cap'])
+
+        match = self._fuzzy(norm, min_similarity)
+        return match[0] if match else None
+
+    def search_prefix(self, prefix: str, limit: int = 20) -> list:
+        """정규화 이름 접두어 일치 코드 목록"""
+        norm = normalize_kr_name(prefix)
+        if not norm:
+            return []
+        codes = []
+        i = bisect.bisect_left(self._sorted_names, (norm, ''))
+        while i < len(self._sorted_names) and len(codes) < limit:
+            name, code = self._sorted_names[i]
+            if not name.startswith(norm):
+                break
+            if code not in codes:
+                codes.append(code)
+            i += 1
+        return codes
+
+    def _fuzzy(self, norm: str, min_similarity: float):
+        grams = _bigrams(norm)
+        # Dice ≥ t 이면 희귀 바이그램 중 일부는 반드시 공유 → 그 포스팅만 후보로
+        rare_first = sorted(grams, key=lambda g: len(self._postings.get(g, ())))
+        probe = int(len(grams) * (2 - 2 * min_similarity) / (2 - min_similarity)) + 1
+        best, best_score = None, 0.0
+        seen = set()
+        for gram in rare_first[:probe]:
+            for code, other in self._postings.get(gram, ()):
+                if id(other) in seen:
+                    continue
+                seen.add(id(other))
+                score = 2.0 * len(grams & other) / (len(grams) + len(other))
+                if score > best_score:
+                    best, best_score = code, score
+        if best is None or best_score < min_similarity:
+            return None
+        return best, best_score
+
+    @property
+    def refreshed_at(self) -> float:
+        try:
+            return float(self._meta.get('refreshed_at', 0))
+        except ValueError:
+            return 0.0
+
+    # ────────────────────────────────────────────
+    # sqlite 로드/저장
+    # ────────────────────────────────────────────
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _load(self):
+        started = time.monotonic()
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute('SELECT code, name, name_en, market, market_cap FROM stocks').fetchall()
+                self._meta = dict(conn.execute('SELECT key, value FROM meta').fetchall())
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"🇰🇷 종목 마스터 로드 실패: {e}")
+            return
+
+        self._build(rows)
+        if rows:
+            logger.info(
+                f"🇰🇷 종목 마스터 로드: {len(self._stocks):,}개 "
+                f"({(time.monotonic() - started) * 1000:.0f}ms)"
+            )
+
+    def _build(self, rows):
+        """(code, name, name_en, market, market_cap) 행 → 메모리 인덱스 교체"""
+        stocks, by_name, sorted_names, postings = {}, {}, [], defaultdict(list)
+        # 시총 내림차순 → 동명/유사 이름은 큰 종목이 먼저 등록
+        for code, name, name_en, market, market_cap in sorted(rows, key=lambda r: -(r[4] or 0)):
+            if market not in _MARKET_SUFFIX:
+                continue
+            stocks[code] = {'name': name, 'name_en': name_en, 'market': market, 'market_cap': market_cap or 0}
+            for norm in {normalize_kr_name(name), normalize_kr_name(name_en)}:
+                if not norm:
+                    continue
+                by_name.setdefault(norm, code)
+                sorted_names.append((norm, code))
+                grams = _bigrams(norm)
+                for gram in grams:
+                    postings[gram].append((code, grams))
+        sorted_names.sort()
+        self._stocks, self._by_name = stocks, by_name
+        self._sorted_names, self._postings = sorted_names, postings
+
+    def _save(self, rows, meta: dict):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM stocks')
+                conn.executemany(
+                    'INSERT OR REPLACE INTO stocks (code, name, name_en, market, market_cap) VALUES (?, ?, ?, ?, ?)',
+                    rows,
+                )
+                conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', meta.items())
+        finally:
+            conn.close()
+
+    # ────────────────────────────────────────────
+    # 다운로드 (KRX → KIND fallback)
+    # ────────────────────────────────────────────
+    async def _krx_json(self, session, bld: str, **params) -> list:
+        data = {'bld': bld, 'locale': 'ko_KR', 'share': '1', 'csvxls_isNo': 'false', **params}
+        headers = {'Referer': _KRX_REFERER, 'User-Agent': 'Mozilla/5.0'}
+        async with session.post(_KRX_JSON_URL, data=data, headers=headers, timeout=30) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"KRX HTTP {resp.status}")
+            payload = await resp.json(content_type=None)
+        return payload.get('OutBlock_1') or payload.get('output') or []
+
+    async def _fetch_krx(self, session) -> list:
+        """KRX 전종목 기본정보(MDCSTAT01901) + 최근 거래일 시가총액(MDCSTAT01501)"""
+        listing = await self._krx_json(session, 'dbms/MDC/STAT/standard/MDCSTAT01901', mktId='ALL')
+
+        caps = {}
+        day = datetime.now(_KST)
+        for _ in range(7):  # 휴장일이면 하루씩 거슬러 올라감
+            quotes = await self._krx_json(
+                session, 'dbms/MDC/STAT/standard/MDCSTAT01501',
+                mktId='ALL', trdDd=day.strftime('%Y%m%d'),
+            )
+            for q in quotes:
+                try:
+                    caps[q['ISU_SRT_CD']] = int(str(q.get('MKTCAP', '0')).replace(',', '') or 0)
+                except ValueError:
+                    continue
+            if any(caps.values()):
+                break
+            caps.clear()
+            day -= timedelta(days=1)
+
+        rows = []
+        for item in listing:
+            market = (item.get('MKT_TP_NM') or '').split()[0].upper()  # "KOSDAQ GLOBAL" → KOSDAQ
+            code = item.get('ISU_SRT_CD', '')
+            if market not in _MARKET_SUFFIX or not (code.isdigit() and len(code) == 6):
+                continue
+            rows.append((
+                code,
+                item.get('ISU_ABBRV') or item.get('ISU_NM', ''),
+                item.get('ISU_ENG_NM', ''),
+                market,
+                caps.get(code, 0),
+            ))
+        return rows
+
+    async def _fetch_kind(self, session) -> list:
+        """KIND 상장법인목록 (이름/코드/시장만, 시총 없음)"""
+        rows = []
+        for market_type, market in (('stockMkt', 'KOSPI'), ('kosdaqMkt', 'KOSDAQ')):
+            params = {'method': 'download', 'searchType': '13', 'marketType': market_type}
+            async with session.get(_KIND_LIST_URL, params=params, timeout=30) as resp:
+                if resp.status != 200:
+                    raise RuntimeError(f"KIND HTTP {resp.status}")
+                html = (await resp.read()).decode('euc-kr', errors='ignore')
+            soup = BeautifulSoup(html, 'html.parser')
+            for tr in soup.select('tr')[1:]:
+                cols = [td.get_text(strip=True) for td in tr.select('td')]
+                if len(cols) < 2:
+                    continue
+                name, code = cols[0], cols[1].zfill(6)
+                if code.isdigit():
+                    rows.append((code, name, '', market, 0))
+        return rows
+
+    async def refresh(self) -> bool:
+        """KRX(실패 시 KIND)에서 전종목 다시 받아 sqlite + 메모리 교체"""
+        rows, source = [], None
+        async with aiohttp.ClientSession() as session:
+            for source, fetch in (('KRX', self._fetch_krx), ('KIND', self._fetch_kind)):
+                try:
+                    rows = await fetch(session)
+                except Exception as e:
+                    logger.warning(f"🇰🇷 종목 마스터 {source} 조회 실패: {e}")
+                    rows = []
+                if rows:
+                    break
+
+        if not rows:
+            logger.warning("🇰🇷 종목 마스터 갱신 실패 → 기존 마스터 유지")
+            return False
+
+        meta = {'refreshed_at': str(time.time()), 'source': source}
+        try:
+            await asyncio.to_thread(self._save, rows, meta)
+        except Exception as e:
+            logger.warning(f"🇰🇷 종목 마스터 저장 실패 (메모리만 갱신): {e}")
+
+        self._build(rows)
+        self._meta.update(meta)
+        logger.info(f"🇰🇷 종목 마스터 갱신 ({source}): {len(self._stocks):,}개")
+        return True
+
+    async def run_refresh_loop(self, report=None):
+        """
+        1일 주기 갱신 (비어 있거나 주기 경과 시 즉시), 실패 시 10분 → 최대 2시간 백오프
+        report: TaskSupervisor.reporter (갱신 성공/실패 보고)
+        """
+        backoff = 600
+        while True:
+            due = self.refreshed_at + self.refresh_interval - time.time()
+            if len(self) and due > 0:
+                await asyncio.sleep(due)
+                continue
+
+            started = time.monotonic()
+            if await self.refresh():
+                if report:
+                    report.ok(started)
+                backoff = 600
+            else:
+                if report:
+                    report.error(RuntimeError('KRX 종목 마스터 갱신 실패'))
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 7200)
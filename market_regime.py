@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Market Regime - 시장 국면 스냅샷 (VIX / S&P 500 / KOSPI / KOSDAQ)
+- ✅ yfinance 동기 호출은 to_thread → 이벤트 루프 차단 없음 (텔레그램 폴링/모니터 정상 동작)
+- ✅ 4개 지수 동시 조회 + 짧은 TTL 캐시 (동시 요청은 1회 조회로 합침)
+- ✅ 일일 리포트 리스크 / /status / 모멘텀 급등 기준(VIX 고공 시 상향)이 같은 스냅샷 공유
+"""
+
+import asyncio
+import logging
+import time
+
+import yfinance as yf
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 표시명 → yfinance 심볼
+_INDICES = {
+    'VIX':    '^VIX',
+    'S&P500': '^GSPC',
+    'KOSPI':  '^KS11',
+    'KOSDAQ': '^KQ11',
+}
+
+
+class MarketRegime:
+    def __init__(self, ttl_seconds: float = None):
+        self.ttl = ttl_seconds or Config.MARKET_REGIME_TTL_SECONDS
+        self._snapshot = None   # {'fetched_at': float, 'quotes': {표시명: {'last', 'change_pct'}}}
+        self._lock = asyncio.Lock()
+
+    # ────────────────────────────────────────────
+    # 조회
+    # ────────────────────────────────────────────
+    @staticmethod
+    def _fetch_quote(symbol: str):
+        """(스레드에서 실행) 최근 5일 종가 → {'last', 'change_pct'} / 실패 시 None"""
+        hist = yf.Ticker(symbol).history(period='5d')
+        if hist.empty:
+            return None
+        closes = hist['Close']
+        last = float(closes.iloc[-1])
+        change_pct = None
+        if len(closes) >= 2 and closes.iloc[-2]:
+            change_pct = (last - float(closes.iloc[-2])) / float(closes.iloc[-2]) * 100
+        return {'last': last, 'change_pct': change_pct}
+
+    async def _refresh(self):
+        names = list(_INDICES)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._fetch_quote, _INDICES[name]) for name in names),
+            return_exceptions=True,
+        )
+        quotes = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.debug(f"🌡️ {name} 조회 실패: {result}")
+            elif result:
+                quotes[name] = result
+
+        # 전부 실패하면 이전 스냅샷 유지 (다음 호출에서 재시도)
+        if quotes or self._snapshot is None:
+            self._snapshot = {'fetched_at': time.time(), 'quotes': quotes}
+        return self._snapshot
+
+    async def snapshot(self, max_age: float = None) -> dict:
+        """
+        캐시된 스냅샷 (max_age 초, 기본 TTL 이내) → 없거나 오래됐으면 조회
+        - 동시에 여러 곳에서 불러도 조회는 1회 (Lock 안에서 재확인)
+        """
+        max_age = self.ttl if max_age is None else max_age
+        if self._is_fresh(max_age):
+            return self._snapshot
+        async with self._lock:
+            if self._is_fresh(max_age):
+                return self._snapshot
+            return await self._refresh()
+
+    def _is_fresh(self, max_age: float) -> bool:
+        return self._snapshot is not None and time.time() - self._snapshot['fetched_at'] < max_age
+
+    def cached(self):
+        """마지막 스냅샷 (조회 없이 즉시, 없으면 None)"""
+        return self._snapshot
+
+    async def run_refresh_loop(self, report=None):
+        """
+        TTL 주기로 스냅샷 갱신 (모멘텀 기준 판단이 항상 캐시로 즉시 가능하도록)
+        report: TaskSupervisor.reporter (갱신 성공/실패 보고)
+        """
+        while True:
+            started, requested_at = time.monotonic(), time.time()
+            try:
+                snapshot = await self.snapshot(max_age=0)
+                # 전부 실패 → 이전 스냅샷 유지 (예외 없음) → 실패로 보고
+                if snapshot['quotes'] and snapshot['fetched_at'] >= requested_at:
+                    if report:
+                        report.ok(started)
+                elif report:
+                    report.error(RuntimeError('지수 조회 전부 실패'))
+            except Exception as e:
+                logger.warning(f"🌡️ 시장 국면 갱신 오류: {e}")
+                if report:
+                    report.error(e)
+            await asyncio.sleep(self.ttl)
+
+    # ────────────────────────────────────────────
+    # 판단
+    # ────────────────────────────────────────────
+    def _quote(self, name: str):
+        return (self._snapshot or {}).get('quotes', {}).get(name)
+
+    def vix(self):
+        quote = self._quote('VIX')
+        return quote['last'] if quote else None
+
+    def is_high_volatility(self) -> bool:
+        """VIX ≥ Config.VIX_HIGH (캐시 기준, 모르면 False)"""
+        vix = self.vix()
+        return vix is not None and vix >= Config.VIX_HIGH
+
+    async def risks(self, market: str) -> list:
+        """일일 리포트용 리스크 문구 (US: VIX·S&P 500 / KR: KOSPI·KOSDAQ)"""
+        await self.snapshot()
+        return self.cached_risks(market)
+
+    def cached_risks(self, market: str) -> list:
+        """risks() 와 같은 문구를 조회 없이 캐시 기준으로 (없으면 [])"""
+        risks = []
+        if market == 'US':
+            vix = self.vix()
+            if vix is not None:
+                if vix > Config.VIX_HIGH:
+                    risks.append(f"⚠️ VIX 고공행진 ({vix:.1f})")
+                elif vix > Config.VIX_ELEVATED:
+                    risks.append(f"📊 VIX 상승 ({vix:.1f})")
+            names = ('S&P500',)
+        else:
+            names = ('KOSPI', 'KOSDAQ')
+
+        for name in names:
+            quote = self._quote(name)
+            if quote and quote['change_pct'] is not None and quote['change_pct'] < -2:
+                label = 'S&P 500' if name == 'S&P500' else name
+                risks.append(f"🔴 {label} 급락 ({quote['change_pct']:.1f}%)")
+        return risks
+
+    def format_status(self) -> str:
+        """/status 용 한 줄 (캐시 기준)"""
+        if not self._snapshot or not self._snapshot['quotes']:
+            return "  (조회 전)"
+        parts = []
+        for name in _INDICES:
+            quote = self._quote(name)
+            if not quote:
+                continue
+            if name == 'VIX' or quote['change_pct'] is None:
+                parts.append(f"{name} {quote['last']:.1f}")
+            else:
+                parts.append(f"{name} {quote['change_pct']:+.1f}%")
+        age = int(time.time() - self._snapshot['fetched_at'])
+        mode = " ⚠️ 고변동성 (급등 기준 상향)" if self.is_high_volatility() else ""
+        return f"  {' | '.join(parts)} ({age}초 전){mode}"
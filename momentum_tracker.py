@@ -6,19 +6,20 @@ Momentum Tracker (Production)
 - ✅ yfinance prepost=True → 장전/장후 데이터 포함
 - ✅ _scan_yfinance_api 함수 복구 (이전 버전에서 dead code 버그 있었음)
 - ✅ 다중 fallback (Finviz → Yahoo → yfinance)
-- ✅ 이중 스캔 모드 (뉴스 종목 1분 / 시장 전체 10분)
+- ✅ 이중 스캔 모드 (뉴스 종목 적응형 주기 / 시장 전체 스캔)
 - ✅ Anti-Ban: 랜덤 User-Agent + 랜덤 지연
 - ✅ 알림 우선순위 (CRITICAL/HIGH/MEDIUM/LOW)
 - ✅ 동적 종목 TTL 24시간
 - ✅ 날짜별 메모리 관리
 - ✅ 통계 추적
+- ✅ 한국 종목 심볼: KRX 마스터 기준 .KS/.KQ (접미사 추정 제거)
+- ✅ VIX 고공 장세: 급등 최소 상승률 상향 (공유 시장 국면 스냅샷)
 """
 
 import asyncio
 import aiohttp
 import logging
-from datetime import datetime, timedelta, date
-from collections import defaultdict
+from datetime import datetime
 from enum import Enum
 from bs4 import BeautifulSoup, Tag
 import yfinance as yf
@@ -26,6 +27,13 @@ import re
 import random
 from typing import List, Dict, Optional
 
+from config import Config
+from kr_master import KrStockMaster
+from market_regime import MarketRegime
+from dedup_store import DedupStore
+from watch_registry import WatchRegistry
+from watch_scheduler import WatchScheduler
+
 # curl_cffi: Cloudflare TLS 지문 위장 (Finviz 전용)
 try:
     from curl_cffi.requests import AsyncSession as CurlAsyncSession
@@ -59,7 +67,15 @@ _PRIORITY_EMOJI = {
 # 메인 클래스
 # ────────────────────────────────────────────────────────
 class MomentumTracker:
-    def __init__(self):
+    STATE_VERSION = 1   # 💾 state_store 스냅샷 스키마
+
+    def __init__(self, kr_master: KrStockMaster = None, regime: MarketRegime = None):
+        # ── 한국 종목 마스터 (코드 → .KS/.KQ) ──
+        self.kr_master = kr_master or KrStockMaster()
+
+        # ── 시장 국면 (VIX 고공 시 급등 기준 상향, 캐시만 참조) ──
+        self.regime = regime
+
         # ── 한국 소스 URL ──
         self.kr_surge_url = "https://finance.naver.com/sise/sise_quant.naver"
         self.program_url  = "https://finance.naver.com/sise/programDeal.naver"
@@ -68,23 +84,17 @@ class MomentumTracker:
         # ── 미국 소스 URL ──
         self.us_gainers_url = "https://finviz.com/screener.ashx?v=111&s=ta_topgainers"
 
-        # ── 동적 종목 (TTL 24h) ──
-        self.dynamic_tickers_us: Dict[str, datetime] = {}  # {ticker: 추가시각}
-        self.dynamic_tickers_kr: Dict[str, datetime] = {}
-        self.dynamic_ticker_ttl_hours = 24
+        # ── 동적 종목 (종목별 TTL, 기본 Config.WATCH_TTL_HOURS) ──
+        self.watch_registry = WatchRegistry()
+        # 종목별 적응형 확인 주기 (TelegramBot.momentum_monitor_dynamic 이 소비)
+        self.watch_scheduler = WatchScheduler()
 
-        # ── 중복 방지 (날짜별) ──
-        self.seen_surge_by_date   = defaultdict(set)
-        self.seen_program_by_date = defaultdict(set)
-        self.seen_theme_by_date   = defaultdict(set)
-        # 하위 호환 (기존 코드 참조 대비)
-        self.seen_surge   = set()
-        self.seen_program = set()
-        self.seen_theme   = set()
+        # ── 중복 방지 (시장별 거래일 파티션, 재시작 후에도 유지) ──
+        self.dedup = DedupStore()
 
         # ── Beast Mode 필터 ──
         self.min_volume_ratio   = 5.0
-        self.min_price_change   = 10.0
+        self.base_min_price_change = 10.0   # 실제 기준은 min_price_change (국면 반영)
         self.max_market_cap_kr  = 1_000_000
         self.max_market_cap_us  = 100_000_000_000
 
@@ -120,6 +130,13 @@ class MomentumTracker:
 
         logger.info("🚀 Momentum Tracker (Production) 초기화")
 
+    @property
+    def min_price_change(self) -> float:
+        """급등 최소 상승률 (VIX ≥ Config.VIX_HIGH 이면 × HIGH_VOL_CHANGE_MULTIPLIER)"""
+        if self.regime and self.regime.is_high_volatility():
+            return self.base_min_price_change * Config.HIGH_VOL_CHANGE_MULTIPLIER
+        return self.base_min_price_change
+
     # ────────────────────────────────────────────
     # 공통 헬퍼
     # ────────────────────────────────────────────
@@ -140,34 +157,38 @@ class MomentumTracker:
     # ────────────────────────────────────────────
     # 동적 종목 관리 (TTL)
     # ────────────────────────────────────────────
-    def add_dynamic_ticker(self, ticker: str, market: str = 'US'):
-        """뉴스/AI가 지목한 종목 추가. 24시간 TTL."""
-        now = datetime.now()
-        if market == 'US':
-            self.dynamic_tickers_us[ticker.upper()] = now
-            logger.info(f"➕ 동적 종목 추가 (US): {ticker} [TTL 24h]")
-            if len(self.dynamic_tickers_us) > 50:
-                oldest = min(self.dynamic_tickers_us, key=self.dynamic_tickers_us.get)
-                del self.dynamic_tickers_us[oldest]
-        else:
-            self.dynamic_tickers_kr[ticker] = now
-            logger.info(f"➕ 동적 종목 추가 (KR): {ticker} [TTL 24h]")
-            if len(self.dynamic_tickers_kr) > 50:
-                oldest = min(self.dynamic_tickers_kr, key=self.dynamic_tickers_kr.get)
-                del self.dynamic_tickers_kr[oldest]
-
-    def _get_active_dynamic_tickers(self, market: str = 'US') -> List[str]:
-        """TTL 만료 종목 제거 후 활성 종목 반환."""
-        now = datetime.now()
-        ttl = timedelta(hours=self.dynamic_ticker_ttl_hours)
-        pool = self.dynamic_tickers_us if market == 'US' else self.dynamic_tickers_kr
+    @property
+    def dynamic_tickers_us(self):
+        """{티커: 추가시각} 읽기 전용 뷰 (하위 호환)"""
+        return self.watch_registry.view('US')
 
-        expired = [t for t, ts in pool.items() if now - ts >= ttl]
-        for t in expired:
-            del pool[t]
-            logger.debug(f"⏰ TTL 만료 ({market}): {t}")
+    @property
+    def dynamic_tickers_kr(self):
+        return self.watch_registry.view('KR')
 
-        return list(pool.keys())
+    def add_dynamic_ticker(self, ticker: str, market: str = 'US', urgent: bool = False,
+                           reason: str = '', news: dict = None, score=None, ttl_hours: float = None):
+        """
+        뉴스/AI가 지목한 종목 추가 (TTL 기본 Config.WATCH_TTL_HOURS, 재등록 시 만료 연장)
+        - 즉시 1회 확인 예약, urgent (AI top_ticker) 면 수 초 간격부터 시작
+        """
+        if market == 'US':
+            ticker = ticker.upper()
+        entry, is_new, evicted = self.watch_registry.add(
+            market, ticker, ttl_hours=ttl_hours, reason=reason, news=news, score=score,
+        )
+        if is_new:
+            ttl = ttl_hours or self.watch_registry.default_ttl_hours
+            logger.info(f"➕ 동적 종목 추가 ({market}): {ticker} [TTL {ttl:g}h] {reason}")
+        for old_market, old_ticker in evicted:
+            self.watch_scheduler.remove(old_market, old_ticker)
+        self.watch_scheduler.add(market, ticker, urgent)
+        return entry
+
+    def expire_dynamic_tickers(self):
+        """TTL 만료 종목 정리 (만료 힙 머리만 확인, 스케줄러에서도 제거)"""
+        for market, ticker in self.watch_registry.expire():
+            self.watch_scheduler.remove(market, ticker)
 
     # ────────────────────────────────────────────
     # 우선순위 & 통계
@@ -237,7 +258,7 @@ class MomentumTracker:
             f"  Yahoo:    {self.stats['yahoo_success']}회\n"
             f"  yfinance: {self.stats['yfinance_success']}회\n"
             f"━━━━━━━━━━━━━━━━\n"
-            f"🔍 동적 종목 (TTL 24h):\n"
+            f"🔍 동적 종목 (TTL {self.watch_registry.default_ttl_hours:g}h):\n"
             f"  US: {len(self.dynamic_tickers_us)}개\n"
             f"  KR: {len(self.dynamic_tickers_kr)}개\n"
         )
@@ -245,152 +266,120 @@ class MomentumTracker:
     # ────────────────────────────────────────────
     # 메인 스캔 진입점
     # ────────────────────────────────────────────
-    async def scan_momentum(self, market: str = 'KR', mode: str = 'full') -> List[dict]:
+    async def scan_momentum(self, market: str = 'KR') -> List[dict]:
         """
-        이중 스캔 모드:
-        - mode='dynamic': 뉴스 종목만 (1분 주기)
-        - mode='full':    시장 전체 스캔 (10분 주기)
+        시장 전체 스캔 (KR: 실시간 급등 + 프로그램 + 테마 / US: 실시간 급등)
+        - 집중 감시 종목은 WatchScheduler 적응형 주기로 poll_dynamic_ticker 가 따로 확인
         """
         signals = []
 
         if market == 'KR':
-            if mode == 'dynamic':
-                if self.dynamic_tickers_kr:
-                    signals.extend(await self._scan_dynamic_kr())
-            else:
-                signals.extend(await self._scan_realtime_surge_kr())
-                signals.extend(await self._scan_program())
-                signals.extend(await self._scan_theme())
+            signals.extend(await self._scan_realtime_surge_kr())
+            signals.extend(await self._scan_program())
+            signals.extend(await self._scan_theme())
         else:  # US
-            if mode == 'dynamic':
-                if self.dynamic_tickers_us:
-                    signals.extend(await self._scan_dynamic_us())
-            else:
-                signals.extend(await self._scan_realtime_surge_us())
+            signals.extend(await self._scan_realtime_surge_us())
 
-        logger.info(f"🐺 모멘텀 [{market}][{mode}]: {len(signals)}개")
+        logger.info(f"🐺 모멘텀 [{market}]: {len(signals)}개")
         return signals
 
     # ────────────────────────────────────────────
-    # US - 동적 종목 (1분 주기)
+    # 동적 종목 (적응형 주기 1회 확인)
     # ────────────────────────────────────────────
-    async def _scan_dynamic_us(self) -> List[dict]:
-        """뉴스 종목 빠른 체크 (1분 주기) + TTL + 우선순위
-           ✅ prepost=True: 장전/장후 데이터 포함
+    async def poll_dynamic_ticker(self, ticker: str, market: str = 'US'):
         """
-        signals = []
-        active_tickers = self._get_active_dynamic_tickers('US')
-        if not active_tickers:
-            return signals
-
-        for ticker in active_tickers:
-            try:
-                await self._random_delay(0.5, 0.2)
-                stock = await asyncio.to_thread(yf.Ticker, ticker)
-                # ✅ prepost=True: 장전/장후 급등 감지
-                hist = await asyncio.to_thread(
-                    lambda: stock.history(period='5d', prepost=True)
-                )
-
-                if hist.empty or len(hist) < 2:
-                    continue
-
-                current      = hist['Close'].iloc[-1]
-                prev         = hist['Close'].iloc[-2]
-                change_pct   = ((current - prev) / prev) * 100
-                volume       = hist['Volume'].iloc[-1]
-                avg_volume   = hist['Volume'][:-1].mean()
-                volume_ratio = volume / avg_volume if avg_volume > 0 else 0
-
-                if change_pct >= self.min_price_change and volume_ratio >= self.min_volume_ratio:
-                    alert_key = f"{ticker}_{datetime.now().date()}"
-                    if alert_key not in self.seen_surge:
-                        self.seen_surge.add(alert_key)
-
-                        signal = {
-                            'ticker':         ticker,
-                            'name':           ticker,
-                            'market':         'US',
-                            'price':          current,
-                            'change_percent': change_pct,
-                            'volume_ratio':   volume_ratio,
-                            'signals':        [f'Surge {change_pct:.1f}%', f'Volume {volume_ratio:.1f}x'],
-                            'reason':         f'🔥🔥 뉴스 종목 급등 ({change_pct:.1f}%, {volume_ratio:.1f}배)',
-                            'timestamp':      datetime.now(),
-                            'alert_type':     'dynamic_surge',
-                        }
-                        signal = self._assign_priority(signal, is_dynamic=True)
-                        self._update_stats(signal)
-                        signals.append(signal)
-                        logger.info(f"{signal['priority_emoji']} 뉴스 종목 급등: {ticker} +{change_pct:.1f}%")
-
-            except Exception as e:
-                logger.debug(f"동적 종목 체크 오류 ({ticker}): {e}")
-                continue
-
-        return signals
-
-    # ────────────────────────────────────────────
-    # KR - 동적 종목 (1분 주기)
-    # ────────────────────────────────────────────
-    async def _scan_dynamic_kr(self) -> List[dict]:
-        """한국 뉴스 종목 빠른 체크 + TTL + 우선순위
-           ✅ prepost=True: 장전/장후 데이터 포함
+        감시 종목 1회 확인 → (급등 신호 또는 None, (등락률, 거래량 배수) 또는 None)
+        - 시세는 급등 여부와 무관하게 돌려줌 (WatchScheduler 주기 조정용)
         """
-        signals = []
-        active_tickers = self._get_active_dynamic_tickers('KR')
-        if not active_tickers:
-            return signals
-
-        for code in active_tickers:
-            try:
-                await self._random_delay(0.5, 0.2)
-                ticker_symbol = f"{code}.KS" if code.startswith('0') else f"{code}.KQ"
-                stock = await asyncio.to_thread(yf.Ticker, ticker_symbol)
-                hist = await asyncio.to_thread(
-                    lambda: stock.history(period='5d', prepost=True)
-                )
-
-                if hist.empty or len(hist) < 2:
-                    continue
-
-                current      = hist['Close'].iloc[-1]
-                prev         = hist['Close'].iloc[-2]
-                change_pct   = ((current - prev) / prev) * 100
-                volume       = hist['Volume'].iloc[-1]
-                avg_volume   = hist['Volume'][:-1].mean()
-                volume_ratio = volume / avg_volume if avg_volume > 0 else 0
-
-                if change_pct >= self.min_price_change and volume_ratio >= self.min_volume_ratio:
-                    alert_key = f"{code}_{datetime.now().date()}"
-                    if alert_key not in self.seen_surge:
-                        self.seen_surge.add(alert_key)
-
-                        info = stock.info
-                        name = info.get('longName', code)
+        try:
+            if market == 'US':
+                ticker = ticker.upper()
+                symbol = ticker
+            else:
+                symbol = self.kr_master.symbol(ticker)
+                if not symbol:
+                    logger.debug(f"🇰🇷 마스터에 없는 코드 → 스킵: {ticker}")
+                    return None, None
+            quote = await self._dynamic_history(symbol)
+            if not quote:
+                return None, None
+            if market == 'US':
+                signal = self._dynamic_signal_us(ticker, quote)
+            else:
+                signal = await self._dynamic_signal_kr(ticker, quote)
+            return signal, (quote[1], quote[2])
+        except Exception as e:
+            logger.debug(f"동적 종목 체크 오류 ({ticker}): {e}")
+            return None, None
+
+    @staticmethod
+    async def _dynamic_history(symbol: str):
+        """✅ prepost=True: 장전/장후 급등 감지 → (종가, 등락률, 거래량 배수, Ticker) / 데이터 부족 시 None"""
+        stock = await asyncio.to_thread(yf.Ticker, symbol)
+        hist = await asyncio.to_thread(lambda: stock.history(period='5d', prepost=True))
+        if hist.empty or len(hist) < 2:
+            return None
+        current      = hist['Close'].iloc[-1]
+        prev         = hist['Close'].iloc[-2]
+        change_pct   = ((current - prev) / prev) * 100
+        volume       = hist['Volume'].iloc[-1]
+        avg_volume   = hist['Volume'][:-1].mean()
+        volume_ratio = volume / avg_volume if avg_volume > 0 else 0
+        return current, change_pct, volume_ratio, stock
+
+    def _dynamic_signal_us(self, ticker: str, quote) -> Optional[dict]:
+        current, change_pct, volume_ratio, _stock = quote
+        if change_pct < self.min_price_change or volume_ratio < self.min_volume_ratio:
+            return None
+        if not self.dedup.check_and_add('surge', 'US', ticker, change_pct):
+            return None
 
-                        signal = {
-                            'ticker':         code,
-                            'name':           name,
-                            'market':         'KR',
-                            'price':          current,
-                            'change_percent': change_pct,
-                            'volume_ratio':   volume_ratio,
-                            'signals':        [f'급등 {change_pct:.1f}%', f'거래량 {volume_ratio:.1f}배'],
-                            'reason':         f'🔥🔥 뉴스 종목 급등 ({change_pct:.1f}%, {volume_ratio:.1f}배)',
-                            'timestamp':      datetime.now(),
-                            'alert_type':     'dynamic_surge',
-                        }
-                        signal = self._assign_priority(signal, is_dynamic=True)
-                        self._update_stats(signal)
-                        signals.append(signal)
-                        logger.info(f"{signal['priority_emoji']} 뉴스 종목 급등(KR): {name} +{change_pct:.1f}%")
+        signal = {
+            'ticker':         ticker,
+            'name':           ticker,
+            'market':         'US',
+            'price':          current,
+            'change_percent': change_pct,
+            'volume_ratio':   volume_ratio,
+            'signals':        [f'Surge {change_pct:.1f}%', f'Volume {volume_ratio:.1f}x'],
+            'reason':         f'🔥🔥 뉴스 종목 급등 ({change_pct:.1f}%, {volume_ratio:.1f}배)',
+            'timestamp':      datetime.now(),
+            'alert_type':     'dynamic_surge',
+        }
+        signal = self._assign_priority(signal, is_dynamic=True)
+        self._update_stats(signal)
+        logger.info(f"{signal['priority_emoji']} 뉴스 종목 급등: {ticker} +{change_pct:.1f}%")
+        return signal
 
-            except Exception as e:
-                logger.debug(f"동적 종목 체크 오류 ({code}): {e}")
-                continue
+    async def _dynamic_signal_kr(self, code: str, quote) -> Optional[dict]:
+        current, change_pct, volume_ratio, stock = quote
+        if change_pct < self.min_price_change or volume_ratio < self.min_volume_ratio:
+            return None
+        if not self.dedup.check_and_add('surge', 'KR', code, change_pct):
+            return None
 
-        return signals
+        # 종목명: KRX 마스터 우선 (yfinance info 는 느린 동기 호출 → 스레드)
+        name = (self.kr_master.get(code) or {}).get('name')
+        if not name:
+            info = await asyncio.to_thread(lambda: stock.info)
+            name = info.get('longName', code)
+
+        signal = {
+            'ticker':         code,
+            'name':           name,
+            'market':         'KR',
+            'price':          current,
+            'change_percent': change_pct,
+            'volume_ratio':   volume_ratio,
+            'signals':        [f'급등 {change_pct:.1f}%', f'거래량 {volume_ratio:.1f}배'],
+            'reason':         f'🔥🔥 뉴스 종목 급등 ({change_pct:.1f}%, {volume_ratio:.1f}배)',
+            'timestamp':      datetime.now(),
+            'alert_type':     'dynamic_surge',
+        }
+        signal = self._assign_priority(signal, is_dynamic=True)
+        self._update_stats(signal)
+        logger.info(f"{signal['priority_emoji']} 뉴스 종목 급등(KR): {name} +{change_pct:.1f}%")
+        return signal
 
     # ────────────────────────────────────────────
     # US - 전체 스캔 (3중 fallback)
@@ -616,10 +605,8 @@ class MomentumTracker:
                             continue
 
                     # 중복 체크
-                    alert_key = f"{ticker}_{datetime.now().date()}"
-                    if alert_key in self.seen_surge:
+                    if not self.dedup.check_and_add('surge', 'US', ticker, change_pct):
                         continue
-                    self.seen_surge.add(alert_key)
 
                     signal = {
                         'ticker':         ticker,
@@ -705,10 +692,8 @@ class MomentumTracker:
                     if volume_ratio < self.min_volume_ratio:   continue
                     if market_cap   > self.max_market_cap_us:  continue
 
-                    alert_key = f"{ticker}_{datetime.now().date()}"
-                    if alert_key in self.seen_surge:
+                    if not self.dedup.check_and_add('surge', 'US', ticker, change_pct):
                         continue
-                    self.seen_surge.add(alert_key)
 
                     signal = {
                         'ticker':         ticker,
@@ -776,10 +761,8 @@ class MomentumTracker:
                 if change_pct < self.min_price_change or volume_ratio < self.min_volume_ratio:
                     return None
 
-                alert_key = f"{ticker}_{datetime.now().date()}"
-                if alert_key in self.seen_surge:
+                if not self.dedup.check_and_add('surge', 'US', ticker, change_pct):
                     return None
-                self.seen_surge.add(alert_key)
 
                 info = stock.info
                 name = info.get('longName', ticker)
@@ -883,21 +866,21 @@ class MomentumTracker:
                     if volume_ratio < self.min_volume_ratio or change_pct < self.min_price_change:
                         continue
 
+                    # 마스터에 없는 신규 상장 → 시총/ETF 확인 생략 (잘못된 접미사 조회 방지)
+                    sym = self.kr_master.symbol(code)
                     try:
-                        sym   = f"{code}.KS" if code.startswith('0') else f"{code}.KQ"
-                        stock = await asyncio.to_thread(yf.Ticker, sym)
-                        info  = stock.info
-                        if info.get('marketCap', 0) > 750_000_000:
-                            continue
-                        if info.get('quoteType') == 'ETF':
-                            continue
+                        if sym:
+                            stock = await asyncio.to_thread(yf.Ticker, sym)
+                            info  = stock.info
+                            if info.get('marketCap', 0) > 750_000_000:
+                                continue
+                            if info.get('quoteType') == 'ETF':
+                                continue
                     except Exception:
                         pass
 
-                    alert_key = f"{code}_{datetime.now().date()}"
-                    if alert_key in self.seen_surge:
+                    if not self.dedup.check_and_add('surge', 'KR', code, change_pct):
                         continue
-                    self.seen_surge.add(alert_key)
 
                     signal = {
                         'ticker':         code,
@@ -963,10 +946,8 @@ class MomentumTracker:
                     if buy_amount < 300:
                         continue
 
-                    alert_key = f"{code}_{datetime.now().date()}"
-                    if alert_key in self.seen_program:
+                    if not self.dedup.check_and_add('program', 'KR', code, buy_amount):
                         continue
-                    self.seen_program.add(alert_key)
 
                     signal = {
                         'ticker':      code,
@@ -1028,8 +1009,7 @@ class MomentumTracker:
                         if change_pct < 3.0 or up_count < 5:
                             continue
 
-                        alert_key = f"{theme_name}_{datetime.now().date()}"
-                        if alert_key in self.seen_theme:
+                        if not self.dedup.is_new('theme', 'KR', theme_name, change_pct):
                             continue
 
                         detail_url = "https://finance.naver.com" + theme_elem.get('href', '')
@@ -1037,7 +1017,7 @@ class MomentumTracker:
                         if not top3:
                             continue
 
-                        self.seen_theme.add(alert_key)
+                        self.dedup.add('theme', 'KR', theme_name, change_pct)
 
                         msg = f'🎨 테마 급등 ({theme_name} +{change_pct:.1f}%)\n'
                         msg += f'👑 1위: {top3[0]["name"]} (+{top3[0]["change"]:.1f}%)'
@@ -1051,6 +1031,7 @@ class MomentumTracker:
                             'name':       top3[0]['name'],
                             'market':     'KR',
                             'theme_name': theme_name,
+                            'theme_change': change_pct,
                             'top3':       top3,
                             'reason':     msg,
                             'timestamp':  datetime.now(),
@@ -1111,20 +1092,36 @@ class MomentumTracker:
     # 메모리 정리
     # ────────────────────────────────────────────
     def cleanup_alerts(self):
-        """7일 지난 날짜별 데이터 삭제, 오늘 데이터 보존"""
-        today = date.today()
+        """지난 거래일 중복 기록 파티션 정리 (오늘 기록은 그대로)"""
+        self.dedup.roll()
+        self.expire_dynamic_tickers()
 
-        for store in (self.seen_surge_by_date, self.seen_program_by_date, self.seen_theme_by_date):
-            old = [d for d in store if (today - d).days > 7]
-            for d in old:
-                del store[d]
-
-        # seen_surge/program/theme (하위 호환 set) 크기 제한
-        for s in (self.seen_surge, self.seen_program, self.seen_theme):
-            while len(s) > 1000:
-                s.pop()
+    # ────────────────────────────────────────────
+    # 💾 상태 스냅샷 (state_store.StateStore)
+    # ────────────────────────────────────────────
+    def export_state(self) -> dict:
+        """감시 목록 + 종목별 확인 주기 + 통계 (중복 기록은 DedupStore 가 직접 저장)"""
+        return {
+            'watch':    self.watch_registry.dump(),
+            'schedule': self.watch_scheduler.dump(),
+            'stats':    dict(self.stats, session_start=self.stats['session_start'].timestamp()),
+        }
 
-        logger.info(f"메모리 정리 완료")
+    def import_state(self, state: dict):
+        """재시작 직후: 남은 TTL·확인 간격 그대로 감시 재개, 통계 누적 유지"""
+        restored = self.watch_registry.load(state.get('watch', []))
+        self.watch_scheduler.load(state.get('schedule', []), keys=set(restored))
+        for market, ticker in restored:
+            if (market, ticker) not in self.watch_scheduler:
+                self.watch_scheduler.add(market, ticker)
+
+        stats = state.get('stats') or {}
+        for key in self.stats:
+            if key in stats and key != 'session_start':
+                self.stats[key] = stats[key]
+        if stats.get('session_start'):
+            self.stats['session_start'] = datetime.fromtimestamp(stats['session_start'])
+        logger.info(f"💾 모멘텀 상태 복원: 감시 {len(restored)}종목 / 누적 알림 {self.stats['total_alerts']}건")
 
 
 # ────────────────────────────────────────────────────────
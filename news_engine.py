@@ -3,7 +3,8 @@
 News Engine v3.0 - Beast Mode (야수 모드)
 - 5대장 뉴스 소스 (미국)
 - 🔥 한국 뉴스 소스 대폭 확장 (네이버 속보, 매경, 한경, 서경)
-- SEC 8-K
+- SEC 8-K (📑 Item 코드 로컬 분류 → 중요 공시만 AI 분석)
+- 🔎 공시/보도자료 티커 로컬 해석 (CIK · 거래소 표기 · 회사명)
 - curl_cffi 보안 우회
 - KST 시간 처리
 """
@@ -20,12 +21,19 @@ from curl_cffi.requests import AsyncSession
 
 from ai_brain import AIBrainV3
 from config import Config
+from sec_gateway import SecGateway, filed_at, is_recent
+from sec_parsers import parse_8k_items, parse_8k_index_items, score_8k_items
 
 logger = logging.getLogger(__name__)
 
 class NewsEngineV3:
-    def __init__(self, ai_brain):
+    _SEC_PENDING_BATCH = 30
+    STATE_VERSION = 1   # 💾 state_store 스냅샷 스키마
+
+    def __init__(self, ai_brain, resolver=None, sec_gateway=None):
         self.ai = ai_brain
+        self.resolver = resolver  # 🔎 ticker_resolver.CompanyNameResolver (없으면 AI에만 의존)
+        self.sec_gateway = sec_gateway or SecGateway()  # 🏛️ 8-K 구독 + index 페이지 조회
         self.seen_urls = set()
         self.seen_titles = []
         
@@ -85,7 +93,7 @@ class NewsEngineV3:
         ]
         
         # SEC 8-K 공시
-        self.sec_url = 'https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&type=8-K&company=&dateb=&owner=include&start=0&count=100&output=atom'
+        self._pending_8k = []  # 🏛️ SecGateway 구독으로 쌓인 8-K 공시 dict
         
         logger.info("📰 News Engine v3.0 Beast Mode 초기화")
     
@@ -102,7 +110,7 @@ class NewsEngineV3:
                 elif source['type'] == 'naver_breaking':
                     tasks.append(self._fetch_naver_breaking(session, source))
             
-            tasks.append(self._fetch_sec(session))
+            tasks.append(self._fetch_sec())
             
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
@@ -121,6 +129,7 @@ class NewsEngineV3:
             # 🆕 본문 수집: 키워드 통과한 뉴스들의 본문을 병렬로 fetch
             if news_list:
                 await self._enrich_with_content(session, news_list)
+                self._resolve_tickers(news_list)
 
             return news_list
     
@@ -351,80 +360,119 @@ class NewsEngineV3:
             logger.error(f"{source['name']} HTML 오류: {e}")
             return items
     
-    async def _fetch_sec(self, session):
-        """SEC 8-K 공시 크롤링"""
+    async def _fetch_sec(self):
+        """
+        SEC 8-K 공시 크롤링
+        - 📑 Item 코드 로컬 분류: 중요 항목(SEC_8K_MIN_SCORE 이상)이 있는 공시만 AI 분석 대상
+        - Atom summary에 Item이 없으면 index 페이지에서 보충, 그래도 없으면 키워드 필터
+        """
         items = []
         
         try:
-            headers = {'User-Agent': 'StockBot/3.0 (admin@stockbot.com)'}
-            response = await session.get(self.sec_url, headers=headers, timeout=20)
-            
-            if response.status_code != 200:
-                logger.warning(f"SEC 8-K 실패: {response.status_code}")
-                return items
-            
-            soup = BeautifulSoup(response.text, 'xml')
-            entries = soup.find_all('entry')
-            
-            for entry in entries[:30]:
-                try:
-                    title_tag = entry.find('title')
-                    link_tag = entry.find('link')
-                    updated_tag = entry.find('updated')
-                    
-                    if not title_tag or not link_tag:
-                        continue
-                    
-                    title = title_tag.text.strip()
-                    link = link_tag.get('href')
-                    
-                    title = f"[공시] {title}"
-                    
-                    if self._is_duplicate(title, link):
-                        continue
-                    
-                    pub_time = self._extract_sec_time(updated_tag)
-                    
-                    age_hours = (datetime.now(self.kst) - pub_time).total_seconds() / 3600
-                    if age_hours > 24:
-                        continue
-                    
-                    if not self._passes_keyword_filter(title):
+            # 🏛️ SecGateway 구독으로 쌓인 8-K (Atom + 일일 인덱스): 스캔당 최대 _SEC_PENDING_BATCH 건
+            pending = self._pending_8k[:self._SEC_PENDING_BATCH]
+            del self._pending_8k[:self._SEC_PENDING_BATCH]
+            candidates = []
+            for filing in pending:
+                title = f"[공시] {filing['title']}"
+                if not is_recent(filing, 24) or self._is_duplicate(title, filing['link']):
+                    continue
+                candidates.append({
+                    'raw_title': filing['title'],
+                    'title': title,
+                    'url': filing['link'],
+                    'pub_time': filed_at(filing).astimezone(self.kst),
+                    'sec_items': parse_8k_items(filing['summary']),
+                })
+
+            # 📑 summary에 Item 없는 공시만 index 페이지 병렬 조회
+            missing = [c for c in candidates if not c['sec_items']]
+            if missing:
+                fetched = await asyncio.gather(
+                    *(self._fetch_8k_index_items(c['url']) for c in missing)
+                )
+                for c, sec_items in zip(missing, fetched):
+                    c['sec_items'] = sec_items
+
+            skipped = 0
+            for c in candidates:
+                title = c['title']
+                sec_items = c['sec_items']
+                prefilter_score = score_8k_items(sec_items)
+
+                # 분류 결과는 제목이 바뀌지 않는 한 그대로 → 통과 여부와 무관하게 재조회 방지
+                self._register_news(title, c['url'])
+
+                if sec_items:
+                    if prefilter_score < Config.SEC_8K_MIN_SCORE:
+                        skipped += 1
                         continue
-                    
-                    self._register_news(title, link)
-
-                    # 🔧 회사명 추출: "8-K - Company Name (CIK번호) (Filer)" 형식에서 파싱
-                    # 예: "8-K - M Evo Global Acquisition Corp II (0002087361) (Filer)"
-                    #     → company_name = "M Evo Global Acquisition Corp II"
-                    company_name = ''
-                    company_match = re.search(r'8-K\s*-\s*(.+?)\s*\(\d+\)', title_tag.text.strip())
-                    if company_match:
-                        company_name = company_match.group(1).strip()
-
-                    items.append({
-                        'id': f"SEC_{link}",
-                        'title': title,
-                        'url': link,
-                        'source': 'SEC 8-K',
-                        'market': 'US',
-                        'type': 'filing',
-                        'company_name': company_name,   # 🔧 추가: AI에게 회사명 직접 전달
-                        'timestamp': datetime.now(),
-                        'published_timestamp': pub_time.timestamp(),
-                        'published_time_kst': pub_time.strftime('%Y-%m-%d %H:%M:%S KST')
-                    })
-                    
-                except Exception as e:
-                    logger.debug(f"SEC 항목 오류: {e}")
+                elif not self._passes_keyword_filter(title):
                     continue
+
+                # 🔧 회사명 추출: "8-K - Company Name (CIK번호) (Filer)" 형식에서 파싱
+                # 예: "8-K - M Evo Global Acquisition Corp II (0002087361) (Filer)"
+                #     → company_name = "M Evo Global Acquisition Corp II"
+                company_name = ''
+                company_match = re.search(r'8-K\s*-\s*(.+?)\s*\(\d+\)', c['raw_title'])
+                if company_match:
+                    company_name = company_match.group(1).strip()
+
+                pub_time = c['pub_time']
+                item = {
+                    'id': f"SEC_{c['url']}",
+                    'title': title,
+                    'url': c['url'],
+                    'source': 'SEC 8-K',
+                    'market': 'US',
+                    'type': 'filing',
+                    'company_name': company_name,   # 🔧 추가: AI에게 회사명 직접 전달
+                    'sec_items': sec_items,         # 📑 8-K Item 코드 (프롬프트에 첨부)
+                    'timestamp': datetime.now(),
+                    'published_timestamp': pub_time.timestamp(),
+                    'published_time_kst': pub_time.strftime('%Y-%m-%d %H:%M:%S KST')
+                }
+                if sec_items:
+                    item['prefilter_score'] = prefilter_score  # 키워드 점수 대신 사용
+                items.append(item)
             
-            logger.info(f"✅ SEC 8-K: {len(items)}개")
+            logger.info(f"✅ SEC 8-K: {len(items)}개 (비중요 Item 제외 {skipped}개)")
             return items
             
         except Exception as e:
             logger.error(f"SEC 8-K 오류: {e}")
             return items
+
+    def ingest_sec_filings(self, filings):
+        """
+        🏛️ 8-K 공시 (SecGateway 구독 콜백) → 다음 스캔부터 순차 처리
+        - 실시간 Atom 공시가 일일 인덱스 백필보다 먼저 (백필이 많아도 새 공시가 뒤로 밀리지 않음)
+        """
+        self._pending_8k.extend(filings)
+        self._pending_8k.sort(key=lambda f: f.get('source') != 'atom')   # 안정 정렬 → 각 묶음 내 순서 유지
+        del self._pending_8k[1000:]
+
+    async def _fetch_8k_index_items(self, url):
+        """공시 index 페이지에서 Item 코드 보충 (실패 시 빈 리스트)"""
+        return parse_8k_index_items(await self.sec_gateway.fetch_text(url))
+
+    # ────────────────────────────────────────────
+    # 💾 상태 스냅샷 (state_store.StateStore)
+    # ────────────────────────────────────────────
+    def export_state(self) -> dict:
+        return {
+            'seen_urls':   list(self.seen_urls),
+            'seen_titles': self.seen_titles[-250:],
+            'pending_8k':  self._pending_8k,
+        }
+
+    def import_state(self, state: dict):
+        """재시작 직후: 본 뉴스 / 처리 대기 8-K 복원 (48시간 지난 공시는 버림)"""
+        self.seen_urls.update(state.get('seen_urls', []))
+        self.seen_titles = (state.get('seen_titles', []) + self.seen_titles)[-250:]
+        pending = [f for f in state.get('pending_8k', []) if is_recent(f, 48)]
+        self._pending_8k = (pending + self._pending_8k)[-1000:]
+        logger.info(f"💾 뉴스 상태 복원: URL {len(self.seen_urls)}개 / 8-K 대기 {len(pending)}건")
     
     def _extract_rss_time(self, entry):
         """RSS 발간 시간 파싱 → KST"""
@@ -446,19 +494,6 @@ class NewsEngineV3:
         
         return datetime.now(self.kst)
     
-    def _extract_sec_time(self, updated_tag):
-        """SEC 발간 시간 파싱 → KST"""
-        try:
-            if updated_tag:
-                text = updated_tag.text.strip()
-                dt_utc = datetime.fromisoformat(text.replace('Z', '+00:00'))
-                dt_kst = dt_utc.astimezone(self.kst)
-                return dt_kst
-        except Exception as e:
-            logger.debug(f"SEC 시간 파싱 실패: {e}")
-        
-        return datetime.now(self.kst)
-    
     def _is_duplicate(self, title, url):
         """중복 체크 (URL + 제목 유사도)"""
         if url in self.seen_urls:
@@ -535,6 +570,25 @@ class NewsEngineV3:
         success = sum(1 for r in results if r is True)
         logger.info(f"✅ 본문 수집 완료: {success}/{len(targets)}개 성공")
 
+    def _resolve_tickers(self, news_list):
+        """🔎 미국 공시/보도자료 → 'ticker' 키 추가 (LLM 왕복 없이 즉시 감시 등록용)"""
+        if not self.resolver:
+            return
+        resolved = 0
+        for item in news_list:
+            if item.get('market') != 'US' or item.get('ticker'):
+                continue
+            try:
+                ticker = self.resolver.resolve_news(item)
+            except Exception as e:
+                logger.debug(f"티커 해석 오류: {e}")
+                continue
+            if ticker:
+                item['ticker'] = ticker
+                resolved += 1
+        if resolved:
+            logger.info(f"🔎 로컬 티커 해석: {resolved}개")
+
     async def _fetch_article_content(self, session, news_item):
         """
         소스별 본문 파싱 (timeout 7초, 최대 800자)
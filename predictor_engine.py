@@ -5,345 +5,341 @@ Predictor Engine v3.0 - Beast Mode (야수 모드)
 - SEC Form 4 (미국 내부자 매수)
 - SEC 13D/13G (고래 추적)
 - 중복 방지 완벽
+- 🐋 고래 매칭: whale_list.json (CIK 우선 + 별칭 다중 패턴 최장 일치)
+- 🗂️ CIK → 티커: 로컬 SEC 인덱스 (sqlite, 백그라운드 갱신)
+- ⚡ Form 4 상세 병렬 조회 (SEC 초당 10회 제한 준수), 이미 수집한 접수번호는 재조회 없음
+- 📑 Form 4 원본 XML 파싱 → 발행사·일자별 내부자 순매수 금액 순위
+- 🏛️ 공시 수집은 SecGateway 구독 (Atom + 일일 인덱스 한 스트림)
 """
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
-import aiohttp
-from bs4 import BeautifulSoup
+import math
+from collections import OrderedDict
+from datetime import datetime
 import re
-import yfinance as yf
+
+from config import Config
+from market_regime import MarketRegime
+from sec_gateway import SecGateway, filed_at, is_recent
+from sec_index import SecCompanyIndex
+from sec_parsers import find_form4_xml_url, parse_form4_xml
+from whale_matcher import WhaleMatcher
 
 logger = logging.getLogger(__name__)
 
 class PredictorEngineV3:
-    def __init__(self):
+    STATE_VERSION = 2   # 💾 state_store 스냅샷 스키마
+    STATE_MIGRATIONS = {
+        # v1 → v2: 처리 대기 13D 큐 → 최근 13D 보관, 스캔용 seen_* 제거
+        1: lambda state: {'form4': state.get('form4', []), 'recent_13d': state.get('pending_13d', [])},
+    }
+
+    def __init__(self, sec_index: SecCompanyIndex = None, sec_gateway: SecGateway = None,
+                 regime: MarketRegime = None):
         # 🔥 v3.0: DART API 완전 제거
         # SEC (미국)만 유지
-        self.sec_form4_url = "https://www.sec.gov/cgi-bin/browse-edgar"
-        self.sec_13d_url = "https://www.sec.gov/cgi-bin/browse-edgar"
-        self.sec_company_tickers = "https://www.sec.gov/files/company_tickers.json"
+        # 🏛️ 모든 sec.gov 요청은 게이트웨이 경유 (세션·초당 한도·User-Agent 공유)
+        self.sec_gateway = sec_gateway or SecGateway()
         
-        # 중복 방지 (SEC만)
-        self.seen_form4 = set()
-        self.seen_13d = set()
+        # ⚡ Form 4 상세 동시 조회 수 + 보관 상한
+        self._form4_semaphore = asyncio.Semaphore(Config.SEC_FORM4_CONCURRENCY)
+        self._form4_max = 5000
+
+        # 🏛️ 게이트웨이 구독으로 쌓인 공시 (Atom + 일일 인덱스)
+        self._ingested_form4 = OrderedDict()  # 접수번호 → 파싱된 Form 4 (수집 순)
+        self._recent_13d = []                 # 최근 24시간 SC 13D/13G 공시 (재시작 시 리포트 복원용)
+
+        # 📊 수집 즉시 시그널을 받아갈 리스너 (report_builder.ReportBuilder 등)
+        self._signal_listeners = []
         
-        # CIK → 티커 매핑
-        self.cik_to_ticker = {}
+        # 🗂️ CIK ↔ 티커 인덱스 (갱신 루프는 TelegramBot에서 실행)
+        self.sec_index = sec_index or SecCompanyIndex(sec_gateway=self.sec_gateway)
         
-        # 🐋 유명 고래 (미국) - 40명
-        self.famous_us_whales = {
-            'ICAHN': '👑 Carl Icahn',
-            'ACKMAN': '👑 Bill Ackman (Pershing)',
-            'EINHORN': '👑 David Einhorn',
-            'BERKSHIRE': '🏆 Warren Buffett',
-            'GATES': '🏆 Bill Gates',
-            'SOROS': '🏆 George Soros',
-            'STARBOARD': '⚔️ Starboard Value',
-            'ELLIOTT': '⚔️ Elliott Management',
-            'THIRD POINT': '⚔️ Third Point',
-            'PERSHING': '⚔️ Pershing Square',
-            'VALUEACT': '⚔️ ValueAct',
-            'JANA': '⚔️ JANA Partners',
-            'BLACKROCK': '🏦 BlackRock',
-            'VANGUARD': '🏦 Vanguard',
-            'STATE STREET': '🏦 State Street',
-            'FIDELITY': '🏦 Fidelity',
-            'GOLDMAN': '🏦 Goldman Sachs',
-            'GOLDMAN SACHS': '🏦 Goldman Sachs',
-            'MORGAN STANLEY': '🏦 Morgan Stanley',
-            'JP MORGAN': '🏦 JP Morgan',
-            'JPMORGAN': '🏦 JP Morgan',
-            'CITADEL': '🤖 Citadel',
-            'RENAISSANCE': '🤖 Renaissance Tech',
-            'BRIDGEWATER': '🤖 Bridgewater',
-            'TWO SIGMA': '🤖 Two Sigma',
-            'DE SHAW': '🤖 D.E. Shaw',
-            'MILLENNIUM': '🤖 Millennium',
-            'SOFTBANK': '🇯🇵 SoftBank (손정의)',
-            'BAUPOST': '💎 Baupost',
-            'APPALOOSA': '💎 Appaloosa',
-            'GREENLIGHT': '💎 Greenlight',
-            'LONE PINE': '💎 Lone Pine',
-        }
+        # 🌡️ 시장 국면 (VIX/지수) 스냅샷 공유
+        self.regime = regime or MarketRegime()
+        
+        # 🐋 유명 고래 (미국): whale_list.json → 다중 패턴 매처 (CIK 우선, 별칭 단어 단위 최장 일치)
+        self.whale_matcher = WhaleMatcher.load()
         
         logger.info("🔮 Predictor Engine v3.0 Beast Mode 초기화 (SEC Only)")
     
-    async def generate_daily_report(self, market='US'):
+    # ────────────────────────────────────────────
+    # 🏛️ SEC 공시 수집 (SecGateway 구독 콜백: Atom + 일일 인덱스)
+    # ────────────────────────────────────────────
+    async def ingest_form4(self, filings):
         """
-        아침/저녁 리포트 (간소화)
-        v3.0: SEC 공시만 포함
+        Form 4 → 원본 XML 병렬 조회·파싱 후 보관 → 발행사별 재집계해 리스너에 전달
+        ⚡ 세마포어(SEC_FORM4_CONCURRENCY) + 게이트웨이 초당 한도, 이미 수집한 접수번호는 건너뜀
         """
-        today = datetime.now().date()
-        
-        report = {
-            'date': today,
-            'market': market,
-            'hot_stocks': [],
-            'events_today': [],
-            'risks': []
+        candidates = [
+            f for f in filings
+            if f['accession'] not in self._ingested_form4
+        ]
+        if not candidates:
+            return
+
+        started = asyncio.get_running_loop().time()
+        parsed = await asyncio.gather(*(self._get_form4(f['link']) for f in candidates))
+        logger.debug(
+            f"Form 4 상세 {len(candidates)}건 조회 "
+            f"({asyncio.get_running_loop().time() - started:.1f}s)"
+        )
+
+        count = 0
+        for filing, form4 in zip(candidates, parsed):
+            if form4:
+                self._ingested_form4[filing['accession']] = dict(
+                    form4,
+                    accession=filing['accession'],
+                    filing_url=filing['link'],
+                    date=filing['date'],
+                    updated=filing['updated'],
+                )
+                count += 1
+
+        # 48시간 지난 수집분 정리 (리포트 창은 24시간)
+        while self._ingested_form4:
+            oldest = next(iter(self._ingested_form4.values()))
+            if is_recent(oldest, 48) and len(self._ingested_form4) <= self._form4_max:
+                break
+            self._ingested_form4.popitem(last=False)
+        logger.debug(f"Form 4 수집: {count}/{len(candidates)}건 파싱")
+
+        # 📊 새 공시가 속한 발행사만 다시 집계 → 리스너에 교체 전달
+        if self._signal_listeners and count:
+            tickers = {self._form4_ticker(f) for f in parsed} - {None}
+            affected = [
+                f for f in self._ingested_form4.values()
+                if self._form4_ticker(f) in tickers and is_recent(f, 24)
+            ]
+            self._notify('form4', self._aggregate_insider_buying(affected), tickers)
+
+    def ingest_13d(self, filings):
+        """SC 13D/13G → 리스너에 즉시 전달 (최근 24시간분은 스냅샷용으로 보관)"""
+        self._recent_13d = [f for f in self._recent_13d + list(filings) if is_recent(f, 24)][-1000:]
+
+        if self._signal_listeners:
+            signals = self._recent_13d_signals(filings)
+            if signals:
+                self._notify('13d', signals)
+
+    def _recent_13d_signals(self, filings):
+        """최근 24시간 13D/13G → 리스너용 시그널"""
+        signals = []
+        for filing in filings:
+            try:
+                if is_recent(filing, 24):
+                    signal = self._build_13d_signal(filing)
+                    if signal:
+                        signals.append(signal)
+            except Exception as e:
+                logger.debug(f"13D 항목 오류: {e}")
+        return signals
+
+    def add_signal_listener(self, callback):
+        """callback(kind, signals, tickers) — kind: 'form4'(tickers 의 기존 시그널 교체) / '13d'(추가)"""
+        self._signal_listeners.append(callback)
+
+    def _notify(self, kind, signals, tickers=()):
+        for callback in self._signal_listeners:
+            try:
+                callback(kind, signals, tickers)
+            except Exception as e:
+                logger.warning(f"시그널 리스너 오류: {e}")
+
+    # ────────────────────────────────────────────
+    # 💾 상태 스냅샷 (state_store.StateStore)
+    # ────────────────────────────────────────────
+    def export_state(self) -> dict:
+        return {
+            'form4':      list(self._ingested_form4.values()),
+            'recent_13d': self._recent_13d,
         }
-        
-        if market == 'US':
-            # SEC Form 4 + 13D/13G
-            form4_signals = await self.scan_sec_form4(hours=24)
-            filing_13d = await self.scan_sec_13d(hours=24)
-            
-            all_signals = form4_signals + filing_13d
-            report['events_today'] = self._deduplicate_and_rank(all_signals)
-            
-            # 리스크 체크
-            report['risks'] = await self.check_market_risks('US')
-        
-        logger.info(f"📊 일일 리포트: {len(report['events_today'])}건")
-        return report
-    
-    async def scan_sec_form4(self, hours=24):
+
+    def import_state(self, state: dict):
         """
-        미국 SEC Form 4 (내부자 거래)
-        v3.0: 기존 로직 유지
+        재시작 직후: 수집해 둔 공시 복원 (Form 4 상세 재조회 없음)
+        - 리스너(리포트)에는 최근 24시간분을 다시 집계해 전달
         """
-        signals = []
-        
-        try:
-            params = {
-                'action': 'getcurrent',
-                'type': '4',
-                'company': '',
-                'dateb': '',
-                'owner': 'include',
-                'start': '0',
-                'count': '100',
-                'output': 'atom'
-            }
-            
-            headers = {'User-Agent': 'Mozilla/5.0 (PredictorBot/3.0)'}
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.sec_form4_url, params=params, headers=headers, timeout=15) as response:
-                    if response.status != 200:
-                        logger.warning(f"Form 4 접근 실패: {response.status}")
-                        return signals
-                    
-                    xml = await response.text()
-                    soup = BeautifulSoup(xml, 'xml')
-                    entries = soup.find_all('entry')[:40]
-                    
-                    for entry in entries:
-                        try:
-                            title = entry.find('title').text
-                            link = entry.find('link')['href']
-                            updated = entry.find('updated').text
-                            
-                            if link in self.seen_form4:
-                                continue
-                            
-                            filing_time = datetime.fromisoformat(updated.replace('Z', '+00:00'))
-                            now = datetime.now(filing_time.tzinfo)
-                            
-                            if (now - filing_time).total_seconds() > hours * 3600:
-                                continue
-                            
-                            ticker_match = re.search(r'\(([A-Z]{1,5})\)', title)
-                            if not ticker_match:
-                                continue
-                            
-                            ticker = ticker_match.group(1)
-                            
-                            # 매수/매도 구분
-                            transaction_type = await self._parse_form4_type(link, session)
-                            
-                            if transaction_type != 'BUY':
-                                continue
-                            
-                            self.seen_form4.add(link)
-                            
-                            signals.append({
-                                'ticker': ticker,
-                                'name': ticker,
-                                'signal_type': 'insider_buy',
-                                'event_date': filing_time.date(),
-                                'confidence': 0.80,
-                                'expected_impact': '+10~30%',
-                                'reason': '👔 임원 매수 (Form 4)',
-                                'filing_id': link,
-                                'market': 'US',
-                                'details': {
-                                    'filing_url': link,
-                                    'transaction_type': transaction_type
-                                }
-                            })
-                            
-                            logger.info(f"👔 Form 4: {ticker} 매수")
-                            
-                        except Exception as e:
-                            logger.debug(f"Form 4 항목 오류: {e}")
-                            continue
-                    
-                    if len(self.seen_form4) > 500:
-                        self.seen_form4.clear()
-            
-            logger.info(f"✅ Form 4: {len(signals)}건")
-            return signals
-            
-        except Exception as e:
-            logger.error(f"Form 4 오류: {e}")
-            return signals
-    
-    async def scan_sec_13d(self, hours=24):
+        for filing in state.get('form4', []):
+            if is_recent(filing, 48):
+                self._ingested_form4.setdefault(filing['accession'], filing)
+        recent_13d = [f for f in state.get('recent_13d', []) if is_recent(f, 24)]
+        self._recent_13d = (recent_13d + self._recent_13d)[-1000:]
+        logger.info(f"💾 예측 엔진 상태 복원: Form 4 {len(self._ingested_form4)}건 / 13D·G {len(recent_13d)}건")
+
+        if self._signal_listeners:
+            recent = [f for f in self._ingested_form4.values() if is_recent(f, 24)]
+            tickers = {self._form4_ticker(f) for f in recent} - {None}
+            if tickers:
+                self._notify('form4', self._aggregate_insider_buying(recent), tickers)
+            signals = self._recent_13d_signals(recent_13d)
+            if signals:
+                self._notify('13d', signals)
+
+    def _aggregate_insider_buying(self, filings):
         """
-        미국 SEC 13D/13G (고래 추적)
-        v3.0: 기존 로직 유지
+        비파생 거래 → 발행사·거래일별 순매수 금액 집계 → 순위 시그널
+        - P(장내 매수) / S(장내 매도)만 집계 (A 부여, M 행사, F 세금 등 제외)
+        - 순매수 > 0 인 그룹만, 순매수 금액 내림차순
         """
+        groups = {}
+        for filing in filings:
+            ticker = self._form4_ticker(filing)
+            if not ticker:
+                continue
+            owners = filing.get('owners') or []
+            for txn in filing.get('transactions', []):
+                if txn['code'] not in ('P', 'S') or txn['value'] <= 0:
+                    continue
+                key = (ticker, txn['date'])
+                group = groups.setdefault(key, {
+                    'name': filing.get('issuer_name') or ticker,
+                    'buy_value': 0.0, 'sell_value': 0.0, 'buy_shares': 0.0,
+                    'buyers': {}, 'accessions': set(), 'filing_urls': [],
+                })
+                if txn['code'] == 'P':
+                    group['buy_value']  += txn['value']
+                    group['buy_shares'] += txn['shares']
+                    for owner in owners:
+                        group['buyers'][owner['name']] = owner['role']
+                else:
+                    group['sell_value'] += txn['value']
+                if filing['accession'] not in group['accessions']:
+                    group['accessions'].add(filing['accession'])
+                    group['filing_urls'].append(filing['filing_url'])
+
         signals = []
+        for (ticker, txn_date), group in groups.items():
+            net_buy = group['buy_value'] - group['sell_value']
+            if group['buy_value'] <= 0 or net_buy <= 0:
+                continue
+            roles = sorted(set(group['buyers'].values()))
+            confidence = self._insider_confidence(net_buy, roles, len(group['buyers']))
+            try:
+                event_date = datetime.strptime(txn_date, '%Y-%m-%d').date()
+            except ValueError:
+                event_date = datetime.now().date()
+
+            signals.append({
+                'ticker': ticker,
+                'name': group['name'],
+                'signal_type': 'insider_buy',
+                'event_date': event_date,
+                'confidence': confidence,
+                'expected_impact': '+15~40%' if net_buy >= 1_000_000 else '+10~30%',
+                'reason': (
+                    f"👔 내부자 순매수 ${net_buy:,.0f} "
+                    f"({len(group['buyers'])}명: {', '.join(roles[:3])})"
+                ),
+                'filing_id': group['filing_urls'][0],
+                'market': 'US',
+                'details': {
+                    'filing_url':   group['filing_urls'][0],
+                    'filing_urls':  group['filing_urls'],
+                    'accessions':   sorted(group['accessions']),
+                    'net_buy':      net_buy,
+                    'buy_value':    group['buy_value'],
+                    'sell_value':   group['sell_value'],
+                    'buy_shares':   group['buy_shares'],
+                    'insiders':     group['buyers'],
+                    'transaction_type': 'BUY',
+                }
+            })
+
+        signals.sort(key=lambda x: x['details']['net_buy'], reverse=True)
+        return signals
+
+    def _form4_ticker(self, filing):
+        """Form 4 발행사 티커 (XML 기재값, 없으면 CIK → 티커)"""
+        return filing.get('ticker') or self.sec_index.cik_to_ticker(filing.get('issuer_cik'))
+
+    @staticmethod
+    def _insider_confidence(net_buy, roles, buyer_count):
+        """
+        순매수 금액(로그 스케일) + 역할 + 복수 내부자 → 신뢰도
+        - $25K → 0.50, $250K → 0.60, $2.5M → 0.70, $25M 이상 → 0.80
+        - CEO/CFO/President 포함 +0.05, 내부자 1명 추가마다 +0.03 (최대 +0.09)
+        """
+        confidence = 0.5 + 0.1 * math.log10(max(net_buy, 25_000) / 25_000)
+        confidence = min(confidence, 0.80)
+        titles = ' '.join(roles).upper()
+        if any(key in titles for key in ('CEO', 'CHIEF EXECUTIVE', 'CFO', 'CHIEF FINANCIAL', 'PRESIDENT')):
+            confidence += 0.05
+        confidence += min(0.09, 0.03 * max(0, buyer_count - 1))
+        return round(min(confidence, 0.95), 2)
+    
+    def _build_13d_signal(self, entry):
+        """13D/13G 공시 dict → 고래 시그널 (13D/13G 가 아니면 None)"""
+        title = entry['title']
+        link = entry['link']
+        summary = entry['summary']
+        filing_time = filed_at(entry)
         
-        try:
-            # CIK 매핑 로드 (최초 1회)
-            if not self.cik_to_ticker:
-                await self._load_sec_mappings()
-            
-            params = {
-                'action': 'getcurrent',
-                'type': '',
-                'company': '',
-                'dateb': '',
-                'owner': 'include',
-                'start': '0',
-                'count': '100',
-                'output': 'atom'
-            }
-            
-            headers = {
-                'User-Agent': 'StockAlertBot admin@stockbot.com',
-                'Accept-Encoding': 'gzip, deflate',
-                'Host': 'www.sec.gov'
+        # 13D/13G 필터 (2024.12 이후 EDGAR 폼명 "SCHEDULE 13D" 도 동일 처리)
+        form_type = None
+        priority = 0
+        
+        upper_title = title.upper().replace('SCHEDULE 13', 'SC 13')
+        
+        if "SC 13D/A" in upper_title:
+            form_type = "🔥 SC 13D/A (지분 변경)"
+            priority = 9
+        elif "SC 13D" in upper_title:
+            form_type = "🚨 SC 13D (5%+ 공격적 투자)"
+            priority = 10
+        elif "SC 13G/A" in upper_title:
+            form_type = "📈 SC 13G/A (지분 변경)"
+            priority = 6
+        elif "SC 13G" in upper_title:
+            form_type = "📊 SC 13G (5%+ 단순 투자)"
+            priority = 7
+        else:
+            return None
+        
+        # 고래 확인: 관련 회사 CIK 전부 + 제목/요약 텍스트 → 일치한 고래 전부
+        ciks = [cik for cik, _name in entry.get('companies', [])]
+        whales = self.whale_matcher.match(ciks, (title, summary))
+        whale_name = ', '.join(whales) if whales else None
+        if whales:
+            priority += 3
+        
+        # 티커 추출: 고래(제출자) CIK 를 제외한 대상 회사 우선
+        ticker = None
+        for cik in ciks:
+            if not self.whale_matcher.is_whale_cik(cik):
+                ticker = self.sec_index.cik_to_ticker(cik)
+                if ticker:
+                    break
+        if not ticker and not self.whale_matcher.match_ciks(ciks):
+            ticker = self._extract_ticker_multi(title, summary, link)
+        final_symbol = ticker if ticker else "UNKNOWN"
+        
+        trigger_msg = form_type
+        if whale_name:
+            trigger_msg = f"{whale_name}\n{form_type}"
+        
+        signal = {
+            'ticker': final_symbol,
+            'name': final_symbol,
+            'signal_type': 'whale_alert',
+            'event_date': filing_time.date(),
+            'confidence': 0.85,
+            'expected_impact': '+15~50%',
+            'reason': trigger_msg,
+            'filing_id': link,
+            'market': 'US',
+            'details': {
+                'filing_url': link,
+                'whale_name': whale_name,
+                'whales': whales,
+                'form_type': form_type
             }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.sec_13d_url, params=params, headers=headers, timeout=20) as response:
-                    if response.status != 200:
-                        logger.warning(f"13D/13G 접근 실패: {response.status}")
-                        return signals
-                    
-                    xml = await response.text()
-                    soup = BeautifulSoup(xml, 'xml')
-                    entries = soup.find_all('entry')[:50]
-                    
-                    for entry in entries:
-                        try:
-                            title = entry.find('title').text
-                            link = entry.find('link')['href']
-                            updated = entry.find('updated').text
-                            
-                            summary_tag = entry.find('summary')
-                            summary = summary_tag.text if summary_tag else ''
-                            
-                            if link in self.seen_13d:
-                                continue
-                            
-                            try:
-                                filing_time = datetime.fromisoformat(updated.replace('Z', '+00:00'))
-                            except:
-                                filing_time = datetime.now()
-                            
-                            now = datetime.now(filing_time.tzinfo if filing_time.tzinfo else None)
-                            if (now - filing_time).total_seconds() > hours * 3600:
-                                continue
-                            
-                            # 13D/13G 필터
-                            form_type = None
-                            priority = 0
-                            
-                            upper_title = title.upper()
-                            
-                            if "SC 13D/A" in upper_title:
-                                form_type = "🔥 SC 13D/A (지분 변경)"
-                                priority = 9
-                            elif "SC 13D" in upper_title:
-                                form_type = "🚨 SC 13D (5%+ 공격적 투자)"
-                                priority = 10
-                            elif "SC 13G/A" in upper_title:
-                                form_type = "📈 SC 13G/A (지분 변경)"
-                                priority = 6
-                            elif "SC 13G" in upper_title:
-                                form_type = "📊 SC 13G (5%+ 단순 투자)"
-                                priority = 7
-                            else:
-                                continue
-                            
-                            # 티커 추출
-                            ticker = await self._extract_ticker_multi(title, summary, link, session)
-                            final_symbol = ticker if ticker else "UNKNOWN"
-                            
-                            # 고래 확인
-                            whale_name = None
-                            for whale_key, whale_desc in self.famous_us_whales.items():
-                                if whale_key in title.upper() or whale_key in summary.upper():
-                                    whale_name = whale_desc
-                                    priority += 3
-                                    break
-                            
-                            self.seen_13d.add(link)
-                            
-                            trigger_msg = form_type
-                            if whale_name:
-                                trigger_msg = f"{whale_name}\n{form_type}"
-                            
-                            signals.append({
-                                'ticker': final_symbol,
-                                'name': final_symbol,
-                                'signal_type': 'whale_alert',
-                                'event_date': filing_time.date(),
-                                'confidence': 0.85,
-                                'expected_impact': '+15~50%',
-                                'reason': trigger_msg,
-                                'filing_id': link,
-                                'market': 'US',
-                                'details': {
-                                    'filing_url': link,
-                                    'whale_name': whale_name,
-                                    'form_type': form_type
-                                }
-                            })
-                            
-                            logger.info(f"🐋 13D: {final_symbol} - {form_type}")
-                            
-                        except Exception as e:
-                            logger.debug(f"13D 항목 오류: {e}")
-                            continue
-                    
-                    if len(self.seen_13d) > 1000:
-                        self.seen_13d.clear()
-            
-            logger.info(f"✅ 13D/13G: {len(signals)}건")
-            return signals
-            
-        except Exception as e:
-            logger.error(f"13D/13G 오류: {e}")
-            return signals
-    
-    async def _load_sec_mappings(self):
-        """SEC CIK → 티커 매핑"""
-        try:
-            headers = {'User-Agent': 'StockAlertBot admin@stockbot.com'}
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.sec_company_tickers, headers=headers, timeout=15) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        for company in data.values():
-                            cik = str(company['cik_str']).zfill(10)
-                            ticker = company['ticker']
-                            self.cik_to_ticker[cik] = ticker
-                        
-                        logger.info(f"✅ SEC 매핑: {len(self.cik_to_ticker)}개")
-                    
-        except Exception as e:
-            logger.error(f"SEC 매핑 오류: {e}")
-    
-    async def _extract_ticker_multi(self, title, summary, link, session):
+        }
+        return signal
+
+    def _extract_ticker_multi(self, title, summary, link):
         """다중 전략 티커 추출"""
         # 전략 1: CIK
         cik_match = re.search(r'\((\d{10})\)', title)
@@ -351,8 +347,7 @@ class PredictorEngineV3:
             cik_match = re.search(r'\((\d{7,10})\)', title)
         
         if cik_match:
-            cik = cik_match.group(1).zfill(10)
-            ticker = self.cik_to_ticker.get(cik)
+            ticker = self.sec_index.cik_to_ticker(cik_match.group(1))
             if ticker:
                 return ticker
         
@@ -360,8 +355,7 @@ class PredictorEngineV3:
         if link:
             url_cik_match = re.search(r'/data/(\d+)/', link)
             if url_cik_match:
-                cik = url_cik_match.group(1).zfill(10)
-                ticker = self.cik_to_ticker.get(cik)
+                ticker = self.sec_index.cik_to_ticker(url_cik_match.group(1))
                 if ticker:
                     return ticker
         
@@ -372,95 +366,32 @@ class PredictorEngineV3:
         
         return None
     
-    async def _parse_form4_type(self, filing_url, session):
-        """Form 4 매수/매도 구분"""
-        try:
-            async with session.get(filing_url, timeout=5) as response:
-                if response.status != 200:
-                    return 'UNKNOWN'
-                
-                xml_text = await response.text()
-                
-                if '<transactionCode>P</transactionCode>' in xml_text:
-                    return 'BUY'
-                elif '<transactionCode>S</transactionCode>' in xml_text:
-                    return 'SELL'
-                else:
-                    return 'UNKNOWN'
-        except:
-            return 'UNKNOWN'
-    
-    async def check_market_risks(self, market):
-        """리스크 체크"""
-        risks = []
-        
-        try:
-            if market == 'US':
-                vix = yf.Ticker('^VIX')
-                vix_hist = vix.history(period='1d')
-                
-                if not vix_hist.empty:
-                    vix_value = vix_hist['Close'].iloc[-1]
-                    if vix_value > 30:
-                        risks.append(f"⚠️ VIX 고공행진 ({vix_value:.1f})")
-                    elif vix_value > 20:
-                        risks.append(f"📊 VIX 상승 ({vix_value:.1f})")
-                
-                sp500 = yf.Ticker('^GSPC')
-                sp_hist = sp500.history(period='5d')
-                
-                if len(sp_hist) >= 2:
-                    change = ((sp_hist['Close'].iloc[-1] - sp_hist['Close'].iloc[-2]) / sp_hist['Close'].iloc[-2]) * 100
-                    if change < -2:
-                        risks.append(f"🔴 S&P 500 급락 ({change:.1f}%)")
-            
-            elif market == 'KR':
-                kospi = yf.Ticker('^KS11')
-                kospi_hist = kospi.history(period='5d')
-                
-                if len(kospi_hist) >= 2:
-                    change = ((kospi_hist['Close'].iloc[-1] - kospi_hist['Close'].iloc[-2]) / kospi_hist['Close'].iloc[-2]) * 100
-                    if change < -2:
-                        risks.append(f"🔴 KOSPI 급락 ({change:.1f}%)")
-        
-        except Exception as e:
-            logger.debug(f"리스크 체크 오류: {e}")
-        
-        return risks
-    
-    def _deduplicate_and_rank(self, signals):
+    async def _get_form4(self, filing_url):
         """
-        중복 제거 & 순위
+        Form 4 파싱 결과 (제한된 병렬 조회)
+        - 중복 방지는 ingest_form4 의 _ingested_form4 (접수번호) 가 담당
+        - 조회 실패(None)는 보관하지 않음 → 같은 공시가 다시 오면 재시도
         """
-        unique_map = {}
-        
-        for signal in signals:
-            ticker = signal.get('ticker', 'UNKNOWN')
-            name = signal.get('name', 'Unknown')
-            filing_id = signal.get('filing_id', '')
-            
-            # UNKNOWN이면 회사명으로 구분
-            if ticker == 'UNKNOWN' or not ticker:
-                unique_key = f"UNKNOWN_{name}"
-            else:
-                unique_key = ticker
-            
-            # 고유 ID = unique_key + filing_id
-            signal_id = f"{unique_key}_{filing_id}"
-            
-            # 진짜 중복(=같은 공시)만 제외
-            if signal_id not in unique_map:
-                unique_map[signal_id] = signal
-        
-        # 신뢰도 순 정렬
-        ranked = sorted(
-            unique_map.values(),
-            key=lambda x: x.get('confidence', 0),
-            reverse=True
-        )
-        
-        return ranked[:10]  # TOP 10
+        async with self._form4_semaphore:
+            return await self._fetch_form4(filing_url)
 
+    async def _fetch_form4(self, filing_url):
+        """index 페이지 → 원본 XML 경로 → 파싱 (실패 시 None)"""
+        try:
+            xml_url = filing_url if filing_url.lower().endswith('.xml') else None
+            if not xml_url:
+                index_html = await self.sec_gateway.fetch_text(filing_url, timeout=5)
+                xml_url = find_form4_xml_url(index_html, filing_url)
+                if not xml_url:
+                    return None
 
+            status, data = await self.sec_gateway.fetch(xml_url, timeout=5)
+            if status != 200:
+                return None
+            return parse_form4_xml(data)
+        except Exception as e:
+            logger.debug(f"Form 4 파싱 실패 ({filing_url}): {e}")
+            return None
+    
 # Production alias
 PredictorEngine = PredictorEngineV3
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Prompts - AI Brain 프롬프트 템플릿 (사전 컴파일)
+- ✅ 고정 규칙/스키마 = 정적 prefix (import 시 1회 생성, 매 호출 재조립 없음)
+- ✅ 뉴스 제목/본문 등 가변 입력 = 짧은 suffix (맨 뒤에 붙임)
+  → prefix가 항상 동일 → 제공자 측 컨텍스트 캐시(암시적/명시적) 적중 가능
+- ✅ PromptStats: 템플릿×모델별 프롬프트 크기 / 토큰 / 지연시간 집계
+"""
+
+import hashlib
+import textwrap
+from collections import defaultdict
+
+
+class PromptTemplate:
+    """
+    prefix(정적) + suffix(가변) 구조의 프롬프트
+    - render(**fields) = prefix + suffix.format(**fields)
+    - suffix 값에 중괄호가 있어도 안전 (format은 템플릿 쪽만 해석)
+    """
+
+    def __init__(self, name: str, prefix: str, suffix: str):
+        self.name   = name
+        self.prefix = textwrap.dedent(prefix).strip() + '\n\n'
+        self.suffix = textwrap.dedent(suffix).strip()
+        self.prefix_chars = len(self.prefix)
+        self.prefix_hash  = hashlib.sha1(self.prefix.encode('utf-8')).hexdigest()[:12]
+
+    def render(self, **fields) -> str:
+        return self.prefix + self.suffix.format(**fields)
+
+    def split(self, prompt: str):
+        """render() 결과를 (prefix, suffix)로 분리 (캐시 사용 시 suffix만 전송)"""
+        if prompt.startswith(self.prefix):
+            return self.prefix, prompt[self.prefix_chars:]
+        return None, prompt
+
+
+# ────────────────────────────────────────────────────────
+# quick_score (DEPRECATED, 하위 호환용)
+# ────────────────────────────────────────────────────────
+QUICK_SCORE = PromptTemplate(
+    'quick_score',
+    prefix="""
+    너는 초단타 급등주 전문 스캘퍼다. 맨 아래 뉴스 제목만 보고 상한가 가능성을 0~10점으로 평가해라.
+
+    ══════════════════════════════════════
+    ⚠️ 최우선 규칙 (이 키워드 있으면 무조건 9-10점):
+    ══════════════════════════════════════
+    [영어 M&A]
+    "acquisition", "merger", "acquired", "merge", "buyout", "takeover",
+    "tender offer", "definitive agreement", "going private", "take private"
+
+    [한국어 M&A/지배구조]
+    "인수합의", "인수완료", "합병완료", "경영권 인수", "최대주주 변경",
+    "경영권 분쟁", "적대적 M&A", "공개매수"
+
+    [영어 자금조달/계약]
+    "$100M", "$200M", "$500M", "$1B", "private placement", "raises",
+    "contract win", "contract award", "awarded contract", "major contract"
+
+    [한국어 계약/수주]
+    "대규모 수주", "공급 계약", "납품 계약", "독점 공급", "수출 계약",
+    "정부 계약", "최대 수주", "역대 최대 계약"
+
+    [영어 바이오]
+    "fda approval", "fda approved", "fda clearance", "breakthrough designation",
+    "phase 3 success", "primary endpoint met", "positive topline"
+
+    [한국어 바이오]
+    "임상 성공", "FDA 승인", "허가 획득", "신약 허가"
+
+    ══════════════════════════════════════
+    ⚠️ 악재 감지 시 무조건 0-2점:
+    ══════════════════════════════════════
+    "유상증자" (단, "유상증자 철회/취소"는 9점!),
+    "상장폐지", "관리종목", "감자", "파산", "bankruptcy",
+    "delisting", "going concern", "class action", "fda rejection",
+    "crl", "clinical hold", "failed to meet", "recall",
+    "investigation", "securities fraud", "reverse split"
+
+    ══════════════════════════════════════
+    일반 평가 기준:
+    ══════════════════════════════════════
+    - 8점: FDA 승인, 정부 계약 완료, 대형 파트너십 (NVIDIA/MS 등)
+    - 7점: 임상 긍정적 데이터, 중형 계약, 실적 서프라이즈
+    - 5~6점: 소규모 제휴, 제품 출시, 소형 계약
+    - 3~4점: 의견, 전망, 분석 리포트
+    - 0~2점: 악재 키워드 또는 명백한 노이즈
+
+    JSON 형식:
+    {"score": 숫자, "reason": "판단 근거 한 줄"}
+    """,
+    suffix="""
+    제목: {title}
+    """,
+)
+
+
+# ────────────────────────────────────────────────────────
+# analyze_news_signal (24시간 뉴스 분석 → 호출 빈도 최다)
+# ────────────────────────────────────────────────────────
+NEWS_SIGNAL = PromptTemplate(
+    'news_signal',
+    prefix="""
+    너는 주식 트레이딩 전문가다. 맨 아래 [분석 대상 뉴스]를 깊이 분석해서 수혜주를 찾아줘.
+
+    ══════════════════════════════════════
+    ⛔ 절대 금지 (위반 시 시스템 오류로 간주):
+    ══════════════════════════════════════
+    1. 본문/제목에 명시되지 않은 기업을 '수혜주'로 추천하지 마라.
+    2. 특히 아래 기업들은 뉴스와 직접 관련(계약·지분·파트너십·공식 언급)이 없으면 절대 추천 금지:
+       - SOOP (067160): 스트리밍 플랫폼. 관련 없는 뉴스에 반복적으로 나옴 → 철저히 금지
+       - 애경산업 (018250): 화장품 ODM. 미용 관련이어도 직접 언급 없으면 금지
+       - 미래에셋증권 (006800): 증권사. 금융 뉴스라도 직접 관련 없으면 금지
+    3. 삼성전자 (005930)는 반도체·스마트폰·가전 분야 기업임. 삼성화재·삼성증권 등 다른 삼성 계열사와 혼동 금지.
+    4. 미국 기업 뉴스에서 한국 종목을 간접수혜로 추천하지 마라.
+       - "A가 B에 부품을 납품하므로 A가 수혜" 같은 6단계 논리 금지
+       - 한국 종목은 뉴스에 한국 기업이 명시적으로 언급된 경우에만 추천
+    5. 관련 수혜주가 없으면 recommendations를 빈 리스트([])로 반환해라. 억지로 채우지 마라.
+    6. "AI 관련", "K-뷰티 관련" 같은 막연한 이유로 연관 없는 기업을 넣지 마라.
+
+    ⛔ 뒷북 방지:
+    - "상한가", "신고가 경신", "무더기 상한가", "폭등 마감" 등 이미 결과가 나온 뉴스 → score 0점
+    - 스캘핑 봇은 "오르기 전" 재료를 찾는다
+
+    ⛔ 저품질 뉴스 필터:
+    - 교육 과정 홍보, 행사 안내, 비영리재단 프로그램, 세무/회계 소프트웨어 출시 → score 1~3점
+    - 비상장 소기업 제품 출시 보도자료 (수혜 상장사 없음) → score 2~4점
+    - 주가 직접 영향 없는 홍보성 보도자료 → score 3점 이하
+    ══════════════════════════════════════
+
+    분석 가이드:
+    1. 회사명: 뉴스 제목/본문에서 정확히 추출. UNKNOWN 금지.
+    2. 티커:
+       - 한국: 6자리 숫자만. 확실히 아는 경우에만 사용. 모르면 반드시 "비상장"
+         (회사명을 정확히 쓰면 코드는 시스템이 KRX 종목 마스터로 다시 확인함)
+       - 미국: 정확한 심볼만. 모르면 "비상장"
+    3. 점수:
+       - 9~10점: M&A 확정, FDA 승인, 대규모 수주 확정
+       - 7~8점: 임상 성공, 실적 서프라이즈, 구체적 파트너십
+       - 4~6점: 제품 출시, 소규모 계약, 간접 테마
+       - 0~3점: 홍보성, 뒷북, 저품질
+
+    JSON 형식 (키 순서 그대로 출력, score와 top_ticker를 가장 먼저):
+    {
+        "score": 0~10 정수,
+        "top_ticker": "가장 큰 수혜주 1개 티커 (확실한 경우만, 불확실하면 null)",
+        "ticker_in_news": "뉴스에 명시된 티커 (없으면 null)",
+        "certainty": "confirmed" or "uncertain",
+        "news_reliability": "high" or "medium" or "low",
+        "summary": "핵심 요약 1줄",
+        "key_catalyst": "핵심 재료",
+        "surge_timing": "단기(당일~3일)" or "중기(1~2주)" or "없음",
+        "recommendations": [
+            {
+                "rank": "1등",
+                "ticker": "확실한 티커 (모르면 비상장)",
+                "name": "실제 회사명 (UNKNOWN 금지)",
+                "benefit_type": "직접수혜" or "간접수혜",
+                "reason": "본문 근거 구체적 이유 (20자 이상)"
+            }
+        ]
+    }
+    """,
+    suffix="""
+    ══════════════════════════════════════
+    [분석 대상 뉴스]
+    ══════════════════════════════════════
+    제목: {title}
+    출처: {source}{company_hint_line}{filing_items_line}{content_line}
+    """,
+)
+
+
+# ────────────────────────────────────────────────────────
+# generate_daily_summary
+# ────────────────────────────────────────────────────────
+DAILY_SUMMARY = PromptTemplate(
+    'daily_summary',
+    prefix="""
+    너는 초단타 급등주 전문 스캘퍼다. 맨 아래 [오늘의 주요 시그널]을 보고 오늘의 핵심 이슈를 분석해서 요약해줘.
+
+    ══════════════════════════════════════
+    분석 요청:
+    ══════════════════════════════════════
+    1. 오늘의 핵심 테마 (2~3줄)
+       - 시그널들 사이에 공통 테마나 연결고리가 있는가?
+       - 오늘 시장에서 가장 주목받을 섹터는?
+
+    2. 주목할 종목 TOP 3
+       - 종목명 + 티커 + 한 줄 이유
+       - 직접 수혜 종목 우선 선정
+
+    3. 내일 주목할 이벤트/촉매
+       - 오늘 뉴스의 후속 반응으로 내일 움직일 종목이나 섹터
+       - 예정된 발표, 실적, 이벤트 등
+
+    4. 리스크 요인 (간단히)
+
+    ⚠️ 스타일: 간결하고 직접적으로. 추측은 "가능성" 표현 사용.
+    """,
+    suffix="""
+    [오늘의 주요 시그널]
+    {signals_json}
+    """,
+)
+
+
+# ────────────────────────────────────────────────────────
+# analyze_stock_on_demand (/analyze 전용)
+# ────────────────────────────────────────────────────────
+STOCK_ON_DEMAND = PromptTemplate(
+    'stock_on_demand',
+    prefix="""
+    너는 주식 전문 애널리스트다. 맨 아래 [종목 정보]의 종목을 종합적으로 분석해줘.
+
+    ══════════════════════════════════════
+    분석 항목 (반드시 포함):
+    ══════════════════════════════════════
+    1. 📌 종목 핵심 요약 (2~3줄)
+       - 이 회사가 뭘 하는 곳인지
+       - 현재 시장 포지션
+
+    2. 🔥 현재 주목 이유
+       - 최근 이슈나 테마가 있는가?
+       - 업황은 좋은가 나쁜가?
+
+    3. 📈 단기 급등 가능성 (0~10점)
+       - 점수와 근거
+
+    4. ⚠️ 주요 리스크
+       - 2~3가지 간결하게
+
+    5. 💡 투자 포인트 한 줄 요약
+
+    ⚠️ 스타일: 간결하고 실용적으로. 모르면 솔직하게 "정보 부족"이라고 해라.
+    투자 권유가 아닌 정보 제공임을 마지막에 한 줄 명시.
+    """,
+    suffix="""
+    [종목 정보]
+    종목명: {ticker_name}
+    심볼: {symbol}
+    섹터: {sector}
+    업종: {industry}
+    시가총액: {cap_str}{pe_line}{description_line}
+    """,
+)
+
+
+# ────────────────────────────────────────────────────────
+# 프롬프트 크기 / 지연시간 집계
+# ────────────────────────────────────────────────────────
+class PromptStats:
+    """
+    (템플릿, 모델)별 누적 통계
+    - prompt_chars: 전송한 프롬프트 글자 수
+    - prompt_tokens / response_tokens / cached_tokens: usage_metadata 실측 (없으면 0)
+    - latency: 호출 시작 ~ 응답 완료 (초)
+    """
+
+    def __init__(self):
+        self._rows = defaultdict(lambda: {
+            'calls': 0, 'prompt_chars': 0, 'prompt_tokens': 0,
+            'response_tokens': 0, 'cached_tokens': 0, 'latency': 0.0,
+        })
+
+    def record(self, template: str, model: str, prompt_chars: int, prompt_tokens: int = 0,
+               response_tokens: int = 0, cached_tokens: int = 0, latency: float = 0.0):
+        row = self._rows[(template or 'raw', model)]
+        row['calls']           += 1
+        row['prompt_chars']    += prompt_chars
+        row['prompt_tokens']   += prompt_tokens or 0
+        row['response_tokens'] += response_tokens or 0
+        row['cached_tokens']   += cached_tokens or 0
+        row['latency']         += latency
+
+    def rows(self) -> list:
+        """[(template, model, 평균값 dict)] - 벤치마크/상태 표시용"""
+        result = []
+        for (template, model), row in self._rows.items():
+            calls = row['calls'] or 1
+            result.append((template, model, {
+                'calls':           row['calls'],
+                'prompt_chars':    row['prompt_chars'] / calls,
+                'prompt_tokens':   row['prompt_tokens'] / calls,
+                'response_tokens': row['response_tokens'] / calls,
+                'cached_tokens':   row['cached_tokens'] / calls,
+                'latency':         row['latency'] / calls,
+            }))
+        return result
+
+    def format_status(self) -> str:
+        lines = []
+        for template, model, avg in sorted(self.rows()):
+            lines.append(
+                f"  • {template}@{model}: {avg['calls']}회 · "
+                f"입력 {avg['prompt_chars']:.0f}자/{avg['prompt_tokens']:.0f}tok · "
+                f"출력 {avg['response_tokens']:.0f}tok · {avg['latency']:.1f}s"
+            )
+        return '\n'.join(lines) if lines else "  • 기록 없음"
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+Quota Manager - Gemini/Gemma 모델별 쿼터 관리
+- ✅ 모델별 토큰 버킷 3종: RPM(분당 요청) / TPM(분당 토큰) / RPD(일일 요청)
+- ✅ 호출 전 판단: 한도 임박 → 짧게 대기(큐잉) / 대기 길면 즉시 다음 모델로 라우팅
+- ✅ 429(RESOURCE_EXHAUSTED) 수신 시 해당 모델 쿨다운 → 헛된 왕복 방지
+- ✅ 일일 카운터 파일 저장 (재시작해도 RPD 유지, 태평양 자정 리셋) — 주기 루프가 스레드로 기록
+- ✅ /status 용 요약 문자열 제공
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+import pytz
+
+from config import Config
+from rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Gemini API 일일 쿼터는 태평양 시간 자정에 리셋됨
+_QUOTA_TZ = pytz.timezone('America/Los_Angeles')
+
+# 429 응답에서 재시도 대기 시간 추출 ("retryDelay": "17s" / "retry in 17.2s")
+_RETRY_DELAY_RE = re.compile(r'retry(?:Delay)?["\'\s:]*(?:in\s*)?["\']?(\d+(?:\.\d+)?)\s*s', re.I)
+
+
+class QuotaExceededError(Exception):
+    """쿼터 한도로 호출 불가 → 호출부에서 다음 모델로 fallback"""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 근사치 (실측 usage_metadata 가 오기 전 예약용)
+    - 영문 ~4자/토큰, 한글은 1~2자/토큰 → 보수적으로 3자/토큰
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // 3)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """SDK/REST 예외 중 429 계열 판별"""
+    code = getattr(error, 'code', None) or getattr(error, 'status', None)
+    if code == 429:
+        return True
+    text = str(error)
+    return '429' in text or 'RESOURCE_EXHAUSTED' in text.upper()
+
+
+def parse_retry_after(error: Exception, default: float = 30.0) -> float:
+    match = _RETRY_DELAY_RE.search(str(error))
+    if match:
+        try:
+            return float(match.group(1))
+        except ValueError:
+            pass
+    return default
+
+
+class _ModelQuota:
+    """모델 1개의 버킷 + 일일 카운터"""
+
+    def __init__(self, name: str, limits: dict):
+        self.name = name
+        self.rpm  = limits.get('rpm')
+        self.tpm  = limits.get('tpm')
+        self.rpd  = limits.get('rpd')
+
+        # None = 무제한 (버킷 생성 안 함)
+        self.req_bucket   = TokenBucket(self.rpm, self.rpm / 60.0) if self.rpm else None
+        self.token_bucket = TokenBucket(self.tpm, self.tpm / 60.0) if self.tpm else None
+
+        self.day_requests  = 0
+        self.day_tokens    = 0
+        self.rejected      = 0     # 로컬에서 막은 호출 (왕복 절약)
+        self.rate_limited  = 0     # 서버 429 수신
+        self.cooldown_until = 0.0  # time.monotonic 기준
+
+        self.lock = asyncio.Lock()
+
+    def wait_time(self, tokens: int) -> float:
+        waits = [max(0.0, self.cooldown_until - time.monotonic())]
+        if self.req_bucket:
+            waits.append(self.req_bucket.wait_time(1))
+        if self.token_bucket:
+            waits.append(self.token_bucket.wait_time(tokens))
+        return max(waits)
+
+    def day_exhausted(self) -> bool:
+        return bool(self.rpd) and self.day_requests >= self.rpd
+
+
+class QuotaManager:
+    def __init__(self, limits: dict = None, state_path: str = None):
+        self.limits     = limits if limits is not None else Config.AI_MODEL_QUOTAS
+        self.state_path = state_path or os.path.join(Config.DATA_DIR, 'ai_quota.json')
+        self.max_wait   = Config.AI_QUOTA_MAX_WAIT
+        self.flush_seconds = Config.AI_QUOTA_FLUSH_SECONDS
+
+        self._models: dict = {}
+        self._day = self._today()
+        self._dirty = False        # 마지막 저장 이후 변경 (run_loop 가 주기 저장)
+        self._file_lock = threading.Lock()   # 주기 저장(스레드) ↔ 종료 저장 직렬화
+
+        self._load()
+        logger.info(f"🎫 Quota Manager 초기화 ({len(self.limits)}개 모델 한도 등록)")
+
+    # ────────────────────────────────────────────
+    # 내부 헬퍼
+    # ────────────────────────────────────────────
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(_QUOTA_TZ).strftime('%Y-%m-%d')
+
+    def _model(self, name: str) -> _ModelQuota:
+        quota = self._models.get(name)
+        if quota is None:
+            quota = _ModelQuota(name, self.limits.get(name, {}))
+            self._models[name] = quota
+        return quota
+
+    def _roll_day(self):
+        """태평양 자정이 지났으면 일일 카운터 리셋"""
+        today = self._today()
+        if today != self._day:
+            logger.info(f"🎫 일일 쿼터 리셋 ({self._day} → {today})")
+            self._day = today
+            for quota in self._models.values():
+                quota.day_requests = 0
+                quota.day_tokens   = 0
+                quota.rejected     = 0
+                quota.rate_limited = 0
+            self._dirty = True
+
+    # ────────────────────────────────────────────
+    # 호출 전/후 API
+    # ────────────────────────────────────────────
+    async def acquire(self, model: str, est_tokens: int = 0, max_wait: float = None):
+        """
+        호출 슬롯 예약
+        - RPD 소진 / 쿨다운 중 / 대기 시간 > max_wait → QuotaExceededError (왕복 없이 다음 모델)
+        - 그 외 → 필요 시 짧게 대기 후 RPM/TPM 차감
+        """
+        self._roll_day()
+        quota = self._model(model)
+        max_wait = self.max_wait if max_wait is None else max_wait
+
+        # 같은 모델 호출은 순서대로 대기 (버스트 시 큐잉)
+        async with quota.lock:
+            # 락 대기 중 앞선 호출이 RPD 를 채웠을 수 있음 → 락 안에서 확인
+            if quota.day_exhausted():
+                quota.rejected += 1
+                raise QuotaExceededError(f"{model} 일일 한도 소진 ({quota.day_requests}/{quota.rpd})")
+
+            wait = quota.wait_time(est_tokens)
+            if wait > max_wait:
+                quota.rejected += 1
+                raise QuotaExceededError(f"{model} 분당 한도 임박 (대기 {wait:.1f}s > {max_wait:.0f}s)")
+            if wait > 0:
+                logger.debug(f"🎫 [{model}] 쿼터 대기 {wait:.1f}s")
+                await asyncio.sleep(wait)
+
+            if quota.req_bucket:
+                quota.req_bucket.consume(1)
+            if quota.token_bucket:
+                quota.token_bucket.consume(est_tokens)
+            quota.day_requests += 1
+            self._dirty = True
+
+    def record_usage(self, model: str, est_tokens: int, actual_tokens: int = None):
+        """
+        응답 후 실측 토큰 반영
+        - actual_tokens 없으면 예약치 그대로 집계
+        - 예약보다 적게 썼으면 TPM 버킷에 차액 환급, 많이 썼으면 추가 차감
+        """
+        quota = self._model(model)
+        used = actual_tokens if actual_tokens is not None else est_tokens
+        if quota.token_bucket and actual_tokens is not None:
+            diff = est_tokens - actual_tokens
+            if diff > 0:
+                quota.token_bucket.refund(diff)
+            elif diff < 0:
+                quota.token_bucket.consume(-diff)
+        quota.day_tokens += used
+        self._dirty = True
+
+    def report_rate_limited(self, model: str, retry_after: float = 30.0):
+        """서버 429 → 버킷 비우고 retry_after 동안 해당 모델 건너뜀"""
+        quota = self._model(model)
+        quota.rate_limited += 1
+        quota.cooldown_until = max(quota.cooldown_until, time.monotonic() + retry_after)
+        if quota.req_bucket:
+            quota.req_bucket.drain()
+        logger.warning(f"🎫 [{model}] 429 수신 → {retry_after:.0f}s 쿨다운")
+        self._dirty = True
+
+    def is_available(self, model: str, est_tokens: int = 0) -> bool:
+        """대기 없이 바로 호출 가능한지 (라우팅 참고용)"""
+        self._roll_day()
+        quota = self._model(model)
+        return not quota.day_exhausted() and quota.wait_time(est_tokens) <= self.max_wait
+
+    # ────────────────────────────────────────────
+    # 영속화 (일일 카운터)
+    # ────────────────────────────────────────────
+    def _load(self):
+        try:
+            if not os.path.exists(self.state_path):
+                return
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('day') != self._day:
+                logger.info(f"🎫 저장된 쿼터는 지난 날짜({data.get('day')}) → 새로 시작")
+                return
+            for name, counters in data.get('models', {}).items():
+                quota = self._model(name)
+                quota.day_requests = counters.get('requests', 0)
+                quota.day_tokens   = counters.get('tokens', 0)
+                quota.rejected     = counters.get('rejected', 0)
+                quota.rate_limited = counters.get('rate_limited', 0)
+            logger.info(f"🎫 일일 쿼터 복원: {len(data.get('models', {}))}개 모델")
+        except Exception as e:
+            logger.warning(f"🎫 쿼터 파일 로드 실패: {e}")
+
+    def _snapshot(self) -> dict:
+        """(이벤트 루프) 저장할 일일 카운터"""
+        return {
+            'day': self._day,
+            'models': {
+                name: {
+                    'requests':     q.day_requests,
+                    'tokens':       q.day_tokens,
+                    'rejected':     q.rejected,
+                    'rate_limited': q.rate_limited,
+                }
+                for name, q in self._models.items()
+            },
+        }
+
+    def _write(self, data: dict) -> bool:
+        """(스레드 가능) 파일로 원자적 교체"""
+        with self._file_lock:
+            try:
+                os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+                tmp_path = self.state_path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.state_path)
+                return True
+            except Exception as e:
+                logger.warning(f"🎫 쿼터 파일 저장 실패: {e}")
+                return False
+
+    def flush(self):
+        """변경분 즉시 저장 (동기, 종료 시)"""
+        if self._dirty:
+            self._dirty = False
+            if not self._write(self._snapshot()):
+                self._dirty = True
+
+    async def run_loop(self, report=None):
+        """
+        flush_seconds 마다 변경분을 스레드로 저장 (호출 경로에서는 파일 I/O 없음)
+        report: TaskSupervisor.reporter (저장 성공/실패 보고)
+        """
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            started = time.monotonic()
+            if self._dirty:
+                self._dirty = False
+                if not await asyncio.to_thread(self._write, self._snapshot()):
+                    self._dirty = True
+                    if report:
+                        report.error(RuntimeError('쿼터 파일 저장 실패'))
+                    continue
+            if report:
+                report.ok(started)
+
+    # ────────────────────────────────────────────
+    # 상태 표시
+    # ────────────────────────────────────────────
+    def format_status(self) -> str:
+        self._roll_day()
+        lines = []
+        for name, quota in self._models.items():
+            rpd = f"/{quota.rpd}" if quota.rpd else ""
+            line = f"  • {name}: {quota.day_requests}{rpd}회 · {quota.day_tokens:,}tok"
+            if quota.rejected:
+                line += f" · 절약 {quota.rejected}회"
+            if quota.rate_limited:
+                line += f" · 429 {quota.rate_limited}회"
+            if quota.cooldown_until > time.monotonic():
+                line += " · ⏸️쿨다운"
+            lines.append(line)
+        if not lines:
+            return "  • 오늘 호출 없음"
+        return '\n'.join(lines)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Rate Limit - 공용 토큰 버킷
+- ✅ TokenBucket: 용량/충전 속도 기반 순수 계산 (I/O 없음)
+- ✅ AsyncRateLimiter: await acquire() 로 초당 요청 수 제한 (FIFO 대기)
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    용량(capacity)만큼 쌓이고 초당 refill_rate 만큼 충전되는 버킷.
+    예) RPM 30 → TokenBucket(30, 30 / 60)
+    """
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity    = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self.tokens      = float(capacity)
+        self.updated_at  = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.updated_at = now
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """amount 만큼 꺼내려면 몇 초 기다려야 하는지 (0 = 즉시 가능)"""
+        self._refill()
+        # 용량보다 큰 요청은 가득 찬 상태에서 한 번에 허용 (영원히 막히는 것 방지)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        if self.refill_rate <= 0:
+            return float('inf')
+        return (amount - self.tokens) / self.refill_rate
+
+    def consume(self, amount: float = 1.0):
+        """잔량 확인 없이 차감 (음수 허용 → 이후 대기 시간으로 상환)"""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        """예상치보다 적게 썼을 때 돌려주기 (용량 초과 불가)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def drain(self):
+        """429 수신 등으로 버킷을 즉시 비움"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return max(0.0, self.tokens)
+
+
+class AsyncRateLimiter:
+    """
+    초당 rate 회 요청 제한 (버스트 burst 허용).
+    여러 코루틴이 동시에 acquire() 해도 Lock으로 순서대로 통과.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        self.bucket = TokenBucket(burst if burst is not None else rate, rate)
+        self._lock  = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0):
+        async with self._lock:
+            wait = self.bucket.wait_time(amount)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.bucket.consume(amount)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
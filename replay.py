@@ -0,0 +1,752 @@
+# -*- coding: utf-8 -*-
+"""
+Replay Harness - 녹화한 외부 응답으로 실제 파이프라인을 오프라인 재생 (성능/튜닝 측정)
+- ✅ record: 실시간으로 뉴스/집중 감시/한국 전체/SEC 주기를 돌리며 모든 외부 응답을 카세트에 기록
+- ✅ replay: 카세트 시작 시각부터 가상 시계를 tick 씩 전진 → 그 시각까지 녹화된 최신 응답만 반환
+- ✅ 외부 경계: curl_cffi AsyncSession / aiohttp.ClientSession / yfinance.Ticker / Gemini REST 클라이언트
+- ✅ 엔진 시계(datetime.now / time.time / time.monotonic)도 가상 시계 → 같은 카세트 = 같은 결과
+- ✅ 텔레그램 전송은 캡처만 (발신 한도 해제), 봇 루프 대신 하네스가 같은 주기 함수를 직접 호출
+- ✅ 리포트: 알림 수(우선순위별) + 다이제스트, 주기별 소요 시간, 버스 스테이지 지연, 처리량, 미녹화 요청
+
+카세트: JSON Lines (.gz 가능) — meta / http / yf / llm / end 레코드, t = 시작 후 경과 초 (tick 단위)
+
+사용법:
+    python replay.py record day.jsonl.gz --minutes 390      # 장중 녹화 (실제 API 호출)
+    python replay.py replay day.jsonl.gz                    # 최대 속도 재생
+    python replay.py replay day.jsonl.gz --speed 60 --json report.json
+    python replay.py replay day.jsonl.gz --repeat 2                # 결정성 확인 (다이제스트 불일치 시 종료 코드 1)
+"""
+
+import argparse
+import asyncio
+import base64
+import bisect
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from urllib.parse import urlencode
+
+import aiohttp
+import yfinance
+
+from config import Config
+from gemini_rest import GeminiApiError, GeminiResponse
+from quota_manager import QuotaManager
+from rate_limit import AsyncRateLimiter
+
+logger = logging.getLogger(__name__)
+
+_CASSETTE_VERSION = 1
+
+# 가상 시계로 바꿀 모듈 (datetime.now / time.time·monotonic)
+# telegram_bot / alert_coalescer: 알림 본문의 ⏰ 시각 → 다이제스트가 재생마다 같도록
+_DATETIME_MODULES = ('news_engine', 'momentum_tracker', 'predictor_engine', 'sec_gateway',
+                     'dedup_store', 'watch_registry', 'report_builder', 'ai_brain',
+                     'telegram_bot', 'alert_coalescer')
+_TIME_MODULES = ('watch_registry', 'watch_scheduler', 'report_builder', 'signal_store')
+
+# 녹화하지 않고 그대로 통과 (LLM 은 클라이언트 단에서 따로 기록)
+_PASSTHROUGH_HOSTS = ('generativelanguage.googleapis.com',)
+
+# 재시작 없이 복사해 쓰는 정적 마스터 (CIK/티커, KRX 종목)
+_SEED_FILES = ('sec_index.db', 'kr_master.db')
+
+
+# ────────────────────────────────────────────────────────
+# 시계
+# ────────────────────────────────────────────────────────
+class ReplayClock:
+    """시작 epoch + 경과 초 (tick 경계에서만 전진)"""
+
+    def __init__(self, start: float):
+        self.start = start
+        self.offset = 0.0
+
+    def time(self) -> float:
+        return self.start + self.offset
+
+    def monotonic(self) -> float:
+        return 1_000_000.0 + self.offset
+
+
+_CLOCK: ReplayClock = None
+
+
+class _ReplayDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls.fromtimestamp(_CLOCK.time(), tz)
+
+
+class _ReplayTime:
+    """time 모듈 대용: time()/monotonic() 만 가상, 나머지는 그대로"""
+
+    def time(self):
+        return _CLOCK.time()
+
+    def monotonic(self):
+        return _CLOCK.monotonic()
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+# ────────────────────────────────────────────────────────
+# 카세트
+# ────────────────────────────────────────────────────────
+def _open(path: str, mode: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    def __init__(self, path: str, recording: bool):
+        self.path = path
+        self.recording = recording
+        self.meta = {}
+        self.duration = 0.0
+        self._index = {}                  # (kind, key) → ([t], [레코드])
+        self._file = None
+        self._lock = threading.Lock()     # yfinance 는 스레드에서 호출
+        self.hits = Counter()
+        self.misses = Counter()
+        self.missed_keys = defaultdict(set)
+
+    def open_writer(self, start: float, tick: float):
+        self._file = _open(self.path, 'w')
+        self.meta = {'kind': 'meta', 'version': _CASSETTE_VERSION, 'start': start, 'tick': tick}
+        self._write(self.meta)
+
+    def close(self):
+        if self._file is not None:
+            self._write({'kind': 'end', 't': _CLOCK.offset})
+            self._file.close()
+            self._file = None
+
+    def _write(self, record: dict):
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+    def record(self, kind: str, key: str, **payload):
+        self._write({'kind': kind, 'key': key, 't': _CLOCK.offset, **payload})
+
+    def load(self):
+        with _open(self.path, 'r') as f:
+            for line in f:
+                record = json.loads(line)
+                kind = record['kind']
+                if kind == 'meta':
+                    self.meta = record
+                elif kind == 'end':
+                    self.duration = record['t']
+                else:
+                    times, records = self._index.setdefault((kind, record['key']), ([], []))
+                    times.append(record['t'])
+                    records.append(record)
+                    self.duration = max(self.duration, record['t'])
+        if self.meta.get('version') != _CASSETTE_VERSION:
+            raise ValueError(f"카세트 버전 불일치: {self.meta.get('version')} (지원 {_CASSETTE_VERSION})")
+
+    def lookup(self, kind: str, key: str):
+        """
+        지금(가상 시각)까지 녹화된 같은 요청의 최신 응답
+        - llm 은 시각 무관 (같은 프롬프트 = 같은 응답), 없으면 None (미녹화 집계)
+        """
+        entry = self._index.get((kind, key))
+        record = None
+        if entry is not None:
+            times, records = entry
+            i = bisect.bisect_right(times, _CLOCK.offset) - 1
+            if i >= 0:
+                record = records[i]
+            elif kind == 'llm':
+                record = records[0]
+        if record is None:
+            self.misses[kind] += 1
+            self.missed_keys[kind].add(key)
+        else:
+            self.hits[kind] += 1
+        return record
+
+
+_TAPE: Cassette = None
+
+
+# ────────────────────────────────────────────────────────
+# HTTP (aiohttp / curl_cffi)
+# ────────────────────────────────────────────────────────
+def _http_key(method: str, url: str, params=None, json_body=None) -> str:
+    key = f"{method.upper()} {url}"
+    if params:
+        key += ('&' if '?' in url else '?') + urlencode(sorted(dict(params).items()))
+    if json_body is not None:
+        key += ' #' + _digest(json.dumps(json_body, sort_keys=True, default=str))[:12]
+    return key
+
+
+def _encode_body(body: bytes) -> str:
+    return base64.b64encode(body or b'').decode('ascii')
+
+
+def _decode_body(record: dict) -> bytes:
+    return base64.b64decode(record.get('body') or '')
+
+
+def _replay_error(record: dict):
+    raise ConnectionError(f"replay: {record['error']}")
+
+
+class _AiohttpResponse:
+    def __init__(self, status: int, body: bytes, charset: str = None):
+        self.status = status
+        self.charset = charset
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str = None, errors: str = 'replace') -> str:
+        return self._body.decode(encoding or self.charset or 'utf-8', errors)
+
+    async def json(self, content_type=None, **kwargs):
+        return json.loads(await self.text())
+
+    def release(self):
+        pass
+
+
+class _AiohttpRequest:
+    """session.get(...) — async with 전용"""
+
+    def __init__(self, session, method: str, url: str, kwargs: dict):
+        self._session = session
+        self._args = (method, url, kwargs)
+
+    async def __aenter__(self):
+        return await self._session._request(*self._args)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _AiohttpSession:
+    _real_cls = None   # install() 시 원본 aiohttp.ClientSession
+
+    def __init__(self, *args, **kwargs):
+        self._real = self._real_cls(*args, **kwargs) if _TAPE.recording else None
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self._real is not None:
+            await self._real.close()
+        self.closed = True
+
+    def get(self, url, **kwargs):
+        return _AiohttpRequest(self, 'GET', url, kwargs)
+
+    def post(self, url, **kwargs):
+        return _AiohttpRequest(self, 'POST', url, kwargs)
+
+    async def _request(self, method: str, url: str, kwargs: dict):
+        passthrough = any(host in url for host in _PASSTHROUGH_HOSTS)
+        if self._real is not None and passthrough:
+            return await self._real.request(method, url, **kwargs).__aenter__()
+        key = _http_key(method, url, kwargs.get('params'), kwargs.get('json'))
+
+        if self._real is not None:
+            try:
+                async with self._real.request(method, url, **kwargs) as resp:
+                    body = await resp.read()
+                    try:
+                        charset = resp.get_encoding()
+                    except Exception:
+                        charset = resp.charset
+            except Exception as e:
+                _TAPE.record('http', key, error=f"{type(e).__name__}: {e}")
+                raise
+            _TAPE.record('http', key, status=resp.status, body=_encode_body(body), charset=charset)
+            return _AiohttpResponse(resp.status, body, charset)
+
+        record = _TAPE.lookup('http', key)
+        if record is None:
+            return _AiohttpResponse(404, b'')
+        if 'error' in record:
+            _replay_error(record)
+        return _AiohttpResponse(record['status'], _decode_body(record), record.get('charset'))
+
+
+class _CurlResponse:
+    def __init__(self, status_code: int, content: bytes, encoding: str = None):
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', 'replace')
+
+
+class _CurlSession:
+    _real_cls = None   # install() 시 원본 curl_cffi AsyncSession
+
+    def __init__(self, *args, **kwargs):
+        self._real = self._real_cls(*args, **kwargs) if _TAPE.recording else None
+
+    async def __aenter__(self):
+        if self._real is not None:
+            await self._real.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._real is not None:
+            await self._real.__aexit__(*exc)
+
+    async def close(self):
+        if self._real is not None:
+            await self._real.close()
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def request(self, method: str, url: str, **kwargs):
+        key = _http_key(method, url, kwargs.get('params'), kwargs.get('json'))
+
+        if self._real is not None:
+            try:
+                resp = await self._real.request(method, url, **kwargs)
+            except Exception as e:
+                _TAPE.record('http', key, error=f"{type(e).__name__}: {e}")
+                raise
+            _TAPE.record('http', key, status=resp.status_code, body=_encode_body(resp.content),
+                         charset=resp.encoding)
+            return resp
+
+        record = _TAPE.lookup('http', key)
+        if record is None:
+            return _CurlResponse(404, b'')
+        if 'error' in record:
+            _replay_error(record)
+        return _CurlResponse(record['status'], _decode_body(record), record.get('charset'))
+
+
+# ────────────────────────────────────────────────────────
+# yfinance
+# ────────────────────────────────────────────────────────
+class _ReplayTicker:
+    _real_cls = None   # install() 시 원본 yfinance.Ticker
+
+    def __init__(self, ticker, *args, **kwargs):
+        self.ticker = ticker
+        self._real = self._real_cls(ticker, *args, **kwargs) if _TAPE.recording else None
+
+    def history(self, *args, **kwargs):
+        import pandas as pd
+
+        key = f"{self.ticker} history {json.dumps([args, kwargs], sort_keys=True, default=str)}"
+        if self._real is not None:
+            hist = self._real.history(*args, **kwargs)
+            _TAPE.record('yf', key, data=hist.to_json(orient='split', date_format='iso'))
+            return hist
+
+        record = _TAPE.lookup('yf', key)
+        if record is None:
+            return pd.DataFrame()
+        return pd.read_json(io.StringIO(record['data']), orient='split', dtype=False)
+
+    @property
+    def info(self) -> dict:
+        key = f"{self.ticker} info"
+        if self._real is not None:
+            info = self._real.info
+            _TAPE.record('yf', key, data=json.loads(json.dumps(info, default=str)))
+            return info
+
+        record = _TAPE.lookup('yf', key)
+        return dict(record['data']) if record else {}
+
+
+# ────────────────────────────────────────────────────────
+# LLM (AIBrainV3.client 교체)
+# ────────────────────────────────────────────────────────
+def _merge_chunks(chunks: list) -> dict:
+    """스트림 청크 → generateContent 응답 1건 (텍스트 이어 붙이고 마지막 사용량)"""
+    text = ''.join(GeminiResponse(chunk).text for chunk in chunks)
+    usage = next((c['usageMetadata'] for c in reversed(chunks) if c.get('usageMetadata')), None)
+    merged = {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+    if usage:
+        merged['usageMetadata'] = usage
+    return merged
+
+
+class ReplayGeminiClient:
+    """
+    GeminiRestClient 대용
+    - 녹화: 실제 클라이언트 호출 결과(원본 JSON)를 프롬프트 해시로 기록
+    - 재생: 같은 프롬프트의 녹화 응답 (모델 무관) / 없으면 GeminiApiError(404) → 다음 모델
+    - 컨텍스트 캐시는 두 모드 모두 끔 (전체 프롬프트 = 키)
+    """
+
+    def __init__(self, real=None):
+        self.real = real
+        self.calls = 0
+
+    async def aclose(self):
+        if self.real is not None:
+            await self.real.aclose()
+
+    async def create_cached_content(self, model: str, contents: str, ttl_seconds: int, display_name: str = None):
+        raise GeminiApiError(501, 'replay: 컨텍스트 캐시 비활성')
+
+    def _replayed(self, contents: str) -> list:
+        record = _TAPE.lookup('llm', _digest(contents))
+        if record is None:
+            raise GeminiApiError(404, 'replay: 녹화된 응답 없음')
+        if 'error' in record:
+            raise GeminiApiError(record.get('code') or 500, record['error'])
+        return record['chunks']
+
+    async def generate_content(self, model: str, contents: str,
+                               generation_config: dict = None, cached_content: str = None):
+        self.calls += 1
+        if self.real is None:
+            return GeminiResponse(_merge_chunks(self._replayed(contents)))
+        try:
+            response = await self.real.generate_content(model, contents, generation_config)
+        except GeminiApiError as e:
+            _TAPE.record('llm', _digest(contents), model=model, error=str(e), code=e.code)
+            raise
+        _TAPE.record('llm', _digest(contents), model=model, chunks=[response.raw])
+        return response
+
+    async def generate_content_stream(self, model: str, contents: str,
+                                      generation_config: dict = None, cached_content: str = None):
+        self.calls += 1
+        if self.real is None:
+            chunks = self._replayed(contents)
+            for chunk in chunks:
+                yield GeminiResponse(chunk)
+            return
+        chunks = []
+        try:
+            async for chunk in self.real.generate_content_stream(model, contents, generation_config):
+                chunks.append(chunk.raw)
+                yield chunk
+        except GeminiApiError as e:
+            _TAPE.record('llm', _digest(contents), model=model, error=str(e), code=e.code)
+            chunks = []
+            raise
+        # 소비자가 중간에 끊으면 (조기 중단) 여기까지 오지 않음 → 받은 청크까지만 기록
+        finally:
+            if chunks:
+                _TAPE.record('llm', _digest(contents), model=model, chunks=chunks)
+
+
+# ────────────────────────────────────────────────────────
+# 설치 / 해제
+# ────────────────────────────────────────────────────────
+class _Patches:
+    def __init__(self):
+        self._saved = []
+
+    def set(self, obj, name: str, value):
+        self._saved.append((obj, name, getattr(obj, name)))
+        setattr(obj, name, value)
+
+    def restore(self):
+        while self._saved:
+            obj, name, value = self._saved.pop()
+            setattr(obj, name, value)
+
+
+def _install(patches: _Patches, virtual_clock: bool):
+    import momentum_tracker
+    import news_engine
+
+    _AiohttpSession._real_cls = aiohttp.ClientSession
+    _CurlSession._real_cls = news_engine.AsyncSession
+    _ReplayTicker._real_cls = yfinance.Ticker
+
+    patches.set(aiohttp, 'ClientSession', _AiohttpSession)
+    patches.set(news_engine, 'AsyncSession', _CurlSession)
+    if getattr(momentum_tracker, 'CURL_CFFI_AVAILABLE', False):
+        patches.set(momentum_tracker, 'CurlAsyncSession', _CurlSession)
+    patches.set(yfinance, 'Ticker', _ReplayTicker)
+
+    if virtual_clock:
+        for name in _DATETIME_MODULES:
+            module = sys.modules.get(name)
+            if module is not None and getattr(module, 'datetime', None) is datetime:
+                patches.set(module, 'datetime', _ReplayDatetime)
+        for name in _TIME_MODULES:
+            module = sys.modules.get(name)
+            if module is not None and getattr(module, 'time', None) is time:
+                patches.set(module, 'time', _ReplayTime())
+
+
+class _CaptureBot:
+    """telegram Bot 대용: 발신 메시지를 (가상 시각, 본문) 으로 보관"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def send_message(self, chat_id, text: str, **kwargs):
+        self.messages.append((_CLOCK.offset, text))
+
+
+def _prepare_data_dir(data_dir: str, seed_dir: str) -> str:
+    """중복/상태/신호 DB 는 빈 디렉터리에서 시작, 정적 마스터만 복사"""
+    data_dir = data_dir or tempfile.mkdtemp(prefix='replay-')
+    os.makedirs(data_dir, exist_ok=True)
+    for name in _SEED_FILES:
+        src = os.path.join(seed_dir, name)
+        if os.path.exists(src) and not os.path.exists(os.path.join(data_dir, name)):
+            shutil.copy2(src, data_dir)
+    return data_dir
+
+
+def _build_bot(recording: bool):
+    """실제 TelegramBot 파이프라인 (텔레그램/쿼터/발신 한도만 하네스용으로 교체)"""
+    from telegram_bot import TelegramBot
+
+    bot = TelegramBot()
+    bot.ai.client = ReplayGeminiClient(bot.ai.client if recording else None)
+    bot.ai._context_caches.clear()
+    if not recording:
+        # 쿼터/요청 간격/랜덤 지연은 실제 서버 보호용 → 재생에서는 가상 시각만 의미
+        bot.ai.quota = QuotaManager(limits={}, state_path=os.path.join(Config.DATA_DIR, 'ai_quota.json'))
+        bot.sec_gateway.limiter = AsyncRateLimiter(1e9)
+
+        async def _no_delay(*args, **kwargs):
+            return None
+        bot.momentum._random_delay = _no_delay
+    return bot
+
+
+# ────────────────────────────────────────────────────────
+# 실행
+# ────────────────────────────────────────────────────────
+async def run(mode: str, path: str, minutes: float = None, tick: float = None, speed: float = 0,
+              data_dir: str = None) -> dict:
+    global _CLOCK, _TAPE
+
+    recording = mode == 'record'
+    _TAPE = Cassette(path, recording)
+    if recording:
+        tick = tick or Config.WATCH_INTERVAL_MIN
+        _CLOCK = ReplayClock(time.time())
+        _TAPE.open_writer(_CLOCK.start, tick)
+        duration = minutes * 60
+    else:
+        _TAPE.load()
+        tick = tick or _TAPE.meta['tick']
+        _CLOCK = ReplayClock(_TAPE.meta['start'])
+        duration = _TAPE.duration
+
+    seed_dir = Config.DATA_DIR
+    Config.DATA_DIR = _prepare_data_dir(data_dir, seed_dir)
+    Config.GEMINI_API_KEY = Config.GEMINI_API_KEY or 'replay'
+    # 전송은 캡처만 → 발신 한도 해제
+    Config.TELEGRAM_GLOBAL_RPS = Config.TELEGRAM_CHAT_RPS = 1e6
+    Config.TELEGRAM_GROUP_PER_MINUTE = 1e6
+
+    patches = _Patches()
+    import telegram_bot  # noqa: F401  (엔진 모듈 로드 후 패치)
+    _install(patches, virtual_clock=not recording)
+
+    bot = _build_bot(recording)
+    capture = _CaptureBot()
+    bot.outbox.bind(capture)
+    bot.supervisor.spawn('outbox', bot.outbox.run_loop, '📮 발신 큐')
+    bot.bus.start(bot.supervisor.spawn)
+
+    async def dynamic_all():
+        # 실제 루프는 wait_due 후 반복 호출 → 한 tick 안에서 때가 된 종목을 모두 확인
+        polled = 0
+        while True:
+            count = await bot.dynamic_cycle()
+            polled += count
+            if count < Config.WATCH_POLL_CONCURRENCY:
+                return polled
+
+    cycles = [
+        ('news',     30,                          bot.news_cycle),
+        ('dynamic',  tick,                        dynamic_all),
+        ('kr_full',  120,                         bot.kr_full_cycle),
+        ('sec_atom', Config.SEC_ATOM_POLL_SECONDS, bot.sec_gateway.poll_current),
+    ]
+    latencies = defaultdict(list)
+    counts = Counter()
+    errors = Counter()
+
+    steps = int(duration // tick) + 1
+    wall_start = time.perf_counter()
+    try:
+        for step in range(steps):
+            _CLOCK.offset = step * tick
+            target = _CLOCK.offset if recording else (_CLOCK.offset / speed if speed else 0)
+            delay = wall_start + target - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            for name, every, cycle in cycles:
+                if step % max(1, round(every / tick)):
+                    continue
+                started = time.perf_counter()
+                try:
+                    counts[name] += await cycle() or 0
+                except Exception as e:
+                    errors[name] += 1
+                    logger.warning(f"🎬 [{name}] {_CLOCK.offset:.0f}s 주기 오류: {e}")
+                latencies[name].append(time.perf_counter() - started)
+
+            await bot.bus.drain()
+            bot.coalescer.flush_all()
+            if step % 60 == 0:
+                logger.info(f"🎬 {_CLOCK.offset / 60:.0f}분 / {duration / 60:.0f}분 · 알림 {len(capture.messages)}건")
+
+        await bot.outbox.flush(timeout=30)
+    finally:
+        wall = time.perf_counter() - wall_start
+        await bot.supervisor.shutdown()
+        bot.signals.flush()
+        bot.signals.close()
+        bot.momentum.dedup.flush()
+        bot.momentum.dedup.close()
+        bot.ai.quota.flush()
+        bot.state.close()
+        await bot.ai.aclose()
+        await bot.sec_gateway.aclose()
+        _TAPE.close()
+        patches.restore()
+
+    return _build_report(mode, path, duration, wall, tick, bot, capture, latencies, counts, errors)
+
+
+def _build_report(mode, path, duration, wall, tick, bot, capture, latencies, counts, errors) -> dict:
+    def summarize(values):
+        values = sorted(values)
+        return {
+            'runs':   len(values),
+            'avg_ms': round(statistics.fmean(values) * 1000, 1) if values else None,
+            'p95_ms': round(values[int(len(values) * 0.95) - 1 if len(values) > 1 else 0] * 1000, 1) if values else None,
+            'max_ms': round(values[-1] * 1000, 1) if values else None,
+        }
+
+    texts = sorted(text for _t, text in capture.messages)
+    stats = bot.momentum.stats
+    return {
+        'mode':      mode,
+        'cassette':  path,
+        'tick':      tick,
+        'virtual_seconds': duration,
+        'wall_seconds':    round(wall, 2),
+        'speedup':   round(duration / wall, 1) if wall else None,
+        'alerts': {
+            'messages': len(capture.messages),
+            'digest':   _digest('\n\x00'.join(texts))[:16],   # 순서 무관 → 재생 결정성 비교용
+            'momentum': stats['total_alerts'],
+            'critical': stats['critical_alerts'],
+            'high':     stats['high_alerts'],
+            'medium':   stats['medium_alerts'],
+            'first':    [f"{t / 60:6.1f}분 {text.splitlines()[0][:60]}" for t, text in capture.messages[:10]],
+        },
+        'cycles':     {name: summarize(values) for name, values in latencies.items()},
+        'throughput': {
+            name: round(counts[name] / wall, 2) if wall else None for name in counts
+        },
+        'counts':     dict(counts),
+        'errors':     dict(errors),
+        'bus':        bot.bus.format_status(),
+        'llm_calls':  bot.ai.client.calls,
+        'tape_hits':  dict(_TAPE.hits),
+        'tape_misses': {kind: _TAPE.misses[kind] for kind in _TAPE.misses},
+    }
+
+
+def print_report(report: dict):
+    print(f"\n🎬 {report['mode']} 결과: {report['cassette']} (tick {report['tick']:g}초)")
+    print(f"  가상 {report['virtual_seconds'] / 3600:.2f}시간 / 실제 {report['wall_seconds']:.1f}초 "
+          f"(×{report['speedup']})")
+    alerts = report['alerts']
+    print(f"  알림 메시지 {alerts['messages']}건 · 다이제스트 {alerts['digest']}")
+    print(f"  모멘텀 알림 {alerts['momentum']}건 (CRITICAL {alerts['critical']} / HIGH {alerts['high']} "
+          f"/ MEDIUM {alerts['medium']})")
+    for line in alerts['first']:
+        print(f"    {line}")
+    print("  주기별 소요:")
+    for name, s in report['cycles'].items():
+        print(f"    {name:9} {s['runs']:5}회  평균 {s['avg_ms']}ms  p95 {s['p95_ms']}ms  최대 {s['max_ms']}ms"
+              f"{'  오류 ' + str(report['errors'][name]) if report['errors'].get(name) else ''}")
+    print(f"  처리량 (건/실제초): {report['throughput']}")
+    print(f"  LLM 호출 {report['llm_calls']}회 · 카세트 응답 {report['tape_hits']} · 미녹화 {report['tape_misses']}")
+    print(f"  이벤트 버스:\n{report['bus']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='녹화/재생 하네스')
+    parser.add_argument('mode', choices=('record', 'replay'))
+    parser.add_argument('cassette', help='카세트 경로 (.jsonl / .jsonl.gz)')
+    parser.add_argument('--minutes', type=float, default=60, help='record: 녹화 시간 (분)')
+    parser.add_argument('--tick', type=float, default=None,
+                        help=f'가상 시계 간격 (초, 기본: 녹화 값 / {Config.WATCH_INTERVAL_MIN})')
+    parser.add_argument('--speed', type=float, default=0, help='replay: 배속 (0 = 최대 속도)')
+    parser.add_argument('--data-dir', default=None, help='엔진 DB 디렉터리 (기본: 임시)')
+    parser.add_argument('--json', default=None, help='리포트 JSON 저장 경로')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='replay: 같은 카세트를 N회 재생해 알림 다이제스트 일치 확인')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    )
+    logger.setLevel(logging.INFO)
+
+    runs = max(1, args.repeat) if args.mode == 'replay' else 1
+    digests = []
+    for i in range(runs):
+        # 재생마다 빈 DB 에서 시작 (중복 기록이 이어지면 결과가 달라짐)
+        data_dir = os.path.join(args.data_dir, f"run{i + 1}") if args.data_dir and runs > 1 else args.data_dir
+        report = asyncio.run(run(args.mode, args.cassette, args.minutes, args.tick, args.speed, data_dir))
+        digests.append(report['alerts']['digest'])
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if runs > 1:
+        if len(set(digests)) == 1:
+            print(f"\n✅ 결정성: {runs}회 재생 다이제스트 일치 ({digests[0]})")
+        else:
+            print(f"\n❌ 결정성: 재생마다 다이제스트가 다름 {digests}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Report Builder - 일일 리포트 상시 유지 (요청 시 재생성 없음)
+- ✅ PredictorEngineV3 시그널 리스너: 공시가 수집될 때마다 리포트 상태에 즉시 반영
+  (Form 4 는 해당 발행사만 재집계 결과로 교체, 13D/13G 는 추가)
+- ✅ 신뢰도 순위는 힙으로 유지 → /report 는 스냅샷에서 TOP N 만 꺼냄 (ms 단위)
+- ✅ 리스크는 시장 국면 캐시 기준 → 스냅샷에 조회 대기 없음
+- ✅ "기준 시각" 포함: 마지막으로 반영된 시각
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime
+
+from market_regime import MarketRegime
+
+logger = logging.getLogger(__name__)
+
+
+class ReportBuilder:
+    def __init__(self, predictor, regime: MarketRegime = None,
+                 window_hours: float = 24, top_n: int = 10):
+        self.regime = regime or predictor.regime
+        self.window = window_hours * 3600
+        self.top_n = top_n
+
+        self._signals = {}    # 키 → (시그널, 반영 시각, 힙 순번)
+        self._by_ticker = {}  # Form 4 티커 → {키} (발행사 단위 교체용)
+        self._heap = []       # (-신뢰도, 순번, 키) — 순번이 _signals 와 다르면 교체된 옛 항목
+        self._seq = itertools.count()
+        self.built_at = None
+        self.folded = 0       # 누적 반영 시그널 수
+
+        predictor.add_signal_listener(self.on_signals)
+
+    # ────────────────────────────────────────────
+    # 반영
+    # ────────────────────────────────────────────
+    @staticmethod
+    def _key(kind: str, signal: dict):
+        if kind == 'form4':
+            return ('form4', signal['ticker'], str(signal['event_date']))
+        return (kind, signal.get('filing_id', ''))
+
+    def on_signals(self, kind: str, signals: list, tickers=()):
+        """PredictorEngineV3 리스너: Form 4 는 tickers 의 기존 시그널을 교체, 그 외는 추가"""
+        now = time.time()
+        if kind == 'form4':
+            for ticker in tickers:
+                for key in self._by_ticker.pop(ticker, ()):
+                    self._signals.pop(key, None)
+
+        for signal in signals:
+            key = self._key(kind, signal)
+            seq = next(self._seq)
+            self._signals[key] = (signal, now, seq)
+            heapq.heappush(self._heap, (-signal.get('confidence', 0), seq, key))
+            if kind == 'form4':
+                self._by_ticker.setdefault(signal['ticker'], set()).add(key)
+
+        self.folded += len(signals)
+        self.built_at = datetime.now()
+        self._compact()
+
+    def _compact(self):
+        """만료 시그널 제거 + 힙에 죽은 항목이 살아 있는 수의 2배를 넘으면 재구성"""
+        cutoff = time.time() - self.window
+        expired = [key for key, (_signal, added, _seq) in self._signals.items() if added < cutoff]
+        for key in expired:
+            del self._signals[key]
+            if key[0] == 'form4':
+                keys = self._by_ticker.get(key[1])
+                if keys:
+                    keys.discard(key)
+                    if not keys:
+                        del self._by_ticker[key[1]]
+
+        if len(self._heap) > 2 * len(self._signals) + 16:
+            self._heap = [item for item in self._heap if self._is_live(item)]
+            heapq.heapify(self._heap)
+
+    def _is_live(self, item) -> bool:
+        entry = self._signals.get(item[2])
+        return entry is not None and entry[2] == item[1]
+
+    # ────────────────────────────────────────────
+    # 조회
+    # ────────────────────────────────────────────
+    def _top(self, n: int) -> list:
+        """
+        힙 상위부터 유효 항목만 n개
+        - 힙의 죽은 항목은 살아 있는 수의 2배 이하(_compact) → 3n+16 개만 보면 대부분 충분,
+          모자라면 전체에서 다시
+        """
+        cutoff = time.time() - self.window
+        for limit in (n * 3 + 16, len(self._heap)):
+            result = []
+            for item in heapq.nsmallest(limit, self._heap):
+                if self._is_live(item) and self._signals[item[2]][1] >= cutoff:
+                    result.append(self._signals[item[2]][0])
+                    if len(result) >= n:
+                        return result
+            if limit >= len(self._heap):
+                break
+        return result
+
+    def snapshot(self, market: str = 'US') -> dict:
+        """generate_daily_report 와 같은 형태 + built_at (즉시 반환, 네트워크 없음)"""
+        return {
+            'date': datetime.now().date(),
+            'market': market,
+            'hot_stocks': [],
+            'events_today': self._top(self.top_n),
+            'risks': self.regime.cached_risks(market) if self.regime else [],
+            'built_at': self.built_at,
+            'signal_count': len(self._signals),
+        }
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+SEC Daily Index Feed - EDGAR 일일 인덱스(master.YYYYMMDD.idx) 일괄 수집
+- ✅ 한 번 받은 부분은 다시 받지 않음: 날짜별 바이트 오프셋 저장 → HTTP Range 로 새 줄만
+- ✅ SecGateway 로 발행 → 폼 종류별 구독자에게 분배 (Atom 과 접수번호 기준 중복 제거)
+- ✅ 세 분석기가 다운로드 1회를 공유 (Atom 폴링 간격 사이에 지나간 공시 백필)
+- ✅ 오프셋은 DATA_DIR/sec_feed.json 에 저장 → 재시작 후 이어서
+- ✅ 처음 보는 지난 날짜 (또는 오프셋 없이 첫 시작) → 현재 길이까지 건너뜀 (지난 공시 일괄 발행 방지)
+- ✅ 일일 인덱스는 장 마감 후 게시 → 실시간 Atom 을 보완하는 누락 방지(백필) 소스 (Config.SEC_INGEST_MODE)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from config import Config
+from sec_gateway import EDGAR_TZ, SecGateway
+
+logger = logging.getLogger(__name__)
+
+_DAILY_INDEX_URL = 'https://www.sec.gov/Archives/edgar/daily-index/{year}/QTR{quarter}/master.{date}.idx'
+_ARCHIVES_URL    = 'https://www.sec.gov/Archives/'
+
+
+def filing_index_url(cik, accession: str) -> str:
+    """CIK + 접수번호 → 공시 index 페이지 URL"""
+    return (
+        f"{_ARCHIVES_URL}edgar/data/{int(cik)}/"
+        f"{accession.replace('-', '')}/{accession}-index.htm"
+    )
+
+
+def parse_master_line(line: str):
+    """
+    "CIK|Company Name|Form Type|Date Filed|Filename" 한 줄 → 공시 dict (형식 아니면 None)
+    Filename 예: edgar/data/320193/0000320193-24-000123.txt
+    """
+    parts = line.rstrip('\r\n').split('|')
+    if len(parts) != 5 or not parts[0].strip().isdigit():
+        return None
+    cik, company, form, date_filed, filename = (p.strip() for p in parts)
+    accession = os.path.basename(filename).rsplit('.', 1)[0]
+    if len(date_filed) == 8 and date_filed.isdigit():  # 일일 인덱스는 YYYYMMDD
+        date_filed = f"{date_filed[:4]}-{date_filed[4:6]}-{date_filed[6:]}"
+    return {
+        'form':      form.upper(),
+        'company':   company,
+        'cik':       cik,
+        'accession': accession,
+        'date':      date_filed,
+        'link':      filing_index_url(cik, accession),
+        'title':     f"{form} - {company} ({cik.zfill(10)})",
+        'updated':   None,   # 일일 인덱스는 접수일만 제공
+        'summary':   '',
+        'role':      '',
+        'source':    'daily_index',
+        'companies': [(cik, company)],
+    }
+
+
+class SecDailyIndexFeed:
+    def __init__(self, gateway: SecGateway, state_path: str = None):
+        self.gateway = gateway
+        self.state_path = state_path or os.path.join(Config.DATA_DIR, 'sec_feed.json')
+        self.poll_interval = Config.SEC_INDEX_POLL_SECONDS
+
+        self._offsets = {}       # 'YYYYMMDD' → 처리 완료 바이트 오프셋
+        self.stats = {'polls': 0, 'bytes': 0, 'filings': 0, 'skipped_bytes': 0}
+        self._load()
+        # 저장된 오프셋이 없으면 (첫 시작) 첫 poll 은 위치만 잡고 발행하지 않음
+        self._seed_all = not self._offsets
+
+    # ────────────────────────────────────────────
+    # 오프셋 저장
+    # ────────────────────────────────────────────
+    def _load(self):
+        try:
+            if os.path.exists(self.state_path):
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self._offsets = json.load(f).get('offsets', {})
+        except Exception as e:
+            logger.warning(f"📥 SEC 인덱스 오프셋 로드 실패: {e}")
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            # 최근 7일치만 유지
+            keep = sorted(self._offsets)[-7:]
+            data = {'offsets': {d: self._offsets[d] for d in keep}}
+            tmp_path = self.state_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logger.warning(f"📥 SEC 인덱스 오프셋 저장 실패: {e}")
+
+    # ────────────────────────────────────────────
+    # 수집
+    # ────────────────────────────────────────────
+    @staticmethod
+    def _dates_to_poll(days: int = 2):
+        """오늘 포함 최근 영업일 (미 동부 기준, 주말 제외)"""
+        day = datetime.now(EDGAR_TZ).date()
+        dates = []
+        while len(dates) < days:
+            if day.weekday() < 5:
+                dates.append(day)
+            day -= timedelta(days=1)
+        return list(reversed(dates))
+
+    async def _fetch_tail(self, day):
+        """해당 날짜 인덱스의 새 부분 → 완전한 줄 목록 (없으면 [])"""
+        key = day.strftime('%Y%m%d')
+        url = _DAILY_INDEX_URL.format(year=day.year, quarter=(day.month - 1) // 3 + 1, date=key)
+        first_seen = key not in self._offsets
+        offset = self._offsets.get(key, 0)
+        # 압축 응답이면 Range 가 압축 바이트 기준 → 오프셋(원문 길이)과 어긋남: 원문 그대로 요청
+        headers = {'Range': f"bytes={offset}-", 'Accept-Encoding': 'identity'} if offset else None
+
+        status, body = await self.gateway.fetch(url, headers=headers, timeout=30)
+        if status in (403, 404):
+            return []          # 아직 게시 전 (일일 인덱스는 장 마감 후 생성)
+        if status == 416:
+            return []          # 새 내용 없음
+        if status not in (200, 206):
+            raise RuntimeError(f"HTTP {status}")
+
+        # Range 무시하고 전체를 준 경우 → 이미 처리한 앞부분 버림
+        if status == 200 and offset:
+            body = body[offset:]
+
+        # 마지막 줄이 아직 덜 써졌을 수 있음 → 완전한 줄까지만 소비
+        end = body.rfind(b'\n')
+        if end < 0:
+            return []
+        chunk = body[:end + 1]
+        self._offsets[key] = offset + len(chunk)
+
+        # 처음 보는 지난 날짜 / 첫 시작 → 이미 지나간 공시 (알림 가치 없음) 는 위치만 기록
+        if first_seen and (self._seed_all or day < datetime.now(EDGAR_TZ).date()):
+            self.stats['skipped_bytes'] += len(chunk)
+            logger.info(f"📥 SEC 일일 인덱스 {key}: 기존 {len(chunk):,}바이트 건너뜀 (지난 공시)")
+            return []
+        self.stats['bytes'] += len(chunk)
+        return chunk.decode('latin-1').splitlines()
+
+    async def poll(self) -> int:
+        """최근 영업일 인덱스의 새 줄 → SecGateway 로 발행 (폼별 분배), 신규 건수 반환"""
+        total = 0
+        dates, failed = self._dates_to_poll(), []
+        for day in dates:
+            try:
+                lines = await self._fetch_tail(day)
+            except Exception as e:
+                logger.warning(f"📥 SEC 일일 인덱스 조회 실패 ({day}): {e}")
+                failed.append(e)
+                continue
+            filings = [f for f in map(parse_master_line, lines) if f]
+            if filings:
+                total += await self.gateway.publish(filings)
+
+        self._seed_all = False
+        self.stats['polls'] += 1
+        self.stats['filings'] += total
+        self._save()
+        if total:
+            logger.info(f"📥 SEC 일일 인덱스: 신규 {total}건 분배")
+        if len(failed) == len(dates):
+            raise failed[-1]   # 모든 날짜 실패 → 루프가 실패로 보고
+        return total
+
+    async def run_loop(self, report=None):
+        """
+        SEC_INDEX_POLL_SECONDS 주기로 poll (daily_index/both 모드에서 TelegramBot이 실행)
+        report: TaskSupervisor.reporter (반복 성공/실패 보고)
+        """
+        while True:
+            started = time.monotonic()
+            try:
+                await self.poll()
+                if report:
+                    report.ok(started)
+            except Exception as e:
+                logger.error(f"📥 SEC 일일 인덱스 루프 오류: {e}")
+                if report:
+                    report.error(e)
+            await asyncio.sleep(max(1.0, self.poll_interval - (time.monotonic() - started)))
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+SEC Gateway - EDGAR 접근 단일 창구
+- ✅ 세션 1개(keep-alive 풀) + 공정 접근 한도 1개(초당 SEC_MAX_RPS) + SEC 규정 User-Agent
+- ✅ getcurrent Atom 전체 폼 1회 폴링 → 이미 본 공시가 나올 때까지 페이지 넘김 (100건 창 누락 방지)
+- ✅ ElementTree 파싱 → 공시 dict 1개 스트림 → 폼 종류별 구독자에게 분배
+- ✅ 일일 인덱스(sec_feed)도 같은 스트림으로 발행 → 접수번호 기준 중복 제거
+- ✅ SEC 기반 신호가 늘어나도 폴링 비용은 그대로 (구독만 추가)
+"""
+
+import asyncio
+import logging
+import re
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import aiohttp
+import pytz
+
+from config import Config
+from rate_limit import AsyncRateLimiter
+
+logger = logging.getLogger(__name__)
+
+_CURRENT_URL = 'https://www.sec.gov/cgi-bin/browse-edgar'
+_ATOM_NS     = '{http://www.w3.org/2005/Atom}'
+
+# EDGAR 날짜는 미 동부 기준
+EDGAR_TZ = pytz.timezone('America/New_York')
+
+# "8-K - Acme Corp (0001234567) (Filer)" / "SC 13D - ACME CORP (0000555555) (Subject)"
+_ATOM_TITLE_RE = re.compile(r'^(.+?)\s+-\s+(.+?)\s+\((\d{7,10})\)(?:\s+\(([^)]+)\))?\s*$')
+_ACCESSION_RE  = re.compile(r'(\d{10}-\d{2}-\d{6})')
+
+
+# ────────────────────────────────────────────────────────
+# 공시 dict 공통 처리
+# ────────────────────────────────────────────────────────
+def form_matches(form: str, prefixes) -> bool:
+    """'4' 는 정확 일치 (4/A 포함), 나머지는 접두어 일치 ('8-K' → 8-K, 8-K/A)"""
+    for prefix in prefixes:
+        if prefix == '4':
+            if form in ('4', '4/A'):
+                return True
+        elif form.startswith(prefix):
+            return True
+    return False
+
+
+def group_by_accession(filings: list) -> list:
+    """
+    같은 공시가 관련 회사마다 한 건씩 (Form 4: 발행사 + 보고자 / 13D: 대상 + 제출자)
+    → 접수번호당 1건, companies 에 (CIK, 회사명) 모두 모음 (첫 건 순서 유지)
+    """
+    grouped = {}
+    for filing in filings:
+        first = grouped.get(filing['accession'])
+        if first is None:
+            grouped[filing['accession']] = dict(filing, companies=list(filing['companies']))
+        elif filing['companies'][0] not in first['companies']:
+            first['companies'].append(filing['companies'][0])
+    for filing in grouped.values():
+        others = [f"{name} ({cik.zfill(10)})" for cik, name in filing['companies'][1:]]
+        if others:
+            related = 'Related: ' + ', '.join(others)
+            filing['summary'] = f"{filing['summary']} {related}".strip()
+    return list(grouped.values())
+
+
+def filed_at(filing: dict) -> datetime:
+    """공시 시각 (Atom updated, 없으면 접수일 0시 미 동부)"""
+    if filing.get('updated'):
+        try:
+            return datetime.fromisoformat(filing['updated'].replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    return EDGAR_TZ.localize(datetime.fromisoformat(filing['date']))
+
+
+def is_recent(filing: dict, hours: float) -> bool:
+    """
+    최근 hours 시간 안의 공시인지
+    - 일일 인덱스는 날짜만 있으므로 접수일 단위로 비교 (장 마감 후 게시분이 창에서 바로 빠지지 않게)
+    """
+    cutoff = datetime.now(EDGAR_TZ) - timedelta(hours=hours)
+    if filing.get('updated'):
+        return filed_at(filing) >= cutoff
+    return filing['date'] >= cutoff.strftime('%Y-%m-%d')
+
+
+def parse_current_atom(xml: bytes) -> list:
+    """getcurrent Atom → 공시 dict 목록 (최신순, 발행사/보고자 엔트리는 각각 1건)"""
+    filings = []
+    root = ET.fromstring(xml)
+    for entry in root.iter(f'{_ATOM_NS}entry'):
+        title = (entry.findtext(f'{_ATOM_NS}title') or '').strip()
+        link_tag = entry.find(f'{_ATOM_NS}link')
+        link = link_tag.get('href', '') if link_tag is not None else ''
+        entry_id = entry.findtext(f'{_ATOM_NS}id') or ''
+        accession = _ACCESSION_RE.search(entry_id) or _ACCESSION_RE.search(link)
+        match = _ATOM_TITLE_RE.match(title)
+        if not link or not accession or not match:
+            continue
+
+        category = entry.find(f'{_ATOM_NS}category')
+        form = (category.get('term') if category is not None else '') or match.group(1)
+        updated = (entry.findtext(f'{_ATOM_NS}updated') or '').strip()
+        cik, company = match.group(3), match.group(2)
+        filings.append({
+            'form':      form.strip().upper(),
+            'company':   company,
+            'cik':       cik,
+            'accession': accession.group(1),
+            'date':      updated[:10],
+            'updated':   updated,
+            'link':      link,
+            'title':     title,
+            'summary':   (entry.findtext(f'{_ATOM_NS}summary') or '').strip(),
+            'role':      match.group(4) or '',
+            'source':    'atom',
+            'companies': [(cik, company)],
+        })
+    return filings
+
+
+class SecGateway:
+    STATE_VERSION = 1   # 💾 state_store 스냅샷 스키마
+
+    def __init__(self, user_agent: str = None, max_rps: float = None, pool_size: int = 10):
+        self.user_agent = user_agent or Config.SEC_USER_AGENT
+        self.pool_size  = pool_size
+        self.poll_interval = Config.SEC_ATOM_POLL_SECONDS
+        self.max_pages     = Config.SEC_ATOM_MAX_PAGES
+
+        # burst=1: 버스트 없이 균등 간격 → 어느 1초 구간에서도 SEC_MAX_RPS 이하
+        self.limiter = AsyncRateLimiter(max_rps or Config.SEC_MAX_RPS, burst=1)
+        self._session: aiohttp.ClientSession = None
+
+        self._subscribers = []          # [(폼 접두어 tuple, async/sync 콜백)]
+        self._published = OrderedDict() # 발행한 접수번호 (Atom ↔ 일일 인덱스 중복 제거)
+        self._published_size = 20000
+        self.stats = {'requests': 0, 'polls': 0, 'pages': 0, 'published': 0}
+
+    # ────────────────────────────────────────────
+    # HTTP (모든 sec.gov 요청은 여기로)
+    # ────────────────────────────────────────────
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60),
+                headers={'User-Agent': self.user_agent, 'Accept-Encoding': 'gzip, deflate'},
+            )
+        return self._session
+
+    async def aclose(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def fetch(self, url: str, params: dict = None, headers: dict = None, timeout: float = 20):
+        """한도 대기 후 GET → (HTTP 상태, 본문 bytes)"""
+        status, body, _headers = await self.fetch_with_headers(url, params, headers, timeout)
+        return status, body
+
+    async def fetch_with_headers(self, url: str, params: dict = None, headers: dict = None, timeout: float = 20):
+        """fetch + 응답 헤더 (ETag / Last-Modified 조건부 요청용) → (상태, 본문, 헤더)"""
+        await self.limiter.acquire()
+        self.stats['requests'] += 1
+        async with self._get_session().get(url, params=params, headers=headers, timeout=timeout) as resp:
+            return resp.status, await resp.read(), resp.headers
+
+    async def fetch_text(self, url: str, timeout: float = 10):
+        """200 이면 본문 문자열, 그 외/오류는 None"""
+        try:
+            status, body = await self.fetch(url, timeout=timeout)
+        except Exception as e:
+            logger.debug(f"SEC 조회 실패 ({url}): {e}")
+            return None
+        if status != 200:
+            return None
+        return body.decode('utf-8', errors='replace')
+
+    # ────────────────────────────────────────────
+    # 💾 상태 스냅샷 (state_store.StateStore)
+    # ────────────────────────────────────────────
+    def export_state(self) -> dict:
+        return {'published': list(self._published)}
+
+    def import_state(self, state: dict):
+        """재시작 직후: 이미 발행한 접수번호 복원 → 일일 인덱스 재수집분을 구독자에 다시 보내지 않음"""
+        published = OrderedDict.fromkeys(state.get('published', []))
+        published.update(self._published)
+        while len(published) > self._published_size:
+            published.popitem(last=False)
+        self._published = published
+        logger.info(f"💾 SEC 발행 기록 복원: {len(self._published)}건")
+
+    # ────────────────────────────────────────────
+    # 구독 / 발행
+    # ────────────────────────────────────────────
+    def subscribe(self, form_prefixes, callback):
+        """
+        form_prefixes: ('4',) / ('8-K',) / ('SC 13D', 'SC 13G', 'SCHEDULE 13D', 'SCHEDULE 13G')
+        - callback(filings: list) — 코루틴이어도 됨
+        """
+        self._subscribers.append((tuple(p.upper() for p in form_prefixes), callback))
+
+    async def _deliver(self, prefixes, callback, filings):
+        try:
+            result = callback(filings)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.warning(f"🏛️ SEC 구독자 오류 ({prefixes}): {e}")
+
+    async def publish(self, filings: list) -> int:
+        """
+        공시 dict 목록 → 접수번호로 묶고 이미 발행한 건 제외 → 구독자별 해당 폼만 동시 전달
+        반환: 새로 발행한 건수
+        """
+        fresh = [f for f in group_by_accession(filings) if f['accession'] not in self._published]
+        for filing in fresh:
+            self._published[filing['accession']] = None
+        while len(self._published) > self._published_size:
+            self._published.popitem(last=False)
+        if not fresh:
+            return 0
+
+        tasks = []
+        for prefixes, callback in self._subscribers:
+            matched = [f for f in fresh if form_matches(f['form'], prefixes)]
+            if matched:
+                tasks.append(self._deliver(prefixes, callback, matched))
+        if tasks:
+            await asyncio.gather(*tasks)
+        self.stats['published'] += len(fresh)
+        return len(fresh)
+
+    # ────────────────────────────────────────────
+    # Atom 실시간 폴링
+    # ────────────────────────────────────────────
+    async def poll_current(self) -> int:
+        """
+        getcurrent 전체 폼 → 이미 발행한 공시가 나오거나 max_pages 까지 페이지 넘김
+        반환: 새로 발행한 건수
+        """
+        filings = []
+        for page in range(self.max_pages):
+            params = {
+                'action': 'getcurrent', 'type': '', 'company': '', 'dateb': '',
+                'owner': 'include', 'start': str(page * 100), 'count': '100', 'output': 'atom',
+            }
+            status, body = await self.fetch(_CURRENT_URL, params=params)
+            if status != 200:
+                if page == 0:
+                    raise RuntimeError(f"SEC getcurrent HTTP {status}")
+                logger.warning(f"🏛️ SEC getcurrent 접근 실패: {status}")
+                break
+            entries = parse_current_atom(body)
+            self.stats['pages'] += 1
+            new = [f for f in entries if f['accession'] not in self._published]
+            filings.extend(new)
+            if len(entries) < 100 or len(new) < len(entries):
+                break  # 마지막 페이지 또는 지난 폴링과 이어짐
+
+        self.stats['polls'] += 1
+        published = await self.publish(filings)
+        if published:
+            logger.info(f"🏛️ SEC Atom: 신규 {published}건 분배")
+        return published
+
+    async def run_loop(self, report=None):
+        """
+        SEC_ATOM_POLL_SECONDS 주기로 poll_current (atom/both 모드에서 TelegramBot이 실행)
+        report: TaskSupervisor.reporter (반복 성공/실패 보고)
+        """
+        while True:
+            started = time.monotonic()
+            try:
+                await self.poll_current()
+                if report:
+                    report.ok(started)
+            except Exception as e:
+                logger.error(f"🏛️ SEC Atom 루프 오류: {e}")
+                if report:
+                    report.error(e)
+            await asyncio.sleep(max(1.0, self.poll_interval - (time.monotonic() - started)))
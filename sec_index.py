@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+SEC Company Index - CIK ↔ 티커 ↔ 회사명 로컬 인덱스
+- ✅ sqlite 파일에 저장 → 재시작 시 다운로드 없이 즉시 로드 (수 ms)
+- ✅ 백그라운드 주기 갱신 (ETag / Last-Modified 조건부 요청 → 변경 없으면 304)
+- ✅ 갱신 실패 시 기존 인덱스 유지 + 백오프 재시도 (스캔마다 재다운로드 없음)
+- ✅ sec.gov 요청은 SecGateway 경유 (공유 세션 / 초당 한도)
+- ✅ 조회: CIK → 티커 / 티커 → CIK / 정규화 회사명 → 티커
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_COMPANY_TICKERS_URL = 'https://www.sec.gov/files/company_tickers.json'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    ticker    TEXT PRIMARY KEY,
+    cik       INTEGER NOT NULL,
+    name      TEXT NOT NULL,
+    norm_name TEXT NOT NULL,
+    rank      INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_companies_cik  ON companies(cik);
+CREATE INDEX IF NOT EXISTS idx_companies_name ON companies(norm_name);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_NON_ALNUM_RE = re.compile(r'[^A-Z0-9]+')
+
+
+def normalize_company_name(name: str) -> str:
+    """대문자 + 영숫자 외 문자 → 공백 ("Apple Inc." → "APPLE INC")"""
+    if not name:
+        return ''
+    return _NON_ALNUM_RE.sub(' ', name.upper()).strip()
+
+
+class SecCompanyIndex:
+    def __init__(self, db_path: str = None, sec_gateway=None):
+        self.db_path = db_path or os.path.join(Config.DATA_DIR, 'sec_index.db')
+        self.sec_gateway = sec_gateway   # SecGateway (없으면 첫 갱신 때 생성)
+        self.refresh_interval = Config.SEC_INDEX_REFRESH_HOURS * 3600
+
+        # 메모리 조회 테이블 (sqlite 에서 로드)
+        self._cik_to_ticker = {}   # int CIK → 대표 티커 (rank 최상위)
+        self._ticker_info   = {}   # 티커 → {'cik', 'name', 'rank'}
+        self._name_to_ticker = {}  # 정규화 회사명 → 대표 티커
+
+        self._meta = {}
+        self._load()
+
+    # ────────────────────────────────────────────
+    # 조회
+    # ────────────────────────────────────────────
+    def __len__(self):
+        return len(self._ticker_info)
+
+    def __contains__(self, ticker) -> bool:
+        return bool(ticker) and ticker.upper() in self._ticker_info
+
+    def cik_to_ticker(self, cik):
+        """CIK (문자열/정수, 앞자리 0 무관) → 대표 티커"""
+        try:
+            return self._cik_to_ticker.get(int(cik))
+        except (TypeError, ValueError):
+            return None
+
+    def ticker_to_cik(self, ticker: str):
+        info = self._ticker_info.get((ticker or '').upper())
+        return info['cik'] if info else None
+
+    def name_to_ticker(self, name: str):
+        """정규화 회사명 정확 일치 → 대표 티커"""
+        return self._name_to_ticker.get(normalize_company_name(name))
+
+    def get(self, ticker: str):
+        """티커 → {'ticker', 'cik', 'name', 'rank'} (없으면 None)"""
+        ticker = (ticker or '').upper()
+        info = self._ticker_info.get(ticker)
+        return dict(info, ticker=ticker) if info else None
+
+    def companies(self):
+        """(티커, CIK, 회사명) 전체 순회 (rank 오름차순, 이름 인덱스 구축용)"""
+        for ticker, info in self._ticker_info.items():
+            yield ticker, info['cik'], info['name']
+
+    @property
+    def refreshed_at(self) -> float:
+        try:
+            return float(self._meta.get('refreshed_at', 0))
+        except ValueError:
+            return 0.0
+
+    # ────────────────────────────────────────────
+    # sqlite 로드/저장
+    # ────────────────────────────────────────────
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _load(self):
+        started = time.monotonic()
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute('SELECT ticker, cik, name, norm_name, rank FROM companies').fetchall()
+                self._meta = dict(conn.execute('SELECT key, value FROM meta').fetchall())
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"🗂️ SEC 인덱스 로드 실패: {e}")
+            return
+
+        self._build(rows)
+        if rows:
+            logger.info(
+                f"🗂️ SEC 인덱스 로드: {len(self._ticker_info):,}개 티커 "
+                f"({(time.monotonic() - started) * 1000:.0f}ms)"
+            )
+
+    def _build(self, rows):
+        """(ticker, cik, name, norm_name, rank) 행 → 메모리 조회 테이블 교체"""
+        cik_to_ticker, ticker_info, name_to_ticker = {}, {}, {}
+        # rank 오름차순 (SEC 파일 순서 = 시가총액 순) → 먼저 등록된 티커가 대표
+        for ticker, cik, name, norm_name, rank in sorted(rows, key=lambda r: r[4]):
+            ticker_info[ticker] = {'cik': cik, 'name': name, 'rank': rank}
+            cik_to_ticker.setdefault(cik, ticker)
+            if norm_name:
+                name_to_ticker.setdefault(norm_name, ticker)
+        self._cik_to_ticker  = cik_to_ticker
+        self._ticker_info    = ticker_info
+        self._name_to_ticker = name_to_ticker
+
+    def _save(self, rows, meta: dict):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM companies')
+                conn.executemany(
+                    'INSERT OR REPLACE INTO companies (ticker, cik, name, norm_name, rank) VALUES (?, ?, ?, ?, ?)',
+                    rows,
+                )
+                conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', meta.items())
+        finally:
+            conn.close()
+
+    def _save_meta(self, meta: dict):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', meta.items())
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _parse(data: dict):
+        """company_tickers.json → 행 목록 {"0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."}, ...}"""
+        rows = []
+        for key, company in data.items():
+            try:
+                ticker = str(company['ticker']).upper().strip()
+                name   = str(company.get('title', '')).strip()
+                rows.append((ticker, int(company['cik_str']), name, normalize_company_name(name), int(key)))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return rows
+
+    # ────────────────────────────────────────────
+    # 갱신
+    # ────────────────────────────────────────────
+    async def refresh(self) -> bool:
+        """
+        조건부 다운로드 → 변경 시 sqlite + 메모리 교체
+        - 304 Not Modified → 갱신 시각만 기록
+        - 인덱스가 비어 있으면 조건부 헤더 없이 전체 다운로드 (304 로는 채울 수 없음)
+        - 반환: 성공(변경 없음 포함) 여부
+        """
+        if self.sec_gateway is None:
+            from sec_gateway import SecGateway
+            self.sec_gateway = SecGateway()
+
+        headers = {}
+        if len(self):
+            if self._meta.get('etag'):
+                headers['If-None-Match'] = self._meta['etag']
+            if self._meta.get('last_modified'):
+                headers['If-Modified-Since'] = self._meta['last_modified']
+
+        try:
+            status, body, response_headers = await self.sec_gateway.fetch_with_headers(
+                _COMPANY_TICKERS_URL, headers=headers, timeout=30,
+            )
+            if status == 304:
+                self._meta['refreshed_at'] = str(time.time())
+                await asyncio.to_thread(self._save_meta, {'refreshed_at': self._meta['refreshed_at']})
+                logger.info("🗂️ SEC 인덱스 변경 없음 (304)")
+                return True
+            if status != 200:
+                logger.warning(f"🗂️ SEC 인덱스 갱신 실패: HTTP {status}")
+                return False
+            data = json.loads(body)
+            etag = response_headers.get('ETag', '')
+            last_modified = response_headers.get('Last-Modified', '')
+        except Exception as e:
+            logger.warning(f"🗂️ SEC 인덱스 갱신 오류: {e}")
+            return False
+
+        rows = self._parse(data)
+        if not rows:
+            logger.warning("🗂️ SEC 인덱스 응답 비어 있음 → 기존 인덱스 유지")
+            return False
+
+        meta = {'etag': etag, 'last_modified': last_modified, 'refreshed_at': str(time.time())}
+        try:
+            await asyncio.to_thread(self._save, rows, meta)
+        except Exception as e:
+            logger.warning(f"🗂️ SEC 인덱스 저장 실패 (메모리만 갱신): {e}")
+
+        before = set(self._ticker_info)
+        self._build(rows)
+        self._meta.update(meta)
+        added = len(set(self._ticker_info) - before)
+        logger.info(f"🗂️ SEC 인덱스 갱신: {len(self._ticker_info):,}개 티커 (신규 {added}개)")
+        return True
+
+    async def run_refresh_loop(self, report=None):
+        """
+        백그라운드 갱신 루프
+        - 비어 있거나 주기 경과 시 즉시 갱신, 이후 refresh_interval 마다
+        - 실패 (또는 갱신 후에도 비어 있음) 시 10분 → 최대 2시간까지 백오프
+        - report: TaskSupervisor.reporter (갱신 성공/실패 보고)
+        """
+        backoff = 600
+        while True:
+            due = self.refreshed_at + self.refresh_interval - time.time()
+            if len(self) and due > 0:
+                await asyncio.sleep(due)
+                continue
+
+            started = time.monotonic()
+            if await self.refresh() and len(self):
+                if report:
+                    report.ok(started)
+                backoff = 600
+            else:
+                if report:
+                    report.error(RuntimeError('SEC 인덱스 갱신 실패'))
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 7200)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+SEC Parsers - EDGAR 공시 로컬 파싱 (LLM 호출 없이 구조 정보 추출)
+- ✅ 8-K Item 코드 파싱 (Atom summary / 공시 index 페이지)
+- ✅ Item 코드 → 중요도 점수 (Config.SEC_8K_ITEMS) 로컬 분류
+- ✅ Form 4: index 페이지에서 원본 XML 경로 확인 → 스트리밍 파싱 (lxml, 없으면 ElementTree)
+"""
+
+import io
+import logging
+import re
+from urllib.parse import urljoin
+
+from config import Config
+
+# lxml: C 파서 (recover 지원) / 미설치 시 표준 라이브러리
+try:
+    from lxml import etree as _etree
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as _etree
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# "Item 1.01: Entry into a Material Definitive Agreement" / "Item 2.02 Results of ..."
+_ITEM_RE = re.compile(r'\bItem\s+(\d{1,2}\.\d{2})\b', re.I)
+
+# index 페이지 formGrouping: <div class="infoHead">Items</div><div class="info">Item 2.02: ...<br>...</div>
+_INDEX_ITEMS_RE = re.compile(
+    r'infoHead">\s*Items\s*</div>\s*<div class="info">(.*?)</div>', re.I | re.S
+)
+
+
+def parse_8k_items(text: str) -> list:
+    """
+    텍스트에서 8-K Item 코드 추출 (등장 순서 유지, 중복 제거)
+    - Atom <summary> 는 HTML 이스케이프된 "Item 1.01: ..." 목록을 포함
+    - Config.SEC_8K_ITEMS 에 없는 코드는 무시 (본문 인용 "Item 7" 등 오탐 방지)
+    """
+    if not text:
+        return []
+    items = []
+    for code in _ITEM_RE.findall(text):
+        if code in Config.SEC_8K_ITEMS and code not in items:
+            items.append(code)
+    return items
+
+
+def parse_8k_index_items(html: str) -> list:
+    """공시 index 페이지(-index.htm)의 'Items' 블록에서 Item 코드 추출"""
+    if not html:
+        return []
+    match = _INDEX_ITEMS_RE.search(html)
+    return parse_8k_items(match.group(1) if match else '')
+
+
+def score_8k_items(items: list) -> float:
+    """
+    Item 코드 목록 → 중요도 점수 (최고값)
+    - 9.01(첨부서류)처럼 단독으로는 의미 없는 항목은 0점
+    - 항목 없음 → 0.0 (호출부에서 키워드 필터로 fallback)
+    """
+    if not items:
+        return 0.0
+    return float(max(Config.SEC_8K_ITEMS[code][0] for code in items))
+
+
+def describe_8k_items(items: list) -> str:
+    """프롬프트용 한 줄 요약: "Item 1.01 (중요 계약 체결), Item 9.01 (재무제표/첨부)" """
+    return ', '.join(f"Item {code} ({Config.SEC_8K_ITEMS[code][1]})" for code in items)
+
+
+# ────────────────────────────────────────────────────────
+# Form 4 (내부자 거래)
+# ────────────────────────────────────────────────────────
+# index 페이지의 원본 XML 링크 (xslF345X05/… 는 HTML 렌더링본 → 제외)
+_FORM4_XML_HREF_RE = re.compile(r'href="([^"]+\.xml)"', re.I)
+
+
+def find_form4_xml_url(index_html: str, index_url: str):
+    """공시 index 페이지 → 원본 Form 4 XML 절대 URL (없으면 None)"""
+    for href in _FORM4_XML_HREF_RE.findall(index_html or ''):
+        if '/xsl' in href.lower():
+            continue
+        return urljoin(index_url, href)
+    return None
+
+
+def _flag(value) -> bool:
+    return (value or '').strip().lower() in ('1', 'true')
+
+
+def _number(value) -> float:
+    try:
+        return float((value or '').replace(',', '').strip() or 0)
+    except ValueError:
+        return 0.0
+
+
+def _owner_role(owner: dict) -> str:
+    """보고자 역할 한 단어 (임원 직함 우선)"""
+    if owner.get('officer_title'):
+        return owner['officer_title']
+    if owner.get('is_officer'):
+        return 'Officer'
+    if owner.get('is_director'):
+        return 'Director'
+    if owner.get('is_ten_percent'):
+        return '10% Owner'
+    return 'Other'
+
+
+def parse_form4_xml(data: bytes) -> dict:
+    """
+    Form 4 원본 XML → 발행사 / 보고자 / 비파생 거래 목록
+    - iterparse 로 필요한 블록이 끝날 때마다 처리 후 clear (메모리 일정)
+    - 반환: {'issuer_cik', 'issuer_name', 'ticker', 'owners': [...], 'transactions': [...]}
+      transactions: {'date', 'code', 'shares', 'price', 'value', 'acquired', 'owned_after'}
+    """
+    result = {'issuer_cik': None, 'issuer_name': '', 'ticker': '', 'owners': [], 'transactions': []}
+    source = io.BytesIO((data or b'').strip())
+    kwargs = {'recover': True} if LXML_AVAILABLE else {}
+
+    for _event, elem in _etree.iterparse(source, events=('end',), **kwargs):
+        tag = elem.tag
+        if tag == 'issuer':
+            result['issuer_cik']  = (elem.findtext('issuerCik') or '').strip() or None
+            result['issuer_name'] = (elem.findtext('issuerName') or '').strip()
+            result['ticker']      = (elem.findtext('issuerTradingSymbol') or '').strip().upper()
+            elem.clear()
+        elif tag == 'reportingOwner':
+            owner = {
+                'name':           (elem.findtext('reportingOwnerId/rptOwnerName') or '').strip(),
+                'is_director':    _flag(elem.findtext('reportingOwnerRelationship/isDirector')),
+                'is_officer':     _flag(elem.findtext('reportingOwnerRelationship/isOfficer')),
+                'is_ten_percent': _flag(elem.findtext('reportingOwnerRelationship/isTenPercentOwner')),
+                'officer_title':  (elem.findtext('reportingOwnerRelationship/officerTitle') or '').strip(),
+            }
+            owner['role'] = _owner_role(owner)
+            result['owners'].append(owner)
+            elem.clear()
+        elif tag == 'nonDerivativeTransaction':
+            shares = _number(elem.findtext('transactionAmounts/transactionShares/value'))
+            price  = _number(elem.findtext('transactionAmounts/transactionPricePerShare/value'))
+            result['transactions'].append({
+                'date':        (elem.findtext('transactionDate/value') or '')[:10],
+                'code':        (elem.findtext('transactionCoding/transactionCode') or '').strip().upper(),
+                'shares':      shares,
+                'price':       price,
+                'value':       shares * price,
+                'acquired':    (elem.findtext('transactionAmounts/transactionAcquiredDisposedCode/value') or '').strip() == 'A',
+                'owned_after': _number(elem.findtext('postTransactionAmounts/sharesOwnedFollowingTransaction/value')),
+            })
+            elem.clear()
+        elif tag == 'derivativeTable':
+            elem.clear()  # 옵션/RSU 등 파생 거래는 사용 안 함
+
+    return result
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Signal Store - 알림 / 뉴스 / AI 분석 이력 (sqlite, 추가 전용)
+- ✅ 기록은 메모리 버퍼에 적재만 → 백그라운드 루프가 묶어서 스레드로 저장 (알림 경로 지연 없음)
+- ✅ 시각 / 종목 / 출처 인덱스 → "X 종목 최근 30일 알림", "출처별 적중률" 즉시 조회
+- ✅ 원본 dict 는 JSON 으로 함께 보관 (리포트 / 백테스트 재사용)
+- ✅ 보관 기간(Config.SIGNAL_RETENTION_DAYS) 지난 행은 하루 1회 정리
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from enum import Enum
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id         INTEGER PRIMARY KEY,
+    ts         REAL    NOT NULL,
+    kind       TEXT    NOT NULL,
+    market     TEXT,
+    ticker     TEXT,
+    source     TEXT,
+    alert_type TEXT,
+    priority   TEXT,
+    score      REAL,
+    change_pct REAL,
+    title      TEXT,
+    url        TEXT,
+    payload    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_signals_ts     ON signals (ts);
+CREATE INDEX IF NOT EXISTS idx_signals_ticker ON signals (ticker, ts);
+CREATE INDEX IF NOT EXISTS idx_signals_source ON signals (source, kind, ts);
+"""
+
+_COLUMNS = ('ts', 'kind', 'market', 'ticker', 'source', 'alert_type', 'priority',
+            'score', 'change_pct', 'title', 'url', 'payload')
+
+
+def _json_default(value):
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class SignalStore:
+    def __init__(self, db_path: str = None, flush_seconds: float = None, retention_days: int = None):
+        self.db_path = db_path or os.path.join(Config.DATA_DIR, 'signals.db')
+        self.flush_seconds = flush_seconds or Config.SIGNAL_FLUSH_SECONDS
+        self.retention_days = retention_days or Config.SIGNAL_RETENTION_DAYS
+        self._buffer = []
+        self._conn = None
+        self._lock = threading.Lock()   # 저장(스레드) ↔ 조회(스레드) 직렬화
+        self._purged_at = 0.0
+        self.stats = {'written': 0, 'errors': 0}
+
+    # ────────────────────────────────────────────
+    # sqlite
+    # ────────────────────────────────────────────
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ────────────────────────────────────────────
+    # 기록 (동기, 버퍼 적재만)
+    # ────────────────────────────────────────────
+    def _append(self, kind: str, payload: dict, **columns):
+        try:
+            text = json.dumps(payload, ensure_ascii=False, default=_json_default)
+        except Exception:
+            text = None
+        row = dict.fromkeys(_COLUMNS)
+        row.update(columns, ts=time.time(), kind=kind, payload=text)
+        self._buffer.append(tuple(row[c] for c in _COLUMNS))
+
+    def record_news(self, news: dict, market: str, score: float = None):
+        """키워드 필터 통과 뉴스"""
+        self._append('news', news, market=market, ticker=news.get('ticker'),
+                     source=news.get('source'), score=score,
+                     title=news.get('title'), url=news.get('url'))
+
+    def record_analysis(self, news: dict, analysis: dict, market: str):
+        """AI 분석 결과 (종목 = top_ticker → 뉴스 언급 종목 순)"""
+        ticker = analysis.get('top_ticker') or analysis.get('ticker_in_news')
+        if ticker == 'null':
+            ticker = None
+        self._append('analysis', {'news': news, 'analysis': analysis}, market=market,
+                     ticker=ticker.upper() if ticker and market == 'US' else ticker,
+                     source=news.get('source'), score=analysis.get('score'),
+                     title=news.get('title'), url=news.get('url'))
+
+    def record_alert(self, signal: dict, source: str = None):
+        """
+        모멘텀 알림 (급등 / 프로그램 / 테마)
+        source: 집중 감시 종목이면 등록 계기가 된 뉴스 출처 (출처별 적중률 집계용)
+        """
+        priority = signal.get('priority')
+        self._append('alert', signal, market=signal.get('market'), ticker=signal.get('ticker'),
+                     source=source or signal.get('source'), alert_type=signal.get('alert_type'),
+                     priority=priority.name if isinstance(priority, Enum) else priority,
+                     change_pct=signal.get('change_percent'), title=signal.get('name'))
+
+    # ────────────────────────────────────────────
+    # 저장 (백그라운드)
+    # ────────────────────────────────────────────
+    def _write(self, rows: list):
+        placeholders = ', '.join('?' * len(_COLUMNS))
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        f"INSERT INTO signals ({', '.join(_COLUMNS)}) VALUES ({placeholders})", rows,
+                    )
+                self.stats['written'] += len(rows)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"🗄️ 신호 기록 저장 실패 ({len(rows)}건): {e}")
+                self._conn = None
+
+    def _purge(self):
+        cutoff = time.time() - self.retention_days * 86400
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    deleted = conn.execute('DELETE FROM signals WHERE ts < ?', (cutoff,)).rowcount
+                if deleted:
+                    logger.info(f"🗄️ 보관 기간 지난 신호 {deleted}건 정리")
+            except Exception as e:
+                logger.debug(f"🗄️ 신호 정리 실패: {e}")
+
+    def flush(self):
+        """버퍼 즉시 저장 (종료 시)"""
+        rows, self._buffer = self._buffer, []
+        if rows:
+            self._write(rows)
+
+    async def run_loop(self, report=None):
+        """
+        flush_seconds 마다 버퍼를 묶어 저장 + 하루 1회 보관 기간 정리
+        report: TaskSupervisor.reporter (저장 성공/실패 보고)
+        """
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            started, errors = time.monotonic(), self.stats['errors']
+            rows, self._buffer = self._buffer, []
+            if rows:
+                await asyncio.to_thread(self._write, rows)
+            if report:
+                if self.stats['errors'] == errors:
+                    report.ok(started)
+                else:
+                    report.error(RuntimeError(f'신호 {len(rows)}건 저장 실패'))
+            if time.time() - self._purged_at > 86400:
+                self._purged_at = time.time()
+                await asyncio.to_thread(self._purge)
+
+    # ────────────────────────────────────────────
+    # 조회 (스레드, 코루틴)
+    # ────────────────────────────────────────────
+    def _query(self, sql: str, params=()) -> list:
+        with self._lock:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            try:
+                return [dict(row) for row in conn.execute(sql, params)]
+            finally:
+                conn.row_factory = None
+
+    async def history(self, ticker: str, days: float = 30, kinds=('alert',), limit: int = 50) -> list:
+        """종목 최근 days 일 기록 (최신순)"""
+        marks = ', '.join('?' * len(kinds))
+        return await asyncio.to_thread(
+            self._query,
+            f"SELECT * FROM signals WHERE ticker = ? AND ts >= ? AND kind IN ({marks}) "
+            f"ORDER BY ts DESC LIMIT ?",
+            (ticker, time.time() - days * 86400, *kinds, limit),
+        )
+
+    async def alerts_since(self, since: float, market: str = None) -> list:
+        """since(epoch) 이후 알림 (등락률 내림차순)"""
+        sql, params = "SELECT * FROM signals WHERE kind = 'alert' AND ts >= ?", [since]
+        if market:
+            sql += " AND market = ?"
+            params.append(market)
+        return await asyncio.to_thread(self._query, sql + " ORDER BY change_pct DESC", params)
+
+    async def hit_rate_by_source(self, days: float = 30, window_hours: float = None) -> list:
+        """
+        출처별 적중률: AI 분석이 지목한 종목에 window_hours 안에 급등 알림이 나온 비율
+        → [{'source', 'total', 'hits', 'rate'}] (적중률 내림차순)
+        """
+        window = (window_hours or Config.SIGNAL_HIT_WINDOW_HOURS) * 3600
+        rows = await asyncio.to_thread(
+            self._query,
+            """
+            SELECT a.source AS source, COUNT(*) AS total,
+                   SUM(EXISTS (
+                       SELECT 1 FROM signals s
+                       WHERE s.ticker = a.ticker AND s.kind = 'alert' AND s.market = a.market
+                         AND s.ts BETWEEN a.ts AND a.ts + ?
+                   )) AS hits
+            FROM signals a
+            WHERE a.kind = 'analysis' AND a.ticker IS NOT NULL AND a.ts >= ?
+            GROUP BY a.source
+            """,
+            (window, time.time() - days * 86400),
+        )
+        for row in rows:
+            row['rate'] = row['hits'] / row['total'] if row['total'] else 0.0
+        rows.sort(key=lambda r: (r['rate'], r['total']), reverse=True)
+        return rows
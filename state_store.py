@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+State Store - 엔진 상태 스냅샷 / 재시작 복원 (warm restart)
+- ✅ 엔진마다 이름 + 스키마 버전 + dump/load 콜백 등록 → sqlite 한 파일에 이름별 1행
+- ✅ 주기 체크포인트 (Config.STATE_SNAPSHOT_SECONDS) + 종료 시 마지막 저장
+- ✅ 바뀐 항목만 기록 (직전 저장본과 같으면 건너뜀)
+- ✅ 주기 저장은 dump + JSON 직렬화까지 이벤트 루프에서, sqlite 기록만 스레드
+- ✅ 버전 불일치 → 등록된 마이그레이션으로 올리거나, 없으면 버리고 빈 상태로 시작
+- ✅ 너무 오래된 스냅샷(Config.STATE_MAX_AGE_HOURS)은 복원하지 않음
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    name     TEXT    PRIMARY KEY,
+    version  INTEGER NOT NULL,
+    saved_at REAL    NOT NULL,
+    payload  TEXT    NOT NULL
+);
+"""
+
+
+class _Component:
+    __slots__ = ('name', 'version', 'dump', 'load', 'migrations', 'last_payload')
+
+    def __init__(self, name: str, version: int, dump, load, migrations: dict):
+        self.name = name
+        self.version = version
+        self.dump = dump                    # () → JSON 직렬화 가능한 dict
+        self.load = load                    # (dict) → None
+        self.migrations = migrations or {}  # {이전 버전: payload → 다음 버전 payload}
+        self.last_payload = None
+
+
+class StateStore:
+    def __init__(self, db_path: str = None, interval: float = None, max_age_hours: float = None):
+        self.db_path = db_path or os.path.join(Config.DATA_DIR, 'state.db')
+        self.interval = interval or Config.STATE_SNAPSHOT_SECONDS
+        self.max_age_hours = max_age_hours or Config.STATE_MAX_AGE_HOURS
+        self._components = {}
+        self._conn = None
+        self._lock = threading.Lock()   # 주기 저장(스레드) ↔ 종료 저장/닫기 직렬화
+        self.saved_at = None       # 마지막 체크포인트 time.time()
+        self.restored = {}         # 이름 → 복원 결과 ('ok' / 'stale' / 'version' / 'error' / 'none')
+
+    # ────────────────────────────────────────────
+    # sqlite
+    # ────────────────────────────────────────────
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ────────────────────────────────────────────
+    # 등록 / 복원
+    # ────────────────────────────────────────────
+    def register(self, name: str, version: int, dump, load, migrations: dict = None):
+        self._components[name] = _Component(name, version, dump, load, migrations)
+
+    def _migrate(self, comp: _Component, version: int, payload: dict):
+        """저장 버전 → 현재 버전 (중간 단계가 하나라도 없으면 None)"""
+        while version < comp.version:
+            step = comp.migrations.get(version)
+            if step is None:
+                return None
+            payload = step(payload)
+            version += 1
+        return payload if version == comp.version else None
+
+    def restore_all(self) -> dict:
+        """시작 시 1회: 등록된 엔진 상태 복원 → {이름: 결과}"""
+        try:
+            rows = self._connect().execute('SELECT name, version, saved_at, payload FROM snapshots').fetchall()
+        except Exception as e:
+            logger.warning(f"💾 상태 스냅샷 읽기 실패 ({self.db_path}): {e} → 빈 상태로 시작")
+            self._conn = None
+            return self.restored
+
+        stored = {name: (version, saved_at, payload) for name, version, saved_at, payload in rows}
+        cutoff = time.time() - self.max_age_hours * 3600
+        for name, comp in self._components.items():
+            if name not in stored:
+                self.restored[name] = 'none'
+                continue
+            version, saved_at, text = stored[name]
+            if saved_at < cutoff:
+                self.restored[name] = 'stale'
+                logger.info(f"💾 [{name}] 스냅샷이 오래됨 ({(time.time() - saved_at) / 3600:.0f}시간 전) → 건너뜀")
+                continue
+            try:
+                payload = self._migrate(comp, version, json.loads(text))
+                if payload is None:
+                    self.restored[name] = 'version'
+                    logger.warning(f"💾 [{name}] 스키마 v{version} → v{comp.version} 변환 불가 → 건너뜀")
+                    continue
+                comp.load(payload)
+                comp.last_payload = text if version == comp.version else None
+                self.restored[name] = 'ok'
+            except Exception as e:
+                self.restored[name] = 'error'
+                logger.warning(f"💾 [{name}] 상태 복원 실패: {e}")
+
+        ok = [name for name, result in self.restored.items() if result == 'ok']
+        logger.info(f"💾 상태 복원: {len(ok)}/{len(self._components)}개 ({', '.join(ok) or '없음'})")
+        return self.restored
+
+    # ────────────────────────────────────────────
+    # 체크포인트
+    # ────────────────────────────────────────────
+    def _collect(self) -> list:
+        """
+        (이벤트 루프) 엔진별 dump() + JSON 직렬화 → [(엔진, 텍스트)]
+        - 엔진 상태를 읽는 일은 전부 여기서 끝냄 → 스레드는 완성된 문자열만 기록
+        - dump/직렬화 실패한 엔진은 빠짐 (저장 시각도 갱신하지 않음)
+        """
+        collected = []
+        for comp in self._components.values():
+            try:
+                text = json.dumps(comp.dump(), ensure_ascii=False, separators=(',', ':'))
+                collected.append((comp, text))
+            except Exception as e:
+                logger.warning(f"💾 [{comp.name}] 상태 수집 실패: {e}")
+        return collected
+
+    def _write(self, collected: list) -> int:
+        """(스레드 가능) 바뀐 것만 한 트랜잭션으로 저장 → 기록한 개수"""
+        now = time.time()
+        changed = [(comp, text) for comp, text in collected if text != comp.last_payload]
+
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    # 안 바뀐 항목도 저장 시각은 갱신 (오래된 스냅샷 판정용) — 이번에 수집된 것만
+                    conn.executemany('UPDATE snapshots SET saved_at = ? WHERE name = ?',
+                                     [(now, comp.name) for comp, _ in collected])
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)',
+                        [(comp.name, comp.version, now, text) for comp, text in changed],
+                    )
+            except Exception as e:
+                logger.warning(f"💾 상태 저장 실패 ({self.db_path}): {e}")
+                self._conn = None
+                return 0
+        for comp, text in changed:
+            comp.last_payload = text
+        if changed:
+            logger.debug(f"💾 상태 저장: {', '.join(comp.name for comp, _ in changed)}")
+        self.saved_at = now
+        return len(changed)
+
+    def checkpoint(self) -> int:
+        """등록된 엔진 상태 즉시 저장 (동기, 종료 시) → 기록한 개수"""
+        return self._write(self._collect())
+
+    async def checkpoint_async(self) -> int:
+        """dump·직렬화는 이벤트 루프에서, sqlite 기록은 스레드 (주기 저장이 알림 경로를 막지 않음)"""
+        return await asyncio.to_thread(self._write, self._collect())
+
+    async def run_loop(self, report=None):
+        """
+        백그라운드 체크포인트 루프 (interval 초마다)
+        report: TaskSupervisor.reporter (저장 성공/실패 보고)
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            started, before = time.monotonic(), self.saved_at
+            await self.checkpoint_async()
+            if report:
+                if self.saved_at != before:
+                    report.ok(started)
+                else:
+                    report.error(RuntimeError('상태 저장 실패'))
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Task Supervisor - 백그라운드 루프 소유 / 재시작 / 상태
+- ✅ 태스크 참조 보관 (GC·무음 종료 방지) + 이름별 관리
+- ✅ 예기치 않은 종료(예외·정상 반환 모두) → 지수 백오프 재시작 + 로그
+- ✅ 루프가 record() 로 알려준 반복 소요 시간 / 마지막 성공 시각 → /status 표시
+- ✅ 컴포넌트 루프는 reporter(name) 를 받아 같은 방식으로 보고 (보고 전이면 '대기', 실패만 이어지면 '실패')
+- ✅ 종료 시 전체 취소 후 정리 대기
+"""
+
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _LoopState:
+    __slots__ = ('name', 'label', 'interval', 'task', 'started_at', 'restarts',
+                 'spawned_at', 'last_success', 'last_latency', 'avg_latency', 'iterations',
+                 'errors', 'last_error', 'last_error_at', 'backoff_until')
+
+    def __init__(self, name: str, label: str, interval: float):
+        self.name = name
+        self.label = label
+        self.interval = interval      # 기대 주기 (초, 지연 판단용 / 없으면 None)
+        self.task = None
+        self.started_at = None
+        self.spawned_at = time.time()
+        self.restarts = 0
+        self.last_success = None      # time.time()
+        self.last_latency = None
+        self.avg_latency = None       # 지수 이동 평균
+        self.iterations = 0
+        self.errors = 0
+        self.last_error = ''
+        self.last_error_at = None     # record_error 시각 (재시작 사유는 제외)
+        self.backoff_until = 0.0
+
+
+class LoopReporter:
+    """컴포넌트 run_loop 에 넘기는 보고 핸들 (TaskSupervisor.record / record_error)"""
+
+    def __init__(self, supervisor, name: str):
+        self._supervisor = supervisor
+        self.name = name
+
+    def ok(self, started: float):
+        self._supervisor.record(self.name, started)
+
+    def error(self, error: Exception):
+        self._supervisor.record_error(self.name, error)
+
+
+class TaskSupervisor:
+    def __init__(self, min_backoff: float = 1.0, max_backoff: float = 300.0, stable_seconds: float = 300.0):
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.stable_seconds = stable_seconds   # 이만큼 버틴 뒤 죽으면 백오프 초기화
+        self._loops = {}
+        self._closed = asyncio.Event()
+
+    # ────────────────────────────────────────────
+    # 실행
+    # ────────────────────────────────────────────
+    def spawn(self, name: str, factory, label: str = None, interval: float = None):
+        """factory: 인자 없는 코루틴 함수 (재시작마다 새로 호출)"""
+        state = _LoopState(name, label or name, interval)
+        self._loops[name] = state
+        state.task = asyncio.create_task(self._supervise(state, factory), name=name)
+        return state.task
+
+    async def _supervise(self, state: _LoopState, factory):
+        backoff = self.min_backoff
+        while not self._closed.is_set():
+            state.started_at = time.monotonic()
+            try:
+                await factory()
+                reason = "정상 반환"
+            except asyncio.CancelledError:
+                raise
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except BaseException as e:
+                reason = f"{type(e).__name__}: {e}"
+                logger.error(f"🛡️ 루프 종료 [{state.name}]: {reason}", exc_info=True)
+
+            if self._closed.is_set():
+                return
+            if time.monotonic() - state.started_at >= self.stable_seconds:
+                backoff = self.min_backoff
+            state.restarts += 1
+            state.last_error = reason
+            state.backoff_until = time.time() + backoff
+            logger.warning(f"🛡️ [{state.name}] {backoff:.0f}초 후 재시작 ({state.restarts}회째, {reason})")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    # ────────────────────────────────────────────
+    # 루프 보고
+    # ────────────────────────────────────────────
+    def reporter(self, name: str) -> LoopReporter:
+        return LoopReporter(self, name)
+
+    def record(self, name: str, started: float):
+        """반복 1회 성공 (started: 반복 시작 time.monotonic())"""
+        state = self._loops.get(name)
+        if state is None:
+            return
+        latency = time.monotonic() - started
+        state.iterations += 1
+        state.last_success = time.time()
+        state.last_latency = latency
+        state.avg_latency = latency if state.avg_latency is None else state.avg_latency * 0.8 + latency * 0.2
+
+    def record_error(self, name: str, error: Exception):
+        """루프 안에서 잡힌 반복 실패 (루프는 계속)"""
+        state = self._loops.get(name)
+        if state is None:
+            return
+        state.errors += 1
+        state.last_error = f"{type(error).__name__}: {error}"
+        state.last_error_at = time.time()
+
+    # ────────────────────────────────────────────
+    # 종료
+    # ────────────────────────────────────────────
+    async def wait_closed(self):
+        await self._closed.wait()
+
+    async def shutdown(self, timeout: float = 10):
+        """전체 취소 → timeout 초까지 정리 대기"""
+        self._closed.set()
+        tasks = [state.task for state in self._loops.values() if state.task and not state.task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=timeout)
+            if pending:
+                logger.warning(f"🛡️ 종료 지연 태스크: {[t.get_name() for t in pending]}")
+        logger.info(f"🛡️ 백그라운드 태스크 {len(tasks)}개 종료")
+
+    # ────────────────────────────────────────────
+    # 상태
+    # ────────────────────────────────────────────
+    def health(self) -> dict:
+        now = time.time()
+        result = {}
+        for name, state in self._loops.items():
+            if state.task is None or state.task.done():
+                status = 'dead'
+            elif state.backoff_until > now:
+                status = 'restarting'
+            elif state.last_error_at and (state.last_success is None or state.last_error_at > state.last_success):
+                status = 'failing'        # 마지막 반복이 실패 (루프 안에서 잡힌 오류)
+            elif (state.interval
+                  and now - (state.last_success or state.spawned_at) > state.interval * 3):
+                status = 'stale'
+            elif state.last_success is None:
+                status = 'waiting'        # 아직 보고 없음 (첫 반복 진행 중 / 이벤트 없음)
+            else:
+                status = 'ok'
+            result[name] = {
+                'status':       status,
+                'label':        state.label,
+                'interval':     state.interval,
+                'last_success': state.last_success,
+                'last_latency': state.last_latency,
+                'avg_latency':  state.avg_latency,
+                'iterations':   state.iterations,
+                'errors':       state.errors,
+                'restarts':     state.restarts,
+                'last_error':   state.last_error,
+            }
+        return result
+
+    def format_status(self) -> str:
+        """/status 용 루프별 한 줄"""
+        emoji = {'ok': '✅', 'waiting': '⏳', 'failing': '❗', 'stale': '⚠️', 'restarting': '🔄', 'dead': '❌'}
+        now = time.time()
+        lines = []
+        for name, h in self.health().items():
+            line = f"  {emoji[h['status']]} {h['label']}"
+            if h['interval']:
+                line += f" ({_fmt_seconds(h['interval'])} 주기)"
+            if h['last_success']:
+                line += f" · 성공 {_fmt_seconds(now - h['last_success'])} 전 · {h['avg_latency']:.1f}초"
+            if h['errors']:
+                line += f" · 오류 {h['errors']}"
+            if h['restarts']:
+                line += f" · 재시작 {h['restarts']}"
+            lines.append(line)
+        return '\n'.join(lines) if lines else "  (실행 중인 루프 없음)"
+
+
+def _fmt_seconds(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}초"
+    if seconds < 3600:
+        return f"{seconds // 60}분"
+    return f"{seconds // 3600}시간"
@@ -11,21 +11,43 @@ Telegram Bot (Production)
 import asyncio
 import logging
 import random
+import re
+import time
 from datetime import datetime
 
 from telegram import Update
 from telegram.ext import Application, CommandHandler, ContextTypes
 
 from config import Config
+from rate_limit import AsyncRateLimiter
 
 # ── 표준화된 파일명으로 import ──
 from ai_brain import AIBrainV3
 from news_engine import NewsEngineV3
 from momentum_tracker import MomentumTracker, AlertPriority
 from predictor_engine import PredictorEngineV3
+from sec_index import SecCompanyIndex
+from ticker_resolver import CompanyNameResolver
+from kr_master import KrStockMaster
+from sec_feed import SecDailyIndexFeed
+from sec_gateway import SecGateway
+from market_regime import MarketRegime
+from report_builder import ReportBuilder
+from telegram_outbox import TelegramOutbox
+from alert_coalescer import AlertCoalescer
+from task_supervisor import TaskSupervisor
+from event_bus import EventBus, NewsItem, Analysis, WatchRequest, SurgeSignal, Alert
+from state_store import StateStore
+from signal_store import SignalStore
 
 logger = logging.getLogger(__name__)
 
+# 티커로 인정하지 않는 AI 응답값
+_INVALID_TICKER_VALUES = {
+    '비상장', '스타트업', '섹터', 'UNKNOWN',
+    '', 'null', 'NULL', 'N/A', 'n/a',
+}
+
 
 class TelegramBot:
     def __init__(self):
@@ -38,12 +60,57 @@ class TelegramBot:
         # 중복 방지
         self.seen_filings = set()
 
+        # 🛡️ 백그라운드 루프 소유 (재시작 / 상태 / 종료)
+        self.supervisor = TaskSupervisor()
+
+        # 📮 발신 큐 (전송 대기 없이 적재 → 디스패처가 한도에 맞춰 전송)
+        self.outbox = TelegramOutbox()
+        # 📦 MEDIUM/LOW 모멘텀 알림은 짧은 창 단위 묶음 (CRITICAL/HIGH 는 즉시)
+        self.coalescer = AlertCoalescer(
+            lambda text, priority: self.outbox.submit(self.chat_id, text, priority),
+            self._format_momentum_alert,
+        )
+
         # 엔진 초기화
         try:
             self.ai        = AIBrainV3()
-            self.news_engine = NewsEngineV3(self.ai)
-            self.momentum  = MomentumTracker()
-            self.predictor = PredictorEngineV3()
+            self.sec_gateway = SecGateway()       # 🏛️ EDGAR 단일 창구 (세션/한도/UA 공유)
+            self.sec_index = SecCompanyIndex(sec_gateway=self.sec_gateway)  # 🗂️ CIK/티커/회사명 (디스크 로드)
+            self.resolver  = CompanyNameResolver(self.sec_index)
+            self.news_engine = NewsEngineV3(self.ai, self.resolver, self.sec_gateway)
+            self.kr_master = KrStockMaster()      # 🇰🇷 KRX 전종목 (디스크 로드)
+            self.regime    = MarketRegime()       # 🌡️ VIX/지수 스냅샷 (리포트·/status·모멘텀 공유)
+            self.momentum  = MomentumTracker(self.kr_master, self.regime)
+            self.predictor = PredictorEngineV3(self.sec_index, self.sec_gateway, self.regime)
+            self.reports   = ReportBuilder(self.predictor)  # 📊 공시 수집 즉시 리포트 반영
+
+            # 🏛️ SEC 공시 스트림 (Atom + 일일 인덱스) → 폼별 분배
+            self.sec_feed = SecDailyIndexFeed(self.sec_gateway)
+            self.sec_gateway.subscribe(('8-K',), self.news_engine.ingest_sec_filings)
+            self.sec_gateway.subscribe(('4',), self.predictor.ingest_form4)
+            self.sec_gateway.subscribe(
+                ('SC 13D', 'SC 13G', 'SCHEDULE 13D', 'SCHEDULE 13G'), self.predictor.ingest_13d
+            )
+
+            # 🚌 뉴스 → AI → 감시 → 알림 (스테이지별 큐 + 워커 수)
+            workers = Config.BUS_WORKERS
+            self.bus = EventBus(Config.BUS_QUEUE_SIZE)
+            self.bus.subscribe(NewsItem,     self._on_news,     workers['news'],     name='AI 분석')
+            self.bus.subscribe(Analysis,     self._on_analysis, workers['analysis'], name='분석 결과')
+            self.bus.subscribe(WatchRequest, self._on_watch,    workers['watch'],    name='감시 등록')
+            self.bus.subscribe(SurgeSignal,  self._on_surge,    workers['surge'],    name='급등 신호')
+            self.bus.subscribe(Alert,        self._on_alert,    workers['alert'],    name='알림')
+
+            # 💾 엔진 상태 스냅샷 → 재시작 시 감시 목록/중복 기록/수집 공시 그대로 이어서
+            self.state = StateStore()
+            for name, engine in (('news', self.news_engine), ('predictor', self.predictor),
+                                 ('momentum', self.momentum), ('sec_gateway', self.sec_gateway)):
+                self.state.register(name, engine.STATE_VERSION, engine.export_state, engine.import_state,
+                                    getattr(engine, 'STATE_MIGRATIONS', None))
+            self.state.restore_all()
+
+            # 🗄️ 알림/뉴스/AI 분석 이력 (버퍼 적재 → 백그라운드 저장, /history · 저녁 요약)
+            self.signals = SignalStore()
             logger.info("✅ 모든 엔진 초기화 성공 (Production)")
         except Exception as e:
             logger.error(f"❌ 엔진 초기화 실패: {e}")
@@ -69,6 +136,7 @@ class TelegramBot:
                 ("resume",  self.cmd_resume),
                 ("help",    self.cmd_help),
                 ("stats",   self.cmd_stats),
+                ("history", self.cmd_history),
             ]
             for cmd, handler in handlers:
                 self.app.add_handler(CommandHandler(cmd, handler))
@@ -80,11 +148,32 @@ class TelegramBot:
             # 이 코드가 있어야 봇이 메시지를 수신하기 시작합니다.
             await self.app.updater.start_polling(drop_pending_updates=True)
 
-            # 백그라운드 태스크
-            asyncio.create_task(self.schedule_reports())
-            asyncio.create_task(self.news_monitor())
-            asyncio.create_task(self.momentum_monitor_dynamic())  # 1분 주기
-            asyncio.create_task(self.momentum_monitor_full())     # 10분 주기
+            # 백그라운드 태스크 (슈퍼바이저가 소유 → 죽으면 백오프 재시작)
+            self.outbox.bind(self.app.bot)
+            spawn = self.supervisor.spawn
+
+            def reported(name, run_loop, label, interval=None):
+                """컴포넌트 루프: 슈퍼바이저 보고 핸들을 넘겨 실행 (/status 지연·마지막 성공 표시)"""
+                report = self.supervisor.reporter(name)
+                spawn(name, lambda: run_loop(report), label, interval)
+
+            reported('outbox', self.outbox.run_loop,             '📮 발신 큐')
+            spawn('scheduler', self.schedule_reports,            '📅 리포트 스케줄러', 30)
+            spawn('news',      self.news_monitor,                '📰 뉴스', 30)
+            spawn('dynamic',   self.momentum_monitor_dynamic,    '🎯 AI 지목 종목 (US/KR)', Config.WATCH_INTERVAL_MAX)
+            spawn('kr_full',   self.momentum_monitor_full,       '🇰🇷 한국 전체', 120)
+            reported('sec_index', self.sec_index.run_refresh_loop, '🗂️ SEC 인덱스', self.sec_index.refresh_interval)
+            reported('kr_master', self.kr_master.run_refresh_loop, '🇰🇷 KRX 종목 마스터', self.kr_master.refresh_interval)
+            reported('regime',    self.regime.run_refresh_loop,    '🌡️ 시장 국면', self.regime.ttl)
+            reported('state',     self.state.run_loop,             '💾 상태 스냅샷', self.state.interval)
+            reported('signals',   self.signals.run_loop,           '🗄️ 신호 기록', self.signals.flush_seconds)
+            reported('dedup',     self.momentum.dedup.run_loop,    '🧹 알림 중복 기록', self.momentum.dedup.flush_seconds)
+            reported('quota',     self.ai.quota.run_loop,          '🎫 AI 쿼터 저장', self.ai.quota.flush_seconds)
+            if Config.SEC_INGEST_MODE in ('atom', 'both'):
+                reported('sec_atom',  self.sec_gateway.run_loop, '🏛️ EDGAR getcurrent', self.sec_gateway.poll_interval)
+            if Config.SEC_INGEST_MODE in ('daily_index', 'both'):
+                reported('sec_daily', self.sec_feed.run_loop,    '🏛️ EDGAR 일일 인덱스', self.sec_feed.poll_interval)
+            self.bus.start(spawn, self.supervisor.reporter)
 
             logger.info("✅ 봇 시작 (Production)")
 
@@ -119,6 +208,7 @@ class TelegramBot:
             "• /report - 즉시 리포트\n"
             "• /status - 시스템 상태\n"
             "• /stats - 📊 알림 통계\n"
+            "• /history [종목] - 🗄️ 알림 이력 / 출처별 적중률\n"
             "• /news - 최근 뉴스 TOP 5\n"
             "• /pause - 알림 일시 정지\n"
             "• /resume - 알림 재개\n"
@@ -167,24 +257,13 @@ class TelegramBot:
 
         try:
             import yfinance as yf
-            import time
-
-            # 한국어 종목명 → 코드 매핑
-            ticker_map = {
-                '삼성전자': '005930.KS', 'sk하이닉스': '000660.KS',
-                '현대차': '005380.KS',   'lg화학': '051910.KS',
-                'naver': '035420.KS',    '카카오': '035720.KS',
-                'lg에너지솔루션': '373220.KS', '셀트리온': '068270.KS',
-                '기아': '000270.KS',     '포스코홀딩스': '005490.KS',
-            }
 
-            symbol = ticker_map.get(ticker.lower())
-            if not symbol:
-                # 6자리 숫자 → 한국 종목
-                if ticker.isdigit() and len(ticker) == 6:
-                    symbol = f"{ticker}.KS"
-                else:
-                    symbol = ticker.upper()
+            symbol = self._resolve_analyze_symbol(ticker)
+            if symbol is None:
+                await update.message.reply_text(
+                    f"⚠️ {ticker}: KRX 종목 마스터에 없는 코드입니다. 종목코드나 종목명을 확인해 주세요."
+                )
+                return
 
             # ── yfinance 호출 (재시도 3회, 지수 백오프) ──
             hist = None
@@ -263,9 +342,8 @@ class TelegramBot:
             await update.message.reply_text(f"⚠️ 오류 발생: {str(e)}")
 
     async def cmd_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        await update.message.reply_text("📊 리포트 생성 중...")
         try:
-            us_report = await self.predictor.generate_daily_report('US')
+            us_report = self.reports.snapshot('US')
             us_msg    = self._format_daily_report(us_report, '🇺🇸 미국')
             await update.message.reply_text(us_msg)
         except Exception as e:
@@ -280,7 +358,9 @@ class TelegramBot:
             msg += f"알림: {status_emoji}\n\n"
             msg += f"🧠 AI Brain\n"
             msg += f"  ✅ 모델: {', '.join(self.ai.scanner_models[:2])}\n"
-            msg += f"  ✅ top_ticker 연동: 활성화\n\n"
+            msg += f"  ✅ top_ticker 연동: 활성화\n"
+            msg += f"  🎫 오늘 쿼터:\n{self.ai.quota.format_status()}\n"
+            msg += f"  📐 프롬프트 (평균):\n{self.ai.prompt_stats.format_status()}\n\n"
             msg += f"📰 News Engine\n"
             msg += f"  ✅ 소스: {len(self.news_engine.sources)}개\n"
             msg += f"  ✅ 중복 체크: {len(self.news_engine.seen_urls)}개\n\n"
@@ -288,12 +368,15 @@ class TelegramBot:
             msg += f"  ✅ Finviz: curl_cffi TLS 위장\n"
             msg += f"  ✅ 집중 감시 US: {len(self.momentum.dynamic_tickers_us)}개\n"
             msg += f"  ✅ 집중 감시 KR: {len(self.momentum.dynamic_tickers_kr)}개\n"
-            msg += f"  ✅ 총 알림: {self.momentum.stats['total_alerts']}건\n\n"
-            msg += f"⏱️ 스캔 주기\n"
-            msg += f"  ✅ 뉴스: 30초\n"
-            msg += f"  ✅ 미국 AI 지목 종목: 1분 🎯\n"
-            msg += f"  ✅ 한국 전체: 2분\n"
+            msg += f"{self.momentum.watch_scheduler.format_status()}\n"
+            msg += f"  ✅ 총 알림: {self.momentum.stats['total_alerts']}건\n"
+            msg += f"  ✅ 급등 기준: +{self.momentum.min_price_change:.0f}%\n\n"
+            msg += f"🌡️ 시장 국면\n{self.regime.format_status()}\n\n"
+            msg += f"⏱️ 루프 상태\n{self.supervisor.format_status()}\n"
+            if self.state.saved_at:
+                msg += f"  💾 상태 저장: {int(time.time() - self.state.saved_at)}초 전\n"
             msg += f"  ❌ 미국 전체: OFF (노이즈 제거)\n\n"
+            msg += f"🚌 이벤트 버스\n{self.bus.format_status()}\n\n"
             msg += f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
 
             await update.message.reply_text(msg)
@@ -336,6 +419,7 @@ class TelegramBot:
             "• /report - 즉시 리포트\n"
             "• /status - 시스템 상태\n"
             "• /stats - 📊 알림 통계\n"
+            "• /history [종목] [일수] - 🗄️ 알림 이력 / 출처별 적중률\n"
             "• /news - 최근 뉴스 TOP 5\n"
             "• /pause - 알림 일시 정지\n"
             "• /resume - 알림 재개\n"
@@ -365,6 +449,44 @@ class TelegramBot:
             logger.error(f"/stats 오류: {e}")
             await update.message.reply_text(f"⚠️ 통계 조회 실패: {str(e)}")
 
+    async def cmd_history(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """
+        /history          → 최근 30일 출처별 적중률 (AI 지목 → 급등 알림)
+        /history 종목 [일수] → 해당 종목 알림 이력
+        """
+        try:
+            args = list(context.args or [])
+            days = 30
+            if args and args[-1].isdigit() and len(args) > 1:
+                days = int(args.pop())
+
+            if not args:
+                rows = await self.signals.hit_rate_by_source(days)
+                if not rows:
+                    await update.message.reply_text(f"🗄️ 최근 {days}일 AI 분석 기록이 없습니다.")
+                    return
+                msg = f"🎯 출처별 적중률 (최근 {days}일, {Config.SIGNAL_HIT_WINDOW_HOURS}시간 내 급등 알림)\n\n"
+                for row in rows:
+                    msg += f"• {row['source'] or '?'}: {row['hits']}/{row['total']} ({row['rate']:.0%})\n"
+                await update.message.reply_text(msg)
+                return
+
+            query = ' '.join(args)
+            ticker = self.kr_master.resolve(query) or query.upper()
+            rows = await self.signals.history(ticker, days)
+            if not rows:
+                await update.message.reply_text(f"🗄️ {ticker}: 최근 {days}일 알림 없음")
+                return
+            msg = f"🗄️ {ticker} 알림 이력 (최근 {days}일, {len(rows)}건)\n\n"
+            for row in rows[:20]:
+                when = datetime.fromtimestamp(row['ts']).strftime('%m-%d %H:%M')
+                change = f" +{row['change_pct']:.1f}%" if row['change_pct'] is not None else ""
+                msg += f"• {when} [{row['alert_type'] or row['kind']}]{change} · {row['source'] or '-'}\n"
+            await update.message.reply_text(msg)
+        except Exception as e:
+            logger.error(f"/history 오류: {e}")
+            await update.message.reply_text(f"⚠️ 이력 조회 실패: {str(e)}")
+
     # ────────────────────────────────────────────
     # 스케줄러 / 모니터
     # ────────────────────────────────────────────
@@ -373,153 +495,271 @@ class TelegramBot:
         while True:
             try:
                 await asyncio.sleep(random.uniform(25, 35))
+                started = time.monotonic()
                 now = datetime.now()
                 if now.hour == 23 and now.minute == 0:
                     await self.send_evening_report_us()
+                    self.supervisor.record('scheduler', started)
                     await asyncio.sleep(60)
+                    continue
+                self.supervisor.record('scheduler', started)
             except Exception as e:
                 logger.error(f"스케줄러 오류: {e}")
+                self.supervisor.record_error('scheduler', e)
                 await asyncio.sleep(60)
 
     async def send_evening_report_us(self):
         try:
-            report  = await self.predictor.generate_daily_report('US')
+            await self.regime.snapshot()  # 리스크는 최신 지수로
+            report  = self.reports.snapshot('US')
             message = self._format_daily_report(report, '🇺🇸 미국장 저녁 브리핑')
+
+            # 🗄️ 최근 24시간 급등 알림 이력 → AI 한 줄 요약
+            alerts = await self.signals.alerts_since(time.time() - 86400, 'US')
+            if alerts:
+                summary = await self.ai.generate_daily_summary([
+                    {
+                        'ticker': a['ticker'], 'name': a['title'], 'change_percent': a['change_pct'],
+                        'alert_type': a['alert_type'], 'source': a['source'],
+                        'time': datetime.fromtimestamp(a['ts']).strftime('%H:%M'),
+                    }
+                    for a in alerts
+                ])
+                message += f"\n\n🗄️ 오늘의 급등 알림 {len(alerts)}건\n{summary}"
             await self.send_message(message)
         except Exception as e:
             logger.error(f"미국 리포트 오류: {e}")
 
     async def news_monitor(self):
         """
-        뉴스 모니터 (30초 주기)
-        ✅ top_ticker 연동: AI가 지목한 대장주를 즉시 1분 집중 감시 등록
+        뉴스 모니터 (30초 주기) — 수집 + 키워드 사전 필터만, 이후 단계는 이벤트 버스
+        ✅ 로컬 해석 티커는 AI 응답을 기다리지 않고 바로 감시 요청
         """
         logger.info("📰 뉴스 모니터 시작")
 
         while True:
             try:
                 if self.notifications_paused:
+                    # 일시 정지 중에도 루프는 살아 있음 → 빈 반복으로 보고 (지연 경고 방지)
+                    self.supervisor.record('news', time.monotonic())
                     await asyncio.sleep(random.uniform(25, 35))
                     continue
 
-                news_list = await self.news_engine.scan_all_sources()
-
-                for news in news_list[:5]:
-                    try:
-                        # 🆕 AI 호출 없이 순수 키워드로 점수 계산 (Gemma 쿼터 절약)
-                        source    = news.get('source', '')
-                        kw_score  = Config.keyword_score(news['title'])
-                        threshold = Config.SOURCE_THRESHOLD.get(source, 7.0)
-
-                        logger.debug(
-                            f"키워드 점수: {kw_score:.0f} / threshold: {threshold} "
-                            f"| [{source}] {news['title'][:45]}"
-                        )
-                        if kw_score < threshold:
-                            continue
-
-                        # 🆕 min_score = threshold (소스 신뢰도 기반으로 AI 분석 기준도 완화)
-                        analysis = await self.ai.analyze_news_signal(
-                            news, min_score=int(threshold)
-                        )
-                        if not analysis:
-                            continue
-
-                        market = news.get('market', 'US')
-
-                        # ── 티커 유효성 검사 함수 ──────────────────────────
-                        _INVALID_VALUES = {
-                            '비상장', '스타트업', '섹터', 'UNKNOWN',
-                            '', 'null', 'NULL', 'N/A', 'n/a',
-                        }
-
-                        def _is_valid_ticker(t: str, mkt: str = 'US') -> bool:
-                            """
-                            1차: 무효값 필터
-                            2차: 형식 검증
-                              - KR: 정확히 6자리 숫자
-                              - US: 1~5자리 영문 대문자 (숫자 혼합 허용)
-                            """
-                            if not t or t.strip() in _INVALID_VALUES:
-                                return False
-                            t = t.strip()
-                            if mkt == 'KR':
-                                # 한국 종목코드: 정확히 6자리 숫자
-                                if not (t.isdigit() and len(t) == 6):
-                                    logger.warning(
-                                        f"⚠️ KR 티커 형식 불일치 (6자리 숫자 아님): '{t}' → 등록 스킵"
-                                    )
-                                    return False
-                            else:
-                                # 미국 티커: 1~6자리 영문/숫자 (특수기호 제외)
-                                import re as _re
-                                if not _re.match(r'^[A-Z]{1,6}$', t.upper()):
-                                    logger.warning(
-                                        f"⚠️ US 티커 형식 불일치: '{t}' → 등록 스킵"
-                                    )
-                                    return False
-                            return True
-
-                        # ✅ [핵심] AI가 직접 지목한 대장주 → 즉시 1분 집중 감시 등록
-                        top_ticker = analysis.get('top_ticker')
-                        if top_ticker and _is_valid_ticker(top_ticker, market):
-                            self.momentum.add_dynamic_ticker(top_ticker, market)
-                            logger.info(f"🎯 AI 대장주 집중 감시 등록: {top_ticker} ({market})")
-
-                        # 뉴스에 명시된 종목도 추가
-                        ticker_in_news = analysis.get('ticker_in_news')
-                        if ticker_in_news and ticker_in_news != 'null' and _is_valid_ticker(ticker_in_news, market):
-                            self.momentum.add_dynamic_ticker(ticker_in_news, market)
-
-                        # AI 추천 종목도 추가 (최대 3개)
-                        for rec in analysis.get('recommendations', [])[:3]:
-                            rec_ticker = rec.get('ticker', '')
-                            if _is_valid_ticker(rec_ticker, market):
-                                self.momentum.add_dynamic_ticker(rec_ticker, market)
-
-                        # 알림 발송
-                        msg = self._format_news_alert(news, analysis)
-                        await self.send_message(msg)
-                        await asyncio.sleep(random.uniform(0.8, 1.2))
-
-                    except Exception as e:
-                        logger.debug(f"뉴스 처리 오류: {e}")
-                        continue
-
+                started = time.monotonic()
+                await self.news_cycle()
+                self.supervisor.record('news', started)
                 await asyncio.sleep(random.uniform(25, 35))
 
             except Exception as e:
                 logger.error(f"뉴스 모니터 오류: {e}")
+                self.supervisor.record_error('news', e)
                 await asyncio.sleep(random.uniform(55, 65))
 
+    async def news_cycle(self) -> int:
+        """뉴스 1회 수집 → 키워드 사전 필터 통과분 발행 (반환: 발행 건수, replay 하네스도 사용)"""
+        news_list = await self.news_engine.scan_all_sources()
+        published = 0
+
+        for news in news_list[:5]:
+            # 🆕 AI 호출 없이 순수 키워드로 점수 계산 (Gemma 쿼터 절약)
+            # 📑 SEC 8-K는 제목이 회사명뿐 → Item 코드 기반 점수 우선
+            source    = news.get('source', '')
+            kw_score  = news.get('prefilter_score')
+            if kw_score is None:
+                kw_score = Config.keyword_score(news['title'])
+            threshold = Config.SOURCE_THRESHOLD.get(source, 7.0)
+
+            logger.debug(
+                f"키워드 점수: {kw_score:.0f} / threshold: {threshold} "
+                f"| [{source}] {news['title'][:45]}"
+            )
+            if kw_score < threshold:
+                continue
+
+            market = news.get('market', 'US')
+            self.signals.record_news(news, market, kw_score)
+
+            # 🔎 로컬 해석된 티커(SEC 인덱스) → AI 응답 기다리지 않고 바로 감시 등록
+            if news.get('ticker'):
+                await self.bus.publish(WatchRequest(
+                    news['ticker'], market, '로컬 해석 티커', news=news, score=kw_score,
+                ))
+
+            # AI 단계 큐가 가득 차면 여기서 대기 (역압)
+            await self.bus.publish(NewsItem(news, market, threshold))
+            published += 1
+        return published
+
+    # ────────────────────────────────────────────
+    # 이벤트 버스 스테이지
+    # ────────────────────────────────────────────
+    async def _on_news(self, event: NewsItem):
+        """NewsItem → AI 분석 → Analysis (스트리밍 중 top_ticker 확정 즉시 감시 요청)"""
+        def _on_top_ticker(t, mkt=event.market):
+            if self._is_valid_ticker(t, mkt):
+                self.bus.publish_nowait(WatchRequest(
+                    t, mkt, 'AI 대장주 (스트리밍)', urgent=True, news=event.news,
+                ))
+
+        # 🆕 min_score = threshold (소스 신뢰도 기반으로 AI 분석 기준도 완화)
+        analysis = await self.ai.analyze_news_signal(
+            event.news, min_score=int(event.threshold), on_top_ticker=_on_top_ticker,
+        )
+        if analysis:
+            await self.bus.publish(Analysis(event.news, analysis, event.market))
+
+    async def _on_analysis(self, event: Analysis):
+        """Analysis → 지목/언급/추천 종목 감시 요청 + 뉴스 알림"""
+        analysis, market, news = event.analysis, event.market, event.news
+        score = analysis.get('score')
+        self.signals.record_analysis(news, analysis, market)
+
+        # ✅ [핵심] AI가 직접 지목한 대장주 → 즉시 집중 감시 등록
+        top_ticker = analysis.get('top_ticker')
+        if (top_ticker and top_ticker != analysis.get('early_top_ticker')
+                and self._is_valid_ticker(top_ticker, market)):
+            await self.bus.publish(WatchRequest(
+                top_ticker, market, 'AI 대장주', urgent=True, news=news, score=score,
+            ))
+
+        # 뉴스에 명시된 종목도 추가
+        ticker_in_news = analysis.get('ticker_in_news')
+        if ticker_in_news and ticker_in_news != 'null' and self._is_valid_ticker(ticker_in_news, market):
+            await self.bus.publish(WatchRequest(ticker_in_news, market, '뉴스 언급', news=news, score=score))
+
+        # AI 추천 종목도 추가 (최대 3개)
+        for rec in analysis.get('recommendations', [])[:3]:
+            rec_ticker = rec.get('ticker', '')
+            # 🇰🇷 코드 누락/오기 → 종목명으로 KRX 마스터 조회
+            if market == 'KR' and rec_ticker not in self.kr_master:
+                rec_ticker = self.kr_master.resolve(rec.get('name', '')) or rec_ticker
+            if self._is_valid_ticker(rec_ticker, market):
+                await self.bus.publish(WatchRequest(
+                    rec_ticker, market, 'AI 추천', news=news, score=score,
+                    ttl_hours=Config.WATCH_REC_TTL_HOURS,
+                ))
+
+        await self.bus.publish(Alert(self._format_news_alert(event.news, analysis), AlertPriority.HIGH))
+
+    def _on_watch(self, event: WatchRequest):
+        """WatchRequest → 집중 감시 등록 (스케줄러가 즉시 1회 확인 후 적응형 주기로)"""
+        self.momentum.add_dynamic_ticker(
+            event.ticker, event.market, urgent=event.urgent, reason=event.reason,
+            news=event.news, score=event.score, ttl_hours=event.ttl_hours,
+        )
+        logger.info(f"🎯 집중 감시 등록 [{event.reason}]: {event.ticker} ({event.market})")
+
+    def _on_surge(self, event: SurgeSignal):
+        signal = event.signal
+        # 집중 감시 종목 급등 → 등록 계기 뉴스 출처로 기록 (출처별 적중률)
+        entry = self.momentum.watch_registry.get(signal.get('market'), signal.get('ticker'))
+        self.signals.record_alert(signal, entry.source if entry is not None else None)
+        self.coalescer.add(signal)
+
+    def _on_alert(self, event: Alert):
+        self.outbox.submit(self.chat_id, event.text, event.priority)
+
+    def _resolve_analyze_symbol(self, query: str) -> str:
+        """
+        /analyze 입력 → yfinance 심볼
+        - 한글 종목명 / 6자리 코드 → KRX 마스터 (.KS/.KQ 정확 매핑), 마스터에 없는 코드 → None
+        - 영문: SEC 상장 티커면 미국, 아니면 한국 영문명(NAVER 등) 조회 후 미국 티커로 간주
+        """
+        query = query.strip()
+        is_ascii = query.isascii()
+        # 미국 클래스주는 yfinance 도 SEC 와 같은 '-' 표기 (BRK.B → BRK-B)
+        us_symbol = query.upper().replace('.', '-')
+        if is_ascii and not query.isdigit() and us_symbol in self.sec_index:
+            return us_symbol
+        code = self.kr_master.resolve(query)
+        if code:
+            symbol = self.kr_master.symbol(code)
+            if symbol:
+                return symbol
+        if query.isdigit() and len(query) == 6:
+            return None  # 마스터에 없는 코드 → .KS/.KQ 추측하지 않음
+        return query.upper()
+
+    def _is_valid_ticker(self, t: str, mkt: str = 'US') -> bool:
+        """
+        AI 응답 티커 유효성 검사
+        1차: 무효값 필터
+        2차: 형식 검증
+          - KR: 정확히 6자리 숫자
+          - US: 1~6자리 영문 대문자
+        3차: 실제 상장 여부 (US: SEC 인덱스 / KR: KRX 마스터)
+        """
+        if not t or t.strip() in _INVALID_TICKER_VALUES:
+            return False
+        t = t.strip()
+        if mkt == 'KR':
+            # 한국 종목코드: 정확히 6자리 숫자
+            if not (t.isdigit() and len(t) == 6):
+                logger.warning(f"⚠️ KR 티커 형식 불일치 (6자리 숫자 아님): '{t}' → 등록 스킵")
+                return False
+            if not self.kr_master.is_listed(t):
+                logger.warning(f"⚠️ KR 티커 미상장 (KRX 마스터 없음): '{t}' → 등록 스킵")
+                return False
+        else:
+            # 미국 티커: 1~6자리 영문 (특수기호 제외)
+            if not re.match(r'^[A-Z]{1,6}$', t.upper()):
+                logger.warning(f"⚠️ US 티커 형식 불일치: '{t}' → 등록 스킵")
+                return False
+            if not self.resolver.is_listed(t):
+                logger.warning(f"⚠️ US 티커 미상장 (SEC 인덱스 없음): '{t}' → 등록 스킵")
+                return False
+        return True
+
     async def momentum_monitor_dynamic(self):
-        """AI 지목 + 뉴스 종목 집중 감시 (1분 주기)"""
-        logger.info("🎯 AI 지목 종목 집중 감시 시작 (1분 주기)")
+        """
+        AI 지목 + 뉴스 종목 집중 감시 (종목별 적응형 주기)
+        - WatchScheduler 가 때가 된 종목만 꺼냄: 지목 직후 수 초 → 뉴스 경과/횡보 시 점점 느리게
+        - 조회는 초당 WATCH_POLL_RPS 한도 안에서 WATCH_POLL_CONCURRENCY 개씩
+        """
+        logger.info("🎯 AI 지목 종목 집중 감시 시작 (적응형 주기)")
+        limiter = AsyncRateLimiter(Config.WATCH_POLL_RPS)
 
         while True:
             try:
                 if self.notifications_paused:
+                    # 일시 정지 중에도 루프는 살아 있음 → 빈 반복으로 보고 (지연 경고 방지)
+                    self.supervisor.record('dynamic', time.monotonic())
                     await asyncio.sleep(random.uniform(55, 65))
                     continue
 
-                # 미국 AI 지목 종목
-                us_signals = await self.momentum.scan_momentum('US', mode='dynamic')
-                for signal in us_signals:
-                    await self.send_message(self._format_momentum_alert(signal))
-                    await asyncio.sleep(random.uniform(0.8, 1.2))
-
-                # 한국 AI 지목 종목
-                kr_signals = await self.momentum.scan_momentum('KR', mode='dynamic')
-                for signal in kr_signals:
-                    await self.send_message(self._format_momentum_alert(signal))
-                    await asyncio.sleep(random.uniform(0.8, 1.2))
-
-                await asyncio.sleep(random.uniform(55, 65))
+                await self.momentum.watch_scheduler.wait_due()
+                started = time.monotonic()
+                await self.dynamic_cycle(limiter)
+                self.supervisor.record('dynamic', started)
 
             except Exception as e:
                 logger.error(f"집중 감시 오류: {e}")
+                self.supervisor.record_error('dynamic', e)
                 await asyncio.sleep(random.uniform(55, 65))
 
+    async def dynamic_cycle(self, limiter: AsyncRateLimiter = None) -> int:
+        """때가 된 감시 종목 최대 WATCH_POLL_CONCURRENCY 개 확인 (반환: 확인 종목 수)"""
+        scheduler = self.momentum.watch_scheduler
+
+        async def poll(key):
+            market, ticker = key
+            # pop_due 로 힙에서 꺼낸 종목 → 어떻게 끝나든 다시 예약 (안 하면 만료까지 확인 안 됨)
+            signal = quote = None
+            try:
+                if limiter:
+                    await limiter.acquire()
+                signal, quote = await self.momentum.poll_dynamic_ticker(ticker, market)
+            finally:
+                scheduler.reschedule(market, ticker, quote, self.momentum.min_price_change)
+            if signal:
+                await self.bus.publish(SurgeSignal(signal))
+
+        self.momentum.expire_dynamic_tickers()
+        due = scheduler.pop_due(Config.WATCH_POLL_CONCURRENCY)
+        if due:
+            await asyncio.gather(*(poll(key) for key in due))
+        return len(due)
+
     async def momentum_monitor_full(self):
         """
         한국 전체 스캔 ONLY (2분 주기)
@@ -531,28 +771,37 @@ class TelegramBot:
         while True:
             try:
                 if self.notifications_paused:
+                    # 일시 정지 중에도 루프는 살아 있음 → 빈 반복으로 보고 (지연 경고 방지)
+                    self.supervisor.record('kr_full', time.monotonic())
                     await asyncio.sleep(random.uniform(115, 125))
                     continue
 
                 # ✅ 미국 전체 스캔 완전 제거 (동적 모멘텀만 유지)
-                # us_signals = await self.momentum.scan_momentum('US', mode='full')  # 삭제!
+                # us_signals = await self.momentum.scan_momentum('US')  # 삭제!
 
                 # ✅ 한국만 스캔 (2분 주기)
-                kr_signals = await self.momentum.scan_momentum('KR', mode='full')
-                for signal in kr_signals:
-                    await self.send_message(self._format_momentum_alert(signal))
-                    await asyncio.sleep(random.uniform(0.8, 1.2))
-
-                # 메모리 정리
-                self.momentum.cleanup_alerts()
+                started = time.monotonic()
+                await self.kr_full_cycle()
+                self.supervisor.record('kr_full', started)
 
                 # ✅ 2분 주기 (115~125초)
                 await asyncio.sleep(random.uniform(115, 125))
 
             except Exception as e:
                 logger.error(f"한국 전체 스캔 오류: {e}")
+                self.supervisor.record_error('kr_full', e)
                 await asyncio.sleep(random.uniform(115, 125))
 
+    async def kr_full_cycle(self) -> int:
+        """한국 전체 급등 스캔 1회 + 지난 기록 정리 (반환: 신호 수)"""
+        kr_signals = await self.momentum.scan_momentum('KR')
+        for signal in kr_signals:
+            await self.bus.publish(SurgeSignal(signal))
+
+        # 메모리 정리
+        self.momentum.cleanup_alerts()
+        return len(kr_signals)
+
     # ────────────────────────────────────────────
     # 메시지 포맷
     # ────────────────────────────────────────────
@@ -639,6 +888,8 @@ class TelegramBot:
         msg  = f"━━━━━━━━━━━━━━━━\n"
         msg += f"{title}\n"
         msg += f"📅 {report['date'].strftime('%Y-%m-%d')}\n"
+        if report.get('built_at'):
+            msg += f"🕐 기준: {report['built_at'].strftime('%H:%M:%S')} (공시 {report.get('signal_count', 0)}건 반영)\n"
         msg += f"━━━━━━━━━━━━━━━━\n\n"
 
         events = report.get('events_today', [])
@@ -666,15 +917,9 @@ class TelegramBot:
     # ────────────────────────────────────────────
     # 메시지 전송
     # ────────────────────────────────────────────
-    async def send_message(self, text: str):
-        try:
-            await self.app.bot.send_message(
-                chat_id=self.chat_id,
-                text=text,
-                parse_mode=None,
-            )
-        except Exception as e:
-            logger.error(f"메시지 전송 실패: {e}")
+    async def send_message(self, text: str, priority: AlertPriority = AlertPriority.MEDIUM):
+        """발신 큐에 적재 후 즉시 반환 (실제 전송/한도/재시도는 TelegramOutbox)"""
+        self.outbox.submit(self.chat_id, text, priority or AlertPriority.MEDIUM)
 
     # ────────────────────────────────────────────
     # 메인 루프
@@ -682,13 +927,25 @@ class TelegramBot:
     async def run_forever(self):
         try:
             await self.start()
-            while True:
-                await asyncio.sleep(1)
+            await self.supervisor.wait_closed()
         except KeyboardInterrupt:
             logger.info("사용자 중단")
         except Exception as e:
             logger.error(f"봇 오류: {e}", exc_info=True)
         finally:
+            if self.app:
+                self.coalescer.flush_all()
+                await self.outbox.flush(timeout=10)
+            await self.supervisor.shutdown()
+            self.state.checkpoint()
+            self.state.close()
+            self.signals.flush()
+            self.signals.close()
+            self.momentum.dedup.flush()
+            self.momentum.dedup.close()
+            self.ai.quota.flush()
+            await self.ai.aclose()
+            await self.sec_gateway.aclose()
             if self.app:
                 await self.app.stop()
                 await self.app.shutdown()
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Telegram Outbox - 발신 메시지 단일 큐 + 전송 전담 디스패처
+- ✅ 생산자(뉴스/모멘텀/리포트)는 큐에 넣고 바로 복귀 → 알림 폭주에도 스캔 주기 지연 없음
+- ✅ 우선순위 레인: CRITICAL → HIGH → MEDIUM → LOW (같은 레인은 들어온 순서)
+- ✅ 텔레그램 한도 준수: 채팅별(개인 초당 1건 / 그룹 분당 20건) + 봇 전체 초당 한도
+- ✅ 429 RetryAfter → 지정 시간만큼 전체 일시정지 후 같은 메시지 재전송 (순서 유지)
+- ✅ 네트워크 오류는 백오프 재시도, 잘못된 요청(권한/형식)은 버림
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from config import Config
+from momentum_tracker import AlertPriority
+from rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class _Outgoing:
+    __slots__ = ('chat_id', 'text', 'priority', 'attempts', 'queued_at')
+
+    def __init__(self, chat_id, text: str, priority: AlertPriority):
+        self.chat_id   = chat_id
+        self.text      = text
+        self.priority  = priority
+        self.attempts  = 0
+        self.queued_at = time.monotonic()
+
+
+class TelegramOutbox:
+    def __init__(self, bot=None, global_rps: float = None, max_retries: int = 3):
+        self.bot = bot
+        self.max_retries = max_retries
+        self._global = TokenBucket(global_rps or Config.TELEGRAM_GLOBAL_RPS,
+                                   global_rps or Config.TELEGRAM_GLOBAL_RPS)
+        self._chats = {}                # chat_id → TokenBucket
+        self._heap = []                 # (우선순위 값, 순번, _Outgoing) — 직접 관리하는 힙
+        self._arrived = asyncio.Event() # 힙에 새 항목
+        self._unfinished = 0            # 넣었지만 아직 처리 완료 안 된 항목 (flush 대기용)
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._seq = itertools.count()
+        self._paused_until = 0.0        # RetryAfter 수신 시 전체 정지 시각 (monotonic)
+        self.stats = {'queued': 0, 'sent': 0, 'dropped': 0, 'retry_after': 0, 'max_wait': 0.0}
+
+    def bind(self, bot):
+        """Application 초기화 후 bot 연결 (그 전에 쌓인 메시지는 run_loop 시작 시 전송)"""
+        self.bot = bot
+
+    # ────────────────────────────────────────────
+    # 생산자 API (대기 없음)
+    # ────────────────────────────────────────────
+    def submit(self, chat_id, text: str, priority: AlertPriority = AlertPriority.MEDIUM):
+        """큐에 넣고 즉시 반환"""
+        if not isinstance(priority, AlertPriority):
+            priority = AlertPriority.MEDIUM
+        self._put(next(self._seq), _Outgoing(chat_id, text, priority))
+        self.stats['queued'] += 1
+
+    def _put(self, seq: int, item: _Outgoing):
+        heapq.heappush(self._heap, (item.priority.value, seq, item))
+        self._unfinished += 1
+        self._drained.clear()
+        self._arrived.set()
+
+    def _task_done(self):
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._unfinished = 0
+            self._drained.set()
+
+    def pending(self) -> int:
+        return len(self._heap)
+
+    # ────────────────────────────────────────────
+    # 한도
+    # ────────────────────────────────────────────
+    def _chat_bucket(self, chat_id) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            # 음수 chat_id = 그룹/채널 (분당 20건), 양수 = 개인 채팅 (초당 1건)
+            if str(chat_id).startswith('-'):
+                per_minute = Config.TELEGRAM_GROUP_PER_MINUTE
+                bucket = TokenBucket(3, per_minute / 60)
+            else:
+                bucket = TokenBucket(1, Config.TELEGRAM_CHAT_RPS)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    def _wait_time(self, item: _Outgoing) -> float:
+        return max(
+            self._paused_until - time.monotonic(),
+            self._chat_bucket(item.chat_id).wait_time(),
+            self._global.wait_time(),
+        )
+
+    async def _next_ready(self):
+        """
+        가장 높은 우선순위 메시지를 한도가 허락할 때까지 대기 후 반환
+        - 대기 중 더 급한 메시지가 들어오면 그쪽을 먼저 (현재 메시지는 원래 순번으로 되돌림)
+        """
+        while not self._heap:
+            self._arrived.clear()
+            await self._arrived.wait()
+        entry = heapq.heappop(self._heap)
+        try:
+            while True:
+                wait = self._wait_time(entry[2])
+                if wait <= 0:
+                    return entry[1], entry[2]
+                await asyncio.sleep(wait)
+                if self._heap and self._heap[0][:2] < entry[:2]:
+                    entry = heapq.heapreplace(self._heap, entry)
+        except asyncio.CancelledError:
+            heapq.heappush(self._heap, entry)   # 대기 중 취소 (재시작) → 잃지 않고 되돌림
+            raise
+
+    # ────────────────────────────────────────────
+    # 디스패처
+    # ────────────────────────────────────────────
+    async def run_loop(self, report=None):
+        """
+        큐 소비 (TelegramBot.start 에서 1개 실행)
+        report: TaskSupervisor.reporter (발신 1건마다 성공/실패 보고 → 마지막 성공 = 마지막 발신)
+        """
+        logger.info("📮 텔레그램 발신 큐 시작")
+        while True:
+            seq, item = await self._next_ready()
+            started = time.monotonic()
+            try:
+                await self._send(seq, item)
+                if report:
+                    report.ok(started)
+            except Exception as e:
+                logger.error(f"📮 발신 디스패처 오류: {e}")
+                if report:
+                    report.error(e)
+            finally:
+                self._task_done()
+
+    async def _send(self, seq: int, item: _Outgoing):
+        self._chat_bucket(item.chat_id).consume()
+        self._global.consume()
+        item.attempts += 1
+        try:
+            await self.bot.send_message(chat_id=item.chat_id, text=item.text, parse_mode=None)
+        except RetryAfter as e:
+            retry_after = e.retry_after
+            if hasattr(retry_after, 'total_seconds'):
+                retry_after = retry_after.total_seconds()
+            self._paused_until = time.monotonic() + float(retry_after) + 0.5
+            self._chat_bucket(item.chat_id).drain()
+            self.stats['retry_after'] += 1
+            logger.warning(f"📮 텔레그램 429: {retry_after}초 후 재전송 (대기 {self.pending() + 1}건)")
+            self._put(seq, item)    # 시도 횟수 미차감 (한도 초과는 메시지 잘못이 아님)
+            return
+        except (BadRequest, Forbidden) as e:
+            self.stats['dropped'] += 1
+            logger.error(f"메시지 전송 실패 (버림): {e}")
+            return
+        except NetworkError as e:
+            if item.attempts < self.max_retries:
+                self._paused_until = max(self._paused_until, time.monotonic() + 2 ** item.attempts)
+                logger.warning(f"📮 전송 재시도 {item.attempts}/{self.max_retries}: {e}")
+                self._put(seq, item)
+            else:
+                self.stats['dropped'] += 1
+                logger.error(f"메시지 전송 실패: {e}")
+            return
+
+        self.stats['sent'] += 1
+        waited = time.monotonic() - item.queued_at
+        self.stats['max_wait'] = max(self.stats['max_wait'], waited)
+        if waited > 30:
+            logger.info(f"📮 {item.priority.name} 알림 {waited:.0f}초 지연 전송 (대기 {self.pending()}건)")
+
+    async def flush(self, timeout: float = 10):
+        """종료 전 남은 메시지 전송 대기 (timeout 초까지)"""
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"📮 미전송 메시지 {self.pending()}건 (종료)")
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Ticker Resolver - 회사명 → 티커 로컬 해석 (LLM 왕복 없음)
+- ✅ SEC 인덱스(SecCompanyIndex) 기반: 정규화 토큰 + 법인 접미사 제거 (Inc, Corp, Holdings …)
+- ✅ 정확 일치 → 트라이그램 유사도(Dice) 순으로 조회
+- ✅ 보도자료 본문의 "(NASDAQ: ACMT)" 표기 추출 + 실제 상장 티커 검증
+- ✅ AI 제안 티커가 실제 상장 종목인지 검증
+"""
+
+import logging
+import re
+from collections import defaultdict
+
+from sec_index import SecCompanyIndex, normalize_company_name
+
+logger = logging.getLogger(__name__)
+
+# 이름 끝에서 반복 제거할 법인/지역 접미사 (정규화 후 토큰 단위)
+_NAME_SUFFIXES = {
+    'INC', 'INCORPORATED', 'CORP', 'CORPORATION', 'CO', 'COMPANY', 'COS',
+    'HOLDINGS', 'HOLDING', 'LTD', 'LIMITED', 'PLC', 'LLC', 'LP', 'L P',
+    'SA', 'NV', 'AG', 'SE', 'ADR', 'ADS', 'TRUST',
+    'DE', 'MD', 'NY', 'CA',   # SEC 회사명의 주(州) 표기 "APPLE INC /DE/"
+    'CLASS A', 'CLASS B', 'CL A', 'CL B',
+}
+_MULTI_SUFFIXES = sorted((s for s in _NAME_SUFFIXES if ' ' in s), key=len, reverse=True)
+
+# 보도자료 거래소 표기: "(NASDAQ: ACMT)", "(NYSE American: XYZ)", "(Nasdaq: ACMT, ACMTW)"
+_EXCHANGE_TICKER_RE = re.compile(
+    r'\(\s*(?:NASDAQ|Nasdaq|NYSE(?:\s+American|\s+Arca|\s+MKT)?|NYSEAMERICAN|AMEX|OTCQX|OTCQB|OTC|CBOE|Cboe)'
+    r'(?:\s*(?:GS|GM|CM|Global Select Market|Capital Market|Global Market))?\s*[:：]\s*'
+    r'([A-Z]{1,5}(?:[.\-][A-Z])?)',
+)
+
+
+def normalize_name(name: str) -> str:
+    """
+    비교용 회사명 정규화
+    "Acme Therapeutics, Inc." → "ACME THERAPEUTICS"
+    "BERKSHIRE HATHAWAY INC /DE/" → "BERKSHIRE HATHAWAY"
+    """
+    norm = normalize_company_name(name)
+    if norm.startswith('THE '):
+        norm = norm[4:]
+    while True:
+        stripped = norm
+        for suffix in _MULTI_SUFFIXES:
+            if stripped.endswith(' ' + suffix):
+                stripped = stripped[:-len(suffix) - 1]
+                break
+        else:
+            tokens = stripped.split(' ')
+            if len(tokens) > 1 and tokens[-1] in _NAME_SUFFIXES:
+                stripped = ' '.join(tokens[:-1])
+        if stripped == norm:
+            return norm
+        norm = stripped
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CompanyNameResolver:
+    def __init__(self, sec_index: SecCompanyIndex, min_similarity: float = 0.8):
+        self.sec_index = sec_index
+        self.min_similarity = min_similarity
+
+        self._exact = {}                   # 정규화 이름 → 티커
+        self._names = []                   # id → (정규화 이름, 티커, 트라이그램 집합)
+        self._postings = defaultdict(list) # 트라이그램 → [id, ...]
+        self._built_for = None             # 인덱스 갱신 감지용 (refreshed_at, len)
+
+    # ────────────────────────────────────────────
+    # 인덱스 구축 (SEC 인덱스가 갱신되면 자동 재구축)
+    # ────────────────────────────────────────────
+    def _ensure_built(self):
+        signature = (self.sec_index.refreshed_at, len(self.sec_index))
+        if signature == self._built_for:
+            return
+        exact, names, postings = {}, [], defaultdict(list)
+        # companies()는 rank 순 → 동명 회사는 대표(시총 상위) 티커 우선
+        for ticker, _cik, name in self.sec_index.companies():
+            norm = normalize_name(name)
+            if not norm or norm in exact:
+                continue
+            exact[norm] = ticker
+            grams = _trigrams(norm)
+            idx = len(names)
+            names.append((norm, ticker, grams))
+            for gram in grams:
+                postings[gram].append(idx)
+        self._exact, self._names, self._postings = exact, names, postings
+        self._built_for = signature
+        logger.info(f"🔎 회사명 인덱스 구축: {len(names):,}개")
+
+    # ────────────────────────────────────────────
+    # 조회
+    # ────────────────────────────────────────────
+    def resolve(self, name: str, min_similarity: float = None):
+        """
+        회사명 → (티커, 유사도) / 못 찾으면 None
+        - 정확 일치(접미사 제거 후) → 1.0
+        - 그 외 트라이그램 Dice 계수 최고값이 min_similarity 이상일 때만
+        """
+        self._ensure_built()
+        norm = normalize_name(name)
+        if not norm:
+            return None
+        ticker = self._exact.get(norm)
+        if ticker:
+            return ticker, 1.0
+
+        threshold = self.min_similarity if min_similarity is None else min_similarity
+        grams = _trigrams(norm)
+
+        # 후보 생성: Dice ≥ t 이면 질의 트라이그램 중 최대 n(2-2t)/(2-t)개만 불일치 가능
+        # → 가장 희귀한 그 개수+1 개 트라이그램 중 하나는 반드시 공유 (흔한 'ION' 등 포스팅 생략)
+        rare_first = sorted(grams, key=lambda g: len(self._postings.get(g, ())))
+        probe = int(len(grams) * (2 - 2 * threshold) / (2 - threshold)) + 1
+        candidates = set()
+        for gram in rare_first[:probe]:
+            candidates.update(self._postings.get(gram, ()))
+
+        best_idx, best_score = None, 0.0
+        for idx in candidates:
+            other = self._names[idx][2]
+            score = 2.0 * len(grams & other) / (len(grams) + len(other))
+            if score > best_score:
+                best_idx, best_score = idx, score
+        if best_idx is None or best_score < threshold:
+            return None
+        return self._names[best_idx][1], best_score
+
+    def extract_exchange_tickers(self, text: str) -> list:
+        """
+        본문 "(NASDAQ: ACMT)" 표기에서 티커 추출 (SEC 인덱스에 있는 것만, 순서 유지)
+        - 인덱스가 비어 있으면 (최초 로드 전) 형식만 보고 그대로 반환
+        """
+        found = []
+        for raw in _EXCHANGE_TICKER_RE.findall(text or ''):
+            ticker = raw.replace('.', '-')
+            if ticker not in found and (not len(self.sec_index) or ticker in self.sec_index):
+                found.append(ticker)
+        return found
+
+    def resolve_news(self, news_item: dict):
+        """
+        뉴스/공시 1건 → 티커 (LLM 없이)
+        1. SEC 공시: 제목의 CIK → 티커
+        2. 본문/제목의 거래소 표기 "(NASDAQ: XXX)"
+        3. 공시 회사명 → 이름 해석
+        """
+        title = news_item.get('title', '')
+        if news_item.get('type') == 'filing':
+            cik_match = re.search(r'\((\d{7,10})\)', title)
+            if cik_match:
+                ticker = self.sec_index.cik_to_ticker(cik_match.group(1))
+                if ticker:
+                    return ticker
+
+        text = f"{title} {news_item.get('content', '')}"
+        tickers = self.extract_exchange_tickers(text)
+        if tickers:
+            return tickers[0]
+
+        company_name = news_item.get('company_name')
+        if company_name:
+            resolved = self.resolve(company_name)
+            if resolved:
+                return resolved[0]
+        return None
+
+    def is_listed(self, ticker: str) -> bool:
+        """
+        미국 상장 티커 여부 (BRK.B / BRK-B 모두 허용)
+        - SEC 인덱스가 아직 비어 있으면 판단 보류 → True
+        """
+        if not len(self.sec_index):
+            return True
+        return (ticker or '').upper().replace('.', '-') in self.sec_index
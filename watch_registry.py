@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Watch Registry - 집중 감시 종목 목록 (만료 힙 + 색인)
+- ✅ 등록/만료/한도 초과 제거 모두 O(log n) → 수천 종목도 매 주기 전체 순회 없음
+- ✅ 종목별 TTL (기본 Config.WATCH_TTL_HOURS), 재등록은 만료를 늦추기만 함 (명시적 연장 + 로그)
+- ✅ 등록 사유 / 출처 뉴스 / 점수 / 재등록 횟수 보관
+- ✅ 시장별 {티커: 등록 시각} 읽기 전용 뷰 → 기존 dynamic_tickers_us/kr 참조 호환
+- ✅ dump()/load() → 재시작 후에도 감시 목록·남은 TTL 유지 (state_store)
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Mapping
+from datetime import datetime
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class WatchEntry:
+    __slots__ = ('market', 'ticker', 'added_at', 'expires_at', 'reason', 'last_reason',
+                 'news_title', 'news_url', 'source', 'score', 'hits', 'seq')
+
+    def __init__(self, market: str, ticker: str, expires_at: float, reason: str, news: dict, score):
+        self.market = market
+        self.ticker = ticker
+        self.added_at = datetime.now()
+        self.expires_at = expires_at         # time.time()
+        self.reason = reason                 # 최초 등록 사유
+        self.last_reason = reason
+        news = news or {}
+        self.news_title = news.get('title', '')
+        self.news_url = news.get('url', '')
+        self.source = news.get('source', '')
+        self.score = score
+        self.hits = 1
+        self.seq = 0
+
+    def to_dict(self) -> dict:
+        return {
+            'market': self.market, 'ticker': self.ticker, 'added_at': self.added_at,
+            'expires_at': datetime.fromtimestamp(self.expires_at), 'reason': self.reason,
+            'last_reason': self.last_reason, 'news_title': self.news_title,
+            'news_url': self.news_url, 'source': self.source, 'score': self.score, 'hits': self.hits,
+        }
+
+
+class _AddedAtView(Mapping):
+    """시장별 {티커: 등록 시각} 읽기 전용 뷰 (복사 없음)"""
+
+    def __init__(self, entries: dict):
+        self._entries = entries
+
+    def __getitem__(self, ticker):
+        return self._entries[ticker].added_at
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class WatchRegistry:
+    def __init__(self, max_entries: int = None, default_ttl_hours: float = None):
+        self.max_entries = max_entries or Config.WATCH_MAX_ENTRIES
+        self.default_ttl_hours = default_ttl_hours or Config.WATCH_TTL_HOURS
+        self._markets = {'US': {}, 'KR': {}}   # 시장 → {티커: WatchEntry}
+        self._heap = []                         # (만료 시각, seq, 시장, 티커) — seq 불일치 = 옛 항목
+        self._seq = itertools.count()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key) -> bool:
+        market, ticker = key
+        return ticker in self._markets.get(market, {})
+
+    def view(self, market: str) -> Mapping:
+        return _AddedAtView(self._markets.setdefault(market, {}))
+
+    def get(self, market: str, ticker: str):
+        return self._markets.get(market, {}).get(ticker)
+
+    def tickers(self, market: str) -> list:
+        return list(self._markets.get(market, {}))
+
+    # ────────────────────────────────────────────
+    # 등록 / 제거
+    # ────────────────────────────────────────────
+    def add(self, market: str, ticker: str, ttl_hours: float = None,
+            reason: str = '', news: dict = None, score=None):
+        """
+        등록 → (entry, 신규 여부, 한도 초과로 밀려난 (시장, 티커) 목록)
+        - 이미 있으면 만료를 max(기존, 지금+TTL) 로 연장, 사유/점수 갱신
+        """
+        expires_at = time.time() + (ttl_hours or self.default_ttl_hours) * 3600
+        pool = self._markets.setdefault(market, {})
+        entry = pool.get(ticker)
+        evicted = []
+
+        if entry is not None:
+            entry.hits += 1
+            entry.last_reason = reason or entry.last_reason
+            if score is not None and (entry.score is None or score > entry.score):
+                entry.score = score
+            if expires_at > entry.expires_at:
+                logger.debug(f"⏳ 감시 연장 ({market}): {ticker} → "
+                             f"{datetime.fromtimestamp(expires_at):%m-%d %H:%M} [{entry.last_reason}]")
+                self._push(entry, expires_at)
+            return entry, False, evicted
+
+        while self._size >= self.max_entries:
+            victim = self._pop_soonest()
+            if victim is None:
+                break
+            evicted.append((victim.market, victim.ticker))
+            logger.info(f"➖ 감시 한도 초과 → 만료 임박 종목 제거 ({victim.market}): {victim.ticker}")
+
+        entry = WatchEntry(market, ticker, expires_at, reason, news, score)
+        pool[ticker] = entry
+        self._size += 1
+        self._push(entry, expires_at)
+        return entry, True, evicted
+
+    def remove(self, market: str, ticker: str):
+        if self._markets.get(market, {}).pop(ticker, None) is not None:
+            self._size -= 1   # 힙 항목은 꺼낼 때 무시
+
+    def _push(self, entry: WatchEntry, expires_at: float):
+        entry.expires_at = expires_at
+        entry.seq = next(self._seq)
+        heapq.heappush(self._heap, (expires_at, entry.seq, entry.market, entry.ticker))
+        if len(self._heap) > 2 * self._size + 64:
+            self._heap = [item for item in self._heap if self._live(item)]
+            heapq.heapify(self._heap)
+
+    def _live(self, item):
+        entry = self._markets.get(item[2], {}).get(item[3])
+        return entry if entry is not None and entry.seq == item[1] else None
+
+    def _pop_soonest(self):
+        while self._heap:
+            item = heapq.heappop(self._heap)
+            entry = self._live(item)
+            if entry is not None:
+                del self._markets[entry.market][entry.ticker]
+                self._size -= 1
+                return entry
+        return None
+
+    def expire(self, now: float = None) -> list:
+        """만료된 종목 제거 → [(시장, 티커)] (힙 머리만 확인)"""
+        now = now or time.time()
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            item = heapq.heappop(self._heap)
+            entry = self._live(item)
+            if entry is not None:
+                del self._markets[entry.market][entry.ticker]
+                self._size -= 1
+                expired.append((entry.market, entry.ticker))
+                logger.debug(f"⏰ TTL 만료 ({entry.market}): {entry.ticker}")
+        return expired
+
+    # ────────────────────────────────────────────
+    # 스냅샷 (state_store)
+    # ────────────────────────────────────────────
+    def dump(self) -> list:
+        """전체 항목 → JSON 용 dict 목록 (시각은 epoch 초)"""
+        return [
+            {
+                'market': e.market, 'ticker': e.ticker, 'added_at': e.added_at.timestamp(),
+                'expires_at': e.expires_at, 'reason': e.reason, 'last_reason': e.last_reason,
+                'news_title': e.news_title, 'news_url': e.news_url, 'source': e.source,
+                'score': e.score, 'hits': e.hits,
+            }
+            for pool in self._markets.values() for e in pool.values()
+        ]
+
+    def load(self, rows: list, now: float = None) -> list:
+        """
+        dump() 결과 복원 → 복원한 [(시장, 티커)]
+        - 이미 만료된 항목 제외, 한도를 넘으면 만료가 늦은 항목 우선
+        """
+        now = now or time.time()
+        restored = []
+        for row in sorted(rows, key=lambda r: r['expires_at'], reverse=True):
+            if row['expires_at'] <= now or self._size >= self.max_entries:
+                continue
+            market, ticker = row['market'], row['ticker']
+            pool = self._markets.setdefault(market, {})
+            if ticker in pool:
+                continue
+            news = {'title': row.get('news_title', ''), 'url': row.get('news_url', ''),
+                    'source': row.get('source', '')}
+            entry = WatchEntry(market, ticker, row['expires_at'], row.get('reason', ''), news, row.get('score'))
+            entry.added_at = datetime.fromtimestamp(row['added_at'])
+            entry.last_reason = row.get('last_reason') or entry.reason
+            entry.hits = row.get('hits', 1)
+            pool[ticker] = entry
+            self._size += 1
+            self._push(entry, entry.expires_at)
+            restored.append((market, ticker))
+        return restored
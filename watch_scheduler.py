@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Watch Scheduler - 집중 감시 종목별 적응형 폴링 주기 (힙 기반)
+- ✅ 종목마다 다음 확인 시각을 힙으로 관리 → 가장 급한 종목부터, 한가한 종목은 드물게
+- ✅ AI top_ticker 지목 직후: 수 초 간격 → 뉴스가 오래될수록 / 시세가 잠잠할수록 느리게
+- ✅ 거래량이 붙거나 급등 기준에 근접하면 다시 최단 간격
+- ✅ 등록/재등록 시 즉시 1회 확인 (다음 주기를 기다리지 않음)
+- ✅ dump()/load() → 재시작 후 종목별 간격 유지, 첫 확인은 간격 안에서 분산 (state_store)
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class _WatchState:
+    __slots__ = ('market', 'ticker', 'added_at', 'interval', 'due', 'seq',
+                 'last_poll', 'last_change', 'last_volume', 'polls')
+
+    def __init__(self, market: str, ticker: str):
+        self.market = market
+        self.ticker = ticker
+        self.added_at = time.monotonic()
+        self.interval = Config.WATCH_INTERVAL_MAX
+        self.due = 0.0
+        self.seq = 0
+        self.last_poll = None
+        self.last_change = None
+        self.last_volume = None
+        self.polls = 0
+
+
+class WatchScheduler:
+    def __init__(self):
+        self._states = {}          # (시장, 티커) → _WatchState
+        self._heap = []            # (due, seq, key) — seq 가 state.seq 와 다르면 옛 항목
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self.stats = {'polls': 0, 'fast_polls': 0}
+
+    def __len__(self):
+        return len(self._states)
+
+    def __contains__(self, key) -> bool:
+        return key in self._states
+
+    # ────────────────────────────────────────────
+    # 등록 / 제거
+    # ────────────────────────────────────────────
+    def add(self, market: str, ticker: str, urgent: bool = False):
+        """
+        등록 (이미 있으면 뉴스 시각 갱신) → 즉시 확인 예약
+        - urgent (AI top_ticker): 최단 간격부터 시작
+        """
+        key = (market, ticker)
+        state = self._states.get(key)
+        now = time.monotonic()
+        if state is None:
+            state = self._states[key] = _WatchState(market, ticker)
+        elif state.last_poll and now - state.last_poll < Config.WATCH_INTERVAL_MIN:
+            # 방금 확인한 종목이 여러 경로로 연달아 요청 → 즉시 재확인은 생략, 주기만 당김
+            state.added_at = now
+            if urgent:
+                state.interval = Config.WATCH_INTERVAL_MIN
+                self._schedule(state, now + state.interval)
+            return
+        state.added_at = now
+        state.interval = Config.WATCH_INTERVAL_MIN if urgent else self._age_interval(0)
+        self._schedule(state, now)
+
+    def remove(self, market: str, ticker: str):
+        self._states.pop((market, ticker), None)   # 힙 항목은 꺼낼 때 무시
+
+    def _schedule(self, state: _WatchState, due: float):
+        state.due = due
+        state.seq = next(self._seq)
+        heapq.heappush(self._heap, (due, state.seq, (state.market, state.ticker)))
+        if len(self._heap) > 4 * len(self._states) + 64:
+            self._heap = [item for item in self._heap if self._is_live(item)]
+            heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def _is_live(self, item) -> bool:
+        state = self._states.get(item[2])
+        return state is not None and state.seq == item[1]
+
+    # ────────────────────────────────────────────
+    # 디스패치
+    # ────────────────────────────────────────────
+    def _peek(self):
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0] if self._heap else None
+
+    async def wait_due(self):
+        """
+        다음 확인 시각까지 대기 (그 사이 새 등록이 오면 즉시 깨어남)
+        - 감시 종목이 없으면 WATCH_INTERVAL_MAX 후 반환 (호출 측 루프 생존 표시용)
+        """
+        head = self._peek()
+        wait = Config.WATCH_INTERVAL_MAX if head is None else head[0] - time.monotonic()
+        if wait <= 0:
+            return
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+
+    def pop_due(self, limit: int) -> list:
+        """확인할 때가 된 (시장, 티커) 최대 limit 개 (가장 오래 밀린 순)"""
+        now = time.monotonic()
+        due = []
+        while len(due) < limit:
+            head = self._peek()
+            if head is None or head[0] > now:
+                break
+            heapq.heappop(self._heap)
+            due.append(head[2])
+        return due
+
+    # ────────────────────────────────────────────
+    # 주기 정책
+    # ────────────────────────────────────────────
+    @staticmethod
+    def _age_interval(age: float) -> float:
+        """뉴스(등록) 경과 시간 → 기본 간격"""
+        for max_age, interval in Config.WATCH_AGE_TIERS:
+            if age < max_age:
+                return interval
+        return Config.WATCH_INTERVAL_MAX
+
+    def reschedule(self, market: str, ticker: str, quote=None, min_price_change: float = 10.0):
+        """
+        확인 결과 반영 후 다음 시각 예약
+        quote: (등락률 %, 거래량 배수) / 조회 실패 시 None
+        """
+        state = self._states.get((market, ticker))
+        if state is None:
+            return
+        now = time.monotonic()
+        base = self._age_interval(now - state.added_at)
+        interval = base
+
+        if quote:
+            change, volume = quote
+            heating = (
+                change >= min_price_change / 2
+                or (state.last_volume and volume >= state.last_volume * 1.5 and volume >= 2)
+            )
+            flat = state.last_change is not None and abs(change - state.last_change) < 0.5
+            if heating:
+                interval = Config.WATCH_INTERVAL_MIN
+            elif state.interval < base and not flat:
+                # 지목 직후 최단 간격 → 움직임이 있는 동안은 기본 간격까지 완만하게
+                interval = state.interval * 1.2
+            elif flat:
+                # 잠잠하면 이전 간격에서 점점 느리게 (뉴스 경과 기준보다 빠르진 않게)
+                interval = max(base, state.interval * 1.5)
+            state.last_change, state.last_volume = change, volume
+        else:
+            interval = max(base, state.interval * 2)
+
+        state.interval = min(max(interval, Config.WATCH_INTERVAL_MIN), Config.WATCH_INTERVAL_MAX)
+        state.polls += 1
+        state.last_poll = now
+        self.stats['polls'] += 1
+        if state.interval <= Config.WATCH_INTERVAL_MIN:
+            self.stats['fast_polls'] += 1
+        self._schedule(state, now + state.interval)
+
+    # ────────────────────────────────────────────
+    # 스냅샷 (state_store)
+    # ────────────────────────────────────────────
+    def dump(self) -> list:
+        """종목별 간격/경과 시간 (monotonic 시각은 경과 초로 저장)"""
+        now = time.monotonic()
+        return [
+            {
+                'market': st.market, 'ticker': st.ticker, 'age': now - st.added_at,
+                'interval': st.interval, 'last_change': st.last_change,
+                'last_volume': st.last_volume, 'polls': st.polls,
+            }
+            for st in self._states.values()
+        ]
+
+    def load(self, rows: list, keys=None):
+        """
+        dump() 결과 복원 (keys 가 있으면 그 (시장, 티커)만)
+        - 재시작 직후 한꺼번에 몰리지 않도록 첫 확인을 각자 간격 안에서 고르게 분산
+        """
+        rows = [r for r in rows if keys is None or (r['market'], r['ticker']) in keys]
+        now = time.monotonic()
+        for i, row in enumerate(rows):
+            state = _WatchState(row['market'], row['ticker'])
+            state.added_at = now - row.get('age', 0)
+            state.interval = min(max(row.get('interval', state.interval), Config.WATCH_INTERVAL_MIN),
+                                 Config.WATCH_INTERVAL_MAX)
+            state.last_change = row.get('last_change')
+            state.last_volume = row.get('last_volume')
+            state.polls = row.get('polls', 0)
+            self._states[(state.market, state.ticker)] = state
+            self._schedule(state, now + state.interval * i / len(rows))
+
+    def format_status(self) -> str:
+        """/status 용: 간격 구간별 종목 수"""
+        if not self._states:
+            return "  (감시 종목 없음)"
+        buckets = {'≤15초': 0, '≤1분': 0, '≤5분': 0, '그 이상': 0}
+        for state in self._states.values():
+            if state.interval <= 15:
+                buckets['≤15초'] += 1
+            elif state.interval <= 60:
+                buckets['≤1분'] += 1
+            elif state.interval <= 300:
+                buckets['≤5분'] += 1
+            else:
+                buckets['그 이상'] += 1
+        parts = ' / '.join(f"{k} {v}" for k, v in buckets.items() if v)
+        return f"  확인 간격: {parts} (누적 {self.stats['polls']}회)"
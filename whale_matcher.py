@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Whale Matcher - 13D/13G 제출자 → 유명 고래 매칭
+- ✅ 고래 목록은 whale_list.json (이름 / 별칭 / 제출자 CIK) → 코드 수정 없이 추가
+- ✅ CIK 일치 우선 (텍스트 표기와 무관), 없으면 별칭 텍스트 매칭
+- ✅ Aho-Corasick 다중 패턴 매칭: 고래 수와 무관하게 본문 길이에 비례 (1회 순회)
+- ✅ 단어 경계 + 최장 일치 ('GOLDMAN SACHS' > 'GOLDMAN', "VANGUARDIA" 는 불일치)
+- ✅ 첫 매칭에서 멈추지 않고 일치한 고래 전부 반환
+"""
+
+import json
+import logging
+import os
+from collections import deque
+
+from sec_index import normalize_company_name
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'whale_list.json')
+
+
+class WhaleMatcher:
+    def __init__(self, whales: list):
+        """whales: [{'name': '🏆 Warren Buffett', 'aliases': ['BERKSHIRE', ...], 'ciks': [1067983]}]"""
+        self.whales = whales
+        self._by_cik = {}
+        for idx, whale in enumerate(whales):
+            for cik in whale.get('ciks', []):
+                self._by_cik[int(cik)] = idx
+
+        # 별칭 → 정규화 후 양끝 공백 패딩 (" GOLDMAN SACHS ") → 단어 경계가 패턴에 포함됨
+        patterns = []
+        for idx, whale in enumerate(whales):
+            for alias in whale.get('aliases', []):
+                norm = normalize_company_name(alias)
+                if norm:
+                    patterns.append((f" {norm} ", idx))
+        self._build(patterns)
+
+    @classmethod
+    def load(cls, path: str = None) -> 'WhaleMatcher':
+        path = path or _DEFAULT_PATH
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                whales = json.load(f).get('whales', [])
+        except Exception as e:
+            logger.error(f"🐋 고래 목록 로드 실패 ({path}): {e}")
+            whales = []
+        logger.info(f"🐋 고래 목록: {len(whales)}명")
+        return cls(whales)
+
+    # ────────────────────────────────────────────
+    # Aho-Corasick 오토마톤
+    # ────────────────────────────────────────────
+    def _build(self, patterns):
+        goto = [{}]     # 상태 → {문자: 다음 상태}
+        outputs = [[]]  # 상태 → [(패턴 길이, 고래 idx)]
+        for pattern, whale_idx in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append((len(pattern), whale_idx))
+
+        # BFS 로 실패 링크 계산 (루트 자식의 실패 링크는 루트)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+
+        self._goto, self._fail, self._outputs = goto, fail, outputs
+
+    def _scan(self, text: str):
+        """정규화 텍스트 → [(시작, 끝, 고래 idx)] (겹침 포함 전체)"""
+        hits = []
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, whale_idx in outputs[state]:
+                hits.append((pos - length + 1, pos + 1, whale_idx))
+        return hits
+
+    # ────────────────────────────────────────────
+    # 조회
+    # ────────────────────────────────────────────
+    def match_text(self, *texts) -> list:
+        """
+        텍스트 → 일치한 고래 이름 목록 (등장 순서, 중복 제거)
+        - 겹치는 후보는 왼쪽 우선 → 같은 시작이면 최장 일치
+        """
+        found = []
+        for text in texts:
+            norm = f" {normalize_company_name(text)} "
+            hits = sorted(self._scan(norm), key=lambda h: (h[0], -(h[1] - h[0])))
+            end = 0
+            for start, stop, whale_idx in hits:
+                if start + 1 < end:      # 패딩 공백 1칸은 이웃 단어와 공유 가능
+                    continue
+                end = stop
+                name = self.whales[whale_idx]['name']
+                if name not in found:
+                    found.append(name)
+        return found
+
+    def match_ciks(self, ciks) -> list:
+        """제출자 CIK 목록 → 일치한 고래 이름 목록"""
+        found = []
+        for cik in ciks:
+            try:
+                idx = self._by_cik.get(int(cik))
+            except (TypeError, ValueError):
+                continue
+            if idx is not None and self.whales[idx]['name'] not in found:
+                found.append(self.whales[idx]['name'])
+        return found
+
+    def is_whale_cik(self, cik) -> bool:
+        try:
+            return int(cik) in self._by_cik
+        except (TypeError, ValueError):
+            return False
+
+    def match(self, ciks=(), texts=()) -> list:
+        """CIK 일치 우선 + 텍스트 일치 추가 → 고래 이름 목록"""
+        found = self.match_ciks(ciks)
+        for name in self.match_text(*texts):
+            if name not in found:
+                found.append(name)
+        return found